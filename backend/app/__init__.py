@@ -11,6 +11,10 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
+    # orjson-backed JSON (stdlib fallback) with Decimal/datetime/Enum support
+    from app.utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+    
     # Configure logging
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
@@ -19,6 +23,31 @@ def create_app(config_class=Config):
     CORS(app, origins=['http://localhost:3000', 'http://127.0.0.1:3000'])
     jwt = JWTManager(app)
     
+    # Request timing, query counts and the Prometheus /metrics endpoint
+    from app.utils.metrics import init_metrics
+    from app.utils.query_tracer import init_query_tracer
+    init_metrics(app)
+    init_query_tracer(app)
+    
+    # SQLite translation and PostgreSQL prepared statements
+    from app.utils.sql_dialect import init_sql_dialect
+    init_sql_dialect(app)
+    
+    from app.utils.replicas import init_replica_router
+    init_replica_router(app)
+    
+    # gzip/brotli for large JSON responses (runs before the metrics hook,
+    # so /metrics reports bytes on the wire)
+    from app.utils.compression import init_compression
+    init_compression(app)
+    
+    from app.services.property_service import init_property_cache
+    init_property_cache(app)
+    
+    # Pub/sub for the server-sent events stream
+    from app.utils.events import init_event_bus
+    init_event_bus(app)
+    
     # Add a simple root route for testing
     @app.route('/')
     def health_check():
@@ -38,6 +67,10 @@ def create_app(config_class=Config):
         with app.app_context():
             init_db()
             logger.info("Database initialized successfully")
+            
+            # First start against a database that predates the listing feed
+            from app.services.property_service import backfill_property_feed
+            backfill_property_feed()
     except Exception as e:
         logger.error(f"Database initialization failed: {str(e)}")
         # Continue running even if DB init fails for development
@@ -50,6 +83,8 @@ def create_app(config_class=Config):
         from app.api.deals import deals_bp
         from app.api.admin import admin_bp
         from app.api.public import public_bp
+        from app.api.compliance import compliance_bp
+        from app.api.events import events_bp
         
         app.register_blueprint(auth_bp, url_prefix='/api/auth')
         app.register_blueprint(properties_bp, url_prefix='/api')
@@ -57,6 +92,8 @@ def create_app(config_class=Config):
         app.register_blueprint(deals_bp, url_prefix='/api')
         app.register_blueprint(admin_bp, url_prefix='/api/admin')
         app.register_blueprint(public_bp, url_prefix='/api/public')
+        app.register_blueprint(compliance_bp, url_prefix='/api/admin/compliance')
+        app.register_blueprint(events_bp, url_prefix='/api')
         
         logger.info("All blueprints registered successfully")
         
@@ -67,6 +104,10 @@ def create_app(config_class=Config):
         def test_route():
             return jsonify({'message': 'API is working', 'error': str(e)})
     
+    # Register CLI commands
+    from app.cli import register_commands
+    register_commands(app)
+    
     # Error handlers
     @app.errorhandler(404)
     def not_found(error):
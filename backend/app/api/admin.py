@@ -1,16 +1,124 @@
 # backend/app/api/admin.py
 from flask import Blueprint, request, jsonify
+from flask_jwt_extended import get_jwt_identity
 from app.database import get_db_connection
 from app.utils.auth import jwt_required_custom
 from app.services.email_service import send_verification_email
+from app.services.import_service import PropertyImporter, detect_format
+from app.services.export_service import ExportService
+from app.services.kyc_service import review_kyc_batch, invalidate_reviewed_investors
+from app.services import investor_service
+from app.services.property_service import invalidate_property_detail, refresh_property_feed
+from app.services.saved_search_service import match_published_property
+from app.utils.events import event_bus
+from app.utils.query_tracer import query_tracer
+from app.utils.serializers import Field, money_or_none, row_encoder, timestamp
 import json
 
 admin_bp = Blueprint('admin', __name__)
 
+INVESTOR_EXPORT_COLUMNS = [
+    'id', 'email', 'full_name', 'phone', 'language_preference', 'is_active',
+    'is_verified', 'created_at', 'investor_type', 'nationality', 'min_investment',
+    'max_investment', 'document_count', 'verified_documents'
+]
+
+PROPERTY_EXPORT_COLUMNS = [
+    'id', 'property_id', 'address', 'city', 'postcode', 'property_type', 'bedrooms',
+    'bathrooms', 'square_feet', 'asking_price', 'monthly_rent', 'bmv_score', 'tier',
+    'status', 'published', 'deal_package_id', 'title_en', 'deal_published', 'created_at'
+]
+
 # Admin authentication decorator
 def admin_required():
     return jwt_required_custom(admin_only=True)
 
+def _investor_list_query(status=None):
+    """Build the investor list query shared by the paged list and the export."""
+    query = """
+        SELECT 
+            u.id, u.email, u.full_name, u.phone, u.user_type,
+            u.language_preference, u.is_active, u.is_verified, u.created_at,
+            ip.investor_type, ip.nationality, ip.min_investment, ip.max_investment,
+            COUNT(DISTINCT kd.id) as document_count,
+            COUNT(DISTINCT kd.id) FILTER (WHERE kd.status = 'verified') as verified_documents
+        FROM users u
+        LEFT JOIN investor_profiles ip ON u.id = ip.user_id
+        LEFT JOIN kyc_documents kd ON u.id = kd.user_id
+        WHERE u.user_type = 'investor'
+    """
+    
+    if status == 'active':
+        query += " AND u.is_active = TRUE"
+    elif status == 'pending':
+        query += " AND u.is_verified = FALSE"
+    elif status == 'verified':
+        query += " AND u.is_verified = TRUE"
+    
+    query += " GROUP BY u.id, ip.id"
+    return query, []
+
+def _property_list_query(status=None):
+    """Build the admin property list query shared by the paged list and the export."""
+    query = """
+        SELECT 
+            p.*,
+            dp.id as deal_package_id,
+            dp.title_en, dp.title_ar,
+            dp.published as deal_published
+        FROM properties p
+        LEFT JOIN deal_packages dp ON p.id = dp.property_id
+        WHERE 1=1
+    """
+    
+    if status == 'published':
+        query += " AND p.published = TRUE AND dp.published = TRUE"
+    elif status == 'pending':
+        query += " AND (p.published = FALSE OR dp.published = FALSE OR dp.id IS NULL)"
+    
+    return query, []
+
+encode_investor_row = row_encoder({
+    'id': 'id',
+    'email': 'email',
+    'full_name': 'full_name',
+    'phone': 'phone',
+    'language_preference': 'language_preference',
+    'is_active': 'is_active',
+    'is_verified': 'is_verified',
+    'created_at': Field('created_at', timestamp),
+    'investor_type': 'investor_type',
+    'nationality': 'nationality',
+    'investment_range': {
+        'min': Field('min_investment', money_or_none),
+        'max': Field('max_investment', money_or_none),
+    },
+    'kyc_status': {
+        'documents_uploaded': 'document_count',
+        'documents_verified': 'verified_documents',
+    },
+})
+
+encode_property_row = row_encoder({
+    'id': 'id',
+    'property_id': 'property_id',
+    'address': 'address',
+    'city': 'city',
+    'postcode': 'postcode',
+    'property_type': 'property_type',
+    'bedrooms': 'bedrooms',
+    'bathrooms': 'bathrooms',
+    'asking_price': Field('asking_price', money_or_none),
+    'monthly_rent': Field('monthly_rent', money_or_none),
+    'bmv_score': 'bmv_score',
+    'tier': 'tier',
+    'status': 'status',
+    'published': 'published',
+    'has_deal_package': lambda row: bool(row['deal_package_id']),
+    'deal_published': 'deal_published',
+    'created_at': Field('created_at', timestamp),
+})
+
 @admin_bp.route('/investors', methods=['GET'])
 @admin_required()
 def list_investors():
@@ -21,34 +129,11 @@ def list_investors():
     
     offset = (page - 1) * per_page
     
-    with get_db_connection() as conn:
+    with get_db_connection(intent='read') as conn:
         cursor = conn.cursor()
         
-        # Build query
-        query = """
-            SELECT 
-                u.id, u.email, u.full_name, u.phone, u.user_type,
-                u.language_preference, u.is_active, u.is_verified, u.created_at,
-                ip.investor_type, ip.nationality, ip.min_investment, ip.max_investment,
-                COUNT(DISTINCT kd.id) as document_count,
-                COUNT(DISTINCT kd.id) FILTER (WHERE kd.status = 'verified') as verified_documents
-            FROM users u
-            LEFT JOIN investor_profiles ip ON u.id = ip.user_id
-            LEFT JOIN kyc_documents kd ON u.id = kd.user_id
-            WHERE u.user_type = 'investor'
-        """
-        
-        params = []
-        
-        if status == 'active':
-            query += " AND u.is_active = TRUE"
-        elif status == 'pending':
-            query += " AND u.is_verified = FALSE"
-        elif status == 'verified':
-            query += " AND u.is_verified = TRUE"
-        
+        query, params = _investor_list_query(status)
         query += """
-            GROUP BY u.id, ip.id
             ORDER BY u.created_at DESC
             LIMIT %s OFFSET %s
         """
@@ -75,26 +160,7 @@ def list_investors():
         total = cursor.fetchone()['total']
         
         return jsonify({
-            'investors': [{
-                'id': inv['id'],
-                'email': inv['email'],
-                'full_name': inv['full_name'],
-                'phone': inv['phone'],
-                'language_preference': inv['language_preference'],
-                'is_active': inv['is_active'],
-                'is_verified': inv['is_verified'],
-                'created_at': inv['created_at'].isoformat() if inv['created_at'] else None,
-                'investor_type': inv['investor_type'],
-                'nationality': inv['nationality'],
-                'investment_range': {
-                    'min': float(inv['min_investment']) if inv['min_investment'] else None,
-                    'max': float(inv['max_investment']) if inv['max_investment'] else None
-                },
-                'kyc_status': {
-                    'documents_uploaded': inv['document_count'],
-                    'documents_verified': inv['verified_documents']
-                }
-            } for inv in investors],
+            'investors': [encode_investor_row(inv) for inv in investors],
             'pagination': {
                 'total': total,
                 'page': page,
@@ -103,135 +169,86 @@ def list_investors():
             }
         }), 200
 
+@admin_bp.route('/investors/export', methods=['GET'])
+@admin_required()
+def export_investors():
+    """Stream every investor matching the list filters as CSV or XLSX."""
+    file_format = request.args.get('format', 'csv')
+    query, params = _investor_list_query(request.args.get('status'))
+    query += " ORDER BY u.created_at DESC"
+    
+    try:
+        return ExportService().export(query, params, INVESTOR_EXPORT_COLUMNS, file_format, 'investors')
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
 @admin_bp.route('/investors/<int:investor_id>', methods=['GET'])
 @admin_required()
 def get_investor_details(investor_id):
     """Get detailed information about a specific investor."""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        
-        # Get investor details
-        cursor.execute("""
-            SELECT 
-                u.*, 
-                ip.*,
-                u.id as user_id
-            FROM users u
-            LEFT JOIN investor_profiles ip ON u.id = ip.user_id
-            WHERE u.id = %s AND u.user_type = 'investor'
-        """, (investor_id,))
-        
-        investor = cursor.fetchone()
-        
-        if not investor:
-            return jsonify({'message': 'Investor not found'}), 404
-        
-        # Get KYC documents
-        cursor.execute("""
-            SELECT * FROM kyc_documents
-            WHERE user_id = %s
-            ORDER BY uploaded_at DESC
-        """, (investor_id,))
-        
-        documents = cursor.fetchall()
-        
-        # Get recent activities
-        cursor.execute("""
-            SELECT * FROM activity_logs
-            WHERE user_id = %s
-            ORDER BY created_at DESC
-            LIMIT 20
-        """, (investor_id,))
-        
-        activities = cursor.fetchall()
-        
-        return jsonify({
-            'investor': {
-                'id': investor['user_id'],
-                'email': investor['email'],
-                'full_name': investor['full_name'],
-                'phone': investor['phone'],
-                'user_type': investor['user_type'],
-                'language_preference': investor['language_preference'],
-                'is_active': investor['is_active'],
-                'is_verified': investor['is_verified'],
-                'created_at': investor['created_at'].isoformat() if investor['created_at'] else None,
-                'profile': {
-                    'investor_type': investor['investor_type'],
-                    'nationality': investor['nationality'],
-                    'min_investment': float(investor['min_investment']) if investor['min_investment'] else None,
-                    'max_investment': float(investor['max_investment']) if investor['max_investment'] else None,
-                    'target_yield': float(investor['target_yield']) if investor['target_yield'] else None,
-                    'preferred_regions': investor['preferred_regions'] or [],
-                    'preferred_property_types': investor['preferred_property_types'] or [],
-                    'investment_strategies': investor['investment_strategies'] or [],
-                    'sharia_compliant_only': investor['sharia_compliant_only']
-                }
-            },
-            'documents': [{
-                'id': doc['id'],
-                'document_type': doc['document_type'],
-                'file_name': doc['file_name'],
-                'status': doc['status'],
-                'uploaded_at': doc['uploaded_at'].isoformat() if doc['uploaded_at'] else None,
-                'reviewed_at': doc['reviewed_at'].isoformat() if doc['reviewed_at'] else None,
-                'notes': doc['notes']
-            } for doc in documents],
-            'recent_activities': [{
-                'id': act['id'],
-                'action': act['action'],
-                'resource_type': act['resource_type'],
-                'resource_id': act['resource_id'],
-                'created_at': act['created_at'].isoformat() if act['created_at'] else None
-            } for act in activities]
-        }), 200
+    details = investor_service.get_investor_details(
+        investor_id,
+        documents_page=max(request.args.get('documents_page', 1, type=int), 1),
+        documents_per_page=min(max(request.args.get('documents_per_page', 20, type=int), 1), 100),
+        activities_page=max(request.args.get('activities_page', 1, type=int), 1),
+        activities_per_page=min(max(request.args.get('activities_per_page', 20, type=int), 1), 100)
+    )
+    
+    if not details:
+        return jsonify({'message': 'Investor not found'}), 404
+    
+    return jsonify(details), 200
 
 @admin_bp.route('/investors/<int:investor_id>/verify', methods=['PUT'])
 @admin_required()
 def verify_investor(investor_id):
     """Verify an investor's KYC."""
-    data = request.get_json()
+    data = request.get_json() or {}
     admin_id = get_jwt_identity()
     
     with get_db_connection() as conn:
         cursor = conn.cursor()
         
-        # Update user verification status
-        cursor.execute("""
-            UPDATE users 
-            SET is_verified = TRUE, updated_at = CURRENT_TIMESTAMP
-            WHERE id = %s
-        """, (investor_id,))
-        
-        # Update KYC documents if provided
-        if 'document_ids' in data:
-            for doc_id in data['document_ids']:
-                cursor.execute("""
-                    UPDATE kyc_documents
-                    SET status = %s, reviewed_by = %s, reviewed_at = CURRENT_TIMESTAMP, notes = %s
-                    WHERE id = %s AND user_id = %s
-                """, (
-                    data.get('status', 'verified'),
-                    admin_id,
-                    data.get('notes'),
-                    doc_id,
-                    investor_id
-                ))
-        
-        # Log activity
-        cursor.execute("""
-            INSERT INTO activity_logs (user_id, action, resource_type, resource_id)
-            VALUES (%s, 'verify_investor', 'user', %s)
-        """, (admin_id, investor_id))
-        
-        # Get investor email for notification
-        cursor.execute("SELECT email, language_preference FROM users WHERE id = %s", (investor_id,))
-        user = cursor.fetchone()
-        
-        # Send verification email (implement in email service)
-        # send_verification_complete_email(user['email'], user['language_preference'])
-        
-        return jsonify({'message': 'Investor verified successfully'}), 200
+        results = review_kyc_batch(cursor, admin_id, [{
+            'investor_id': investor_id,
+            'document_ids': data.get('document_ids', []),
+            'status': data.get('status', 'verified'),
+            'notes': data.get('notes'),
+            'verify_investor': True
+        }])
+    
+    invalidate_reviewed_investors(results)
+    
+    if not results[0]['success']:
+        return jsonify({'message': results[0]['message']}), 404
+    
+    return jsonify({'message': 'Investor verified successfully'}), 200
+
+@admin_bp.route('/kyc/review', methods=['POST'])
+@admin_required()
+def bulk_review_kyc():
+    """Apply KYC review decisions for many investors and documents at once."""
+    data = request.get_json() or {}
+    items = data.get('items')
+    admin_id = get_jwt_identity()
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'message': 'items must be a non-empty list'}), 400
+    
+    if len(items) > 500:
+        return jsonify({'message': 'At most 500 items can be reviewed per request'}), 400
+    
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        results = review_kyc_batch(cursor, admin_id, items)
+    
+    invalidate_reviewed_investors(results)
+    
+    return jsonify({
+        'results': results,
+        'succeeded': sum(1 for result in results if result['success']),
+        'failed': sum(1 for result in results if not result['success'])
+    }), 200
 
 @admin_bp.route('/properties', methods=['GET'])
 @admin_required()
@@ -243,27 +260,10 @@ def list_all_properties():
     
     offset = (page - 1) * per_page
     
-    with get_db_connection() as conn:
+    with get_db_connection(intent='read') as conn:
         cursor = conn.cursor()
         
-        query = """
-            SELECT 
-                p.*,
-                dp.id as deal_package_id,
-                dp.title_en, dp.title_ar,
-                dp.published as deal_published
-            FROM properties p
-            LEFT JOIN deal_packages dp ON p.id = dp.property_id
-            WHERE 1=1
-        """
-        
-        params = []
-        
-        if status == 'published':
-            query += " AND p.published = TRUE AND dp.published = TRUE"
-        elif status == 'pending':
-            query += " AND (p.published = FALSE OR dp.published = FALSE OR dp.id IS NULL)"
-        
+        query, params = _property_list_query(status)
         query += " ORDER BY p.created_at DESC LIMIT %s OFFSET %s"
         params.extend([per_page, offset])
         
@@ -282,25 +282,7 @@ def list_all_properties():
         total = cursor.fetchone()['total']
         
         return jsonify({
-            'properties': [{
-                'id': prop['id'],
-                'property_id': prop['property_id'],
-                'address': prop['address'],
-                'city': prop['city'],
-                'postcode': prop['postcode'],
-                'property_type': prop['property_type'],
-                'bedrooms': prop['bedrooms'],
-                'bathrooms': prop['bathrooms'],
-                'asking_price': float(prop['asking_price']) if prop['asking_price'] else None,
-                'monthly_rent': float(prop['monthly_rent']) if prop['monthly_rent'] else None,
-                'bmv_score': prop['bmv_score'],
-                'tier': prop['tier'],
-                'status': prop['status'],
-                'published': prop['published'],
-                'has_deal_package': bool(prop['deal_package_id']),
-                'deal_published': prop['deal_published'],
-                'created_at': prop['created_at'].isoformat() if prop['created_at'] else None
-            } for prop in properties],
+            'properties': [encode_property_row(prop) for prop in properties],
             'pagination': {
                 'total': total,
                 'page': page,
@@ -309,6 +291,76 @@ def list_all_properties():
             }
         }), 200
 
+@admin_bp.route('/properties/export', methods=['GET'])
+@admin_required()
+def export_properties():
+    """Stream every property matching the list filters as CSV or XLSX."""
+    file_format = request.args.get('format', 'csv')
+    query, params = _property_list_query(request.args.get('status'))
+    query += " ORDER BY p.created_at DESC"
+    
+    try:
+        return ExportService().export(query, params, PROPERTY_EXPORT_COLUMNS, file_format, 'properties')
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+@admin_bp.route('/properties/import', methods=['POST'])
+@admin_required()
+def import_properties():
+    """Bulk import properties from an uploaded CSV or JSONL file."""
+    if 'file' not in request.files:
+        return jsonify({'message': 'No file provided'}), 400
+    
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({'message': 'No file selected'}), 400
+    
+    file_format = request.form.get('format') or detect_format(file.filename)
+    if not file_format:
+        return jsonify({'message': 'Unsupported file type, expected .csv or .jsonl'}), 400
+    
+    resume_job_id = request.form.get('resume_job_id', type=int)
+    
+    importer = PropertyImporter()
+    try:
+        job = importer.run(
+            file.stream,
+            file_format,
+            source_name=file.filename,
+            user_id=get_jwt_identity(),
+            job_id=resume_job_id
+        )
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    return jsonify({
+        'import': job,
+        'errors': importer.get_errors(job['id'])
+    }), 200 if resume_job_id else 201
+
+@admin_bp.route('/properties/imports/<int:job_id>', methods=['GET'])
+@admin_required()
+def get_property_import(job_id):
+    """Get an import job's progress and its per-row error report."""
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 100, type=int)
+    
+    importer = PropertyImporter()
+    with get_db_connection() as conn:
+        job = importer.get_job(conn.cursor(), job_id)
+    
+    if not job:
+        return jsonify({'message': 'Import job not found'}), 404
+    
+    return jsonify({
+        'import': importer.job_summary(job),
+        'errors': importer.get_errors(job_id, page, per_page),
+        'pagination': {
+            'page': page,
+            'per_page': per_page
+        }
+    }), 200
+
 @admin_bp.route('/deals', methods=['POST'])
 @admin_required()
 def create_deal_package():
@@ -416,13 +468,23 @@ def update_deal_package(deal_id):
             UPDATE deal_packages 
             SET {', '.join(update_fields)}
             WHERE id = %s
+            RETURNING property_id
         """
         
         cursor.execute(query, params)
+        result = cursor.fetchone()
         
-        if cursor.rowcount == 0:
+        if not result:
             return jsonify({'message': 'Deal package not found'}), 404
         
+        invalidate_property_detail(result['property_id'])
+        refresh_property_feed(cursor, [result['property_id']])
+        event_bus.publish(cursor, 'update_deal_package', {
+            'deal_id': deal_id,
+            'property_id': result['property_id'],
+            'fields': sorted(field for field in data if field in updatable_fields or field in ('images', 'documents', 'location_data'))
+        })
+        
         # Log activity
         cursor.execute("""
             INSERT INTO activity_logs (user_id, action, resource_type, resource_id)
@@ -455,6 +517,7 @@ def publish_deal(deal_id):
             return jsonify({'message': 'Deal package not found'}), 404
         
         property_id = result['property_id']
+        invalidate_property_detail(property_id)
         
         # Also update property published status
         cursor.execute("""
@@ -462,6 +525,7 @@ def publish_deal(deal_id):
             SET published = %s, updated_at = CURRENT_TIMESTAMP
             WHERE id = %s
         """, (publish, property_id))
+        refresh_property_feed(cursor, [property_id])
         
         # Log activity
         cursor.execute("""
@@ -472,13 +536,31 @@ def publish_deal(deal_id):
             'publish_deal' if publish else 'unpublish_deal',
             deal_id
         ))
+        event_bus.publish(cursor, 'publish_deal' if publish else 'unpublish_deal', {
+            'deal_id': deal_id,
+            'property_id': property_id
+        })
         
-        # If publishing, trigger matching service
+        # If publishing, record saved-search matches and trigger matching service
         if publish:
+            match_published_property(cursor, property_id)
             from app.services.matching_service import MatchingService
             matching_service = MatchingService()
             matching_service.match_property_to_investors(property_id)
         
         return jsonify({
             'message': f'Deal {"published" if publish else "unpublished"} successfully'
-        }), 200
\ No newline at end of file
+        }), 200
+
+@admin_bp.route('/queries/slow', methods=['GET'])
+@admin_required()
+def get_slow_queries():
+    """Get this worker's slow-query log and the statements with the most total time."""
+    return jsonify(query_tracer.snapshot(top=request.args.get('top', 50, type=int))), 200
+
+@admin_bp.route('/queries/slow', methods=['DELETE'])
+@admin_required()
+def reset_slow_queries():
+    """Clear this worker's slow-query log and statement statistics."""
+    query_tracer.reset()
+    return jsonify({'message': 'Query statistics cleared'}), 200
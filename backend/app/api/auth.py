@@ -7,6 +7,7 @@ from flask_jwt_extended import (
 from werkzeug.security import generate_password_hash, check_password_hash
 from app.database import get_db_connection
 from app.services.email_service import send_verification_email, send_password_reset_email
+from app.services.report_service import record_compliance_events
 from app.utils.validators import validate_email, validate_password
 import secrets
 from datetime import datetime, timedelta
@@ -64,6 +65,8 @@ def register():
             VALUES (%s)
         """, (user_id,))
         
+        record_compliance_events(cursor, {'customers_registered': 1})
+        
         # Send verification email
         send_verification_email(email, verification_token, language_preference)
         
@@ -0,0 +1,223 @@
+# backend/app/api/compliance.py
+from flask import Blueprint, request, jsonify, Response
+from flask_jwt_extended import get_jwt_identity
+from app.database import get_db_connection
+from app.utils.auth import jwt_required_custom
+from app.services import alert_service, report_service, screening_service
+from app.utils.serializers import timestamp
+import json
+
+compliance_bp = Blueprint('compliance', __name__)
+
+# Longest lease an officer can ask for when claiming alerts
+MAX_LEASE_SECONDS = 24 * 60 * 60
+
+# Admin authentication decorator
+def admin_required():
+    return jwt_required_custom(admin_only=True)
+
+@compliance_bp.route('/screen', methods=['POST'])
+@admin_required()
+def screen():
+    """Screen a name against the loaded sanctions and PEP lists."""
+    data = request.get_json() or {}
+    name = (data.get('name') or '').strip()
+
+    if not name:
+        return jsonify({'message': 'Name is required'}), 400
+
+    check, matches = screening_service.screen_name(
+        name,
+        date_of_birth=data.get('date_of_birth'),
+        nationality=data.get('nationality'),
+        user_id=data.get('user_id'),
+        persist=bool(data.get('persist', data.get('user_id') is not None))
+    )
+
+    return jsonify({
+        'name': name,
+        'sanctions_match': check.sanctions_match,
+        'pep_match': check.pep_match,
+        'match_confidence': check.match_confidence,
+        'matched_lists': check.matched_sanctions_lists,
+        'matches': [match.to_dict() for match in matches]
+    }), 200
+
+@compliance_bp.route('/sanctions-checks/<int:user_id>', methods=['GET'])
+@admin_required()
+def get_sanctions_checks(user_id):
+    """Get the screening history for a user."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT id, check_name, nationality, sanctions_match, pep_match,
+                   matched_sanctions_lists, match_confidence, match_details,
+                   cleared, cleared_by, cleared_at, performed_at
+            FROM sanctions_checks
+            WHERE user_id = %s
+            ORDER BY performed_at DESC
+            LIMIT 50
+        """, (user_id,))
+
+        checks = cursor.fetchall()
+
+        return jsonify([{
+            'id': check['id'],
+            'check_name': check['check_name'],
+            'nationality': check['nationality'],
+            'sanctions_match': check['sanctions_match'],
+            'pep_match': check['pep_match'],
+            'matched_lists': check['matched_sanctions_lists'],
+            'match_confidence': float(check['match_confidence']) if check['match_confidence'] is not None else None,
+            'matches': check['match_details'] if not isinstance(check['match_details'], str) else json.loads(check['match_details']),
+            'cleared': check['cleared'],
+            'performed_at': timestamp(check['performed_at'])
+        } for check in checks]), 200
+
+@compliance_bp.route('/screening-index/reload', methods=['POST'])
+@admin_required()
+def reload_screening_index():
+    """Reload the sanctions/PEP lists into this worker's screening index."""
+    index = screening_service.get_screening_index(reload=True)
+    return jsonify({'message': 'Screening index reloaded', 'entries': len(index)}), 200
+
+def _report_dict(report):
+    return {
+        'id': report.id,
+        'report_type': report.report_type,
+        'period_start': str(report.report_period_start)[:10],
+        'period_end': str(report.report_period_end)[:10],
+        'total_customers': report.total_customers,
+        'kyc_completed': report.kyc_completed,
+        'kyc_pending': report.kyc_pending,
+        'sanctions_checks_performed': report.sanctions_checks_performed,
+        'pep_matches': report.pep_matches,
+        'alerts_generated': report.alerts_generated,
+        'alerts_resolved': report.alerts_resolved,
+        'report_data': report.report_data,
+        'generated_by': report.generated_by,
+        'generated_at': report.generated_at.isoformat() if hasattr(report.generated_at, 'isoformat') else report.generated_at
+    }
+
+@compliance_bp.route('/reports', methods=['POST'])
+@admin_required()
+def create_report():
+    """Generate a compliance report for a period from the daily rollups."""
+    data = request.get_json() or {}
+
+    try:
+        report = report_service.generate_compliance_report(
+            data.get('period_start'),
+            data.get('period_end'),
+            report_type=data.get('report_type', 'periodic'),
+            generated_by=get_jwt_identity()
+        )
+    except (TypeError, ValueError):
+        return jsonify({'message': 'period_start and period_end must be YYYY-MM-DD dates'}), 400
+
+    return jsonify(_report_dict(report)), 201
+
+@compliance_bp.route('/reports/<int:report_id>', methods=['GET'])
+@admin_required()
+def get_report(report_id):
+    """Get a stored report as JSON, CSV or PDF (?format=json|csv|pdf)."""
+    report = report_service.get_compliance_report(report_id)
+    if not report:
+        return jsonify({'message': 'Report not found'}), 404
+
+    file_format = request.args.get('format', 'json')
+    filename = f'compliance_report_{report_id}'
+
+    if file_format == 'csv':
+        return Response(
+            report_service.report_to_csv(report),
+            mimetype='text/csv',
+            headers={'Content-Disposition': f'attachment; filename={filename}.csv'}
+        )
+    if file_format == 'pdf':
+        try:
+            body = report_service.report_to_pdf(report)
+        except ImportError:
+            return jsonify({'message': 'PDF output requires reportlab'}), 501
+        return Response(
+            body,
+            mimetype='application/pdf',
+            headers={'Content-Disposition': f'attachment; filename={filename}.pdf'}
+        )
+
+    return jsonify(_report_dict(report)), 200
+
+@compliance_bp.route('/alerts/queue', methods=['GET'])
+@admin_required()
+def alert_queue_stats():
+    """Open alerts by severity and the number under investigation."""
+    return jsonify(alert_service.queue_stats()), 200
+
+@compliance_bp.route('/alerts/claim', methods=['POST'])
+@admin_required()
+def claim_alerts():
+    """Claim the next open alerts for the current officer."""
+    data = request.get_json(silent=True) or {}
+    limit = data.get('limit', 1)
+
+    alert_types = data.get('alert_types')
+    lease_seconds = data.get('lease_seconds')
+
+    if not isinstance(limit, int) or isinstance(limit, bool) or not 1 <= limit <= 50:
+        return jsonify({'message': 'limit must be between 1 and 50'}), 400
+    if alert_types is not None and (not isinstance(alert_types, list)
+                                    or not all(isinstance(alert_type, str) for alert_type in alert_types)):
+        return jsonify({'message': 'alert_types must be a list of strings'}), 400
+    if lease_seconds is not None and (not isinstance(lease_seconds, int) or isinstance(lease_seconds, bool)
+                                      or not 1 <= lease_seconds <= MAX_LEASE_SECONDS):
+        return jsonify({'message': f'lease_seconds must be between 1 and {MAX_LEASE_SECONDS}'}), 400
+
+    alerts = alert_service.claim_alerts(
+        get_jwt_identity(),
+        limit=limit,
+        alert_types=alert_types,
+        lease_seconds=lease_seconds
+    )
+    return jsonify({'alerts': alerts}), 200
+
+@compliance_bp.route('/alerts/<int:alert_id>/renew', methods=['POST'])
+@admin_required()
+def renew_alert_lease(alert_id):
+    """Extend the lease on an alert the current officer holds."""
+    alert = alert_service.renew_lease(alert_id, get_jwt_identity())
+    if not alert:
+        return jsonify({'message': 'Alert is not claimed by you or its lease has expired'}), 409
+    return jsonify(alert), 200
+
+@compliance_bp.route('/alerts/<int:alert_id>/release', methods=['POST'])
+@admin_required()
+def release_alert(alert_id):
+    """Return a claimed alert to the queue."""
+    if not alert_service.release_alert(alert_id, get_jwt_identity()):
+        return jsonify({'message': 'Alert is not claimed by you'}), 409
+    return jsonify({'message': 'Alert released'}), 200
+
+@compliance_bp.route('/alerts/resolve', methods=['POST'])
+@admin_required()
+def resolve_alerts():
+    """Resolve up to 500 alerts in one request."""
+    data = request.get_json() or {}
+    alert_ids = data.get('alert_ids') or []
+
+    if not alert_ids or not all(isinstance(alert_id, int) for alert_id in alert_ids):
+        return jsonify({'message': 'alert_ids must be a list of ids'}), 400
+    if len(alert_ids) > 500:
+        return jsonify({'message': 'At most 500 alerts can be resolved per request'}), 400
+
+    try:
+        resolved, skipped = alert_service.resolve_alerts(
+            get_jwt_identity(),
+            alert_ids,
+            status=data.get('status', 'resolved'),
+            notes=data.get('notes')
+        )
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    return jsonify({'resolved': resolved, 'skipped': skipped}), 200
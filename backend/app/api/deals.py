@@ -3,6 +3,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.database import get_db_connection
 from app.services.calculation_service import ShariaCompliantCalculator
+from app.utils.serializers import timestamp
 import json
 
 deals_bp = Blueprint('deals', __name__)
@@ -156,7 +157,7 @@ def get_saved_deals():
                 'tier': deal['tier'],
                 'images': images,
                 'metrics': metrics,
-                'saved_at': deal['saved_at'].isoformat() if deal['saved_at'] else None
+                'saved_at': timestamp(deal['saved_at'])
             })
         
         return jsonify(results), 200
@@ -0,0 +1,69 @@
+# backend/app/api/events.py
+import json
+import sys
+from flask import Blueprint, Response, current_app, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.utils.events import event_bus
+from app.utils.json_provider import default as json_default
+
+events_bp = Blueprint('events', __name__)
+
+def _sse(event_type, data):
+    return f"event: {event_type}\ndata: {json.dumps(data, default=json_default)}\n\n"
+
+def _stream_pins_worker():
+    """True under a gunicorn worker that is not gevent (sync or gthread).
+
+    There each open stream holds a process or thread until the client goes,
+    so a handful of browsers would starve every other request. The
+    development server runs a thread per request and is left alone.
+    """
+    if not request.environ.get('SERVER_SOFTWARE', '').startswith('gunicorn'):
+        return False
+    monkey = sys.modules.get('gevent.monkey')
+    return monkey is None or not monkey.is_module_patched('socket')
+
+@events_bp.route('/events', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def stream_events():
+    """Server-sent events for deal changes and the investor's own KYC reviews.
+
+    EventSource cannot send headers, so browsers pass the token as ?jwt=.
+    An idle connection costs a queue and a heartbeat every
+    EVENTS_HEARTBEAT_SECONDS on gevent workers; other gunicorn worker
+    classes refuse streams with 503.
+    """
+    if _stream_pins_worker():
+        return jsonify({'message': 'Live updates need GUNICORN_WORKER_CLASS=gevent'}), 503
+
+    user_id = get_jwt_identity()
+    subscription = event_bus.subscribe(user_id)
+
+    if subscription is None:
+        response = jsonify({'message': 'Too many live connections, please retry shortly'})
+        response.headers['Retry-After'] = '30'
+        return response, 503
+
+    heartbeat = current_app.config.get('EVENTS_HEARTBEAT_SECONDS', 20)
+
+    def stream():
+        try:
+            # Clients refetch on "ready", covering anything missed while disconnected
+            yield f"retry: {heartbeat * 1000}\n" + _sse('ready', {})
+            while True:
+                event = subscription.get(timeout=heartbeat)
+                if subscription.overflowed:
+                    yield _sse('resync', {})
+                    return
+                if event is None:
+                    yield ': keepalive\n\n'
+                    continue
+                yield _sse(event['type'], event['data'])
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    response = Response(stream(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -4,7 +4,12 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.database import get_db_connection
 from app.utils.auth import jwt_required_custom
 from app.services.storage_service import StorageService
+from app.services.investor_service import invalidate_investor_details
+from app.services.report_service import record_compliance_events
+from app.services import saved_search_service
+from app.utils.serializers import json_list, timestamp
 from werkzeug.utils import secure_filename
+from datetime import datetime
 import os
 
 investors_bp = Blueprint('investors', __name__)
@@ -15,7 +20,7 @@ def get_profile():
     """Get investor profile details."""
     user_id = get_jwt_identity()
     
-    with get_db_connection() as conn:
+    with get_db_connection(intent='read') as conn:
         cursor = conn.cursor()
         
         # Get user and investor profile data
@@ -43,16 +48,16 @@ def get_profile():
             'phone': user_data['phone'],
             'language_preference': user_data['language_preference'],
             'is_verified': user_data['is_verified'],
-            'created_at': user_data['created_at'].isoformat() if user_data['created_at'] else None,
+            'created_at': timestamp(user_data['created_at']),
             'investor_profile': {
                 'investor_type': user_data['investor_type'],
                 'nationality': user_data['nationality'],
                 'min_investment': float(user_data['min_investment']) if user_data['min_investment'] else None,
                 'max_investment': float(user_data['max_investment']) if user_data['max_investment'] else None,
                 'target_yield': float(user_data['target_yield']) if user_data['target_yield'] else None,
-                'preferred_regions': user_data['preferred_regions'] or [],
-                'preferred_property_types': user_data['preferred_property_types'] or [],
-                'investment_strategies': user_data['investment_strategies'] or [],
+                'preferred_regions': json_list(user_data['preferred_regions']),
+                'preferred_property_types': json_list(user_data['preferred_property_types']),
+                'investment_strategies': json_list(user_data['investment_strategies']),
                 'sharia_compliant_only': user_data['sharia_compliant_only']
             }
         }), 200
@@ -141,10 +146,17 @@ def upload_kyc_document():
     
     file = request.files['file']
     document_type = request.form.get('document_type', 'other')
+    expiry_date = request.form.get('expiry_date') or None
     
     if file.filename == '':
         return jsonify({'message': 'No file selected'}), 400
     
+    if expiry_date:
+        try:
+            expiry_date = datetime.strptime(expiry_date, '%Y-%m-%d').date()
+        except ValueError:
+            return jsonify({'message': 'expiry_date must be in YYYY-MM-DD format'}), 400
+    
     # Validate file type
     allowed_extensions = {'pdf', 'jpg', 'jpeg', 'png', 'doc', 'docx'}
     file_ext = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else ''
@@ -162,10 +174,10 @@ def upload_kyc_document():
         
         cursor.execute("""
             INSERT INTO kyc_documents 
-            (user_id, document_type, file_path, file_name, status)
-            VALUES (%s, %s, %s, %s, 'pending')
+            (user_id, document_type, file_path, file_name, status, expiry_date)
+            VALUES (%s, %s, %s, %s, 'pending', %s)
             RETURNING id
-        """, (user_id, document_type, file_path, file_name))
+        """, (user_id, document_type, file_path, file_name, expiry_date))
         
         document_id = cursor.fetchone()['id']
         
@@ -174,6 +186,10 @@ def upload_kyc_document():
             INSERT INTO activity_logs (user_id, action, resource_type, resource_id)
             VALUES (%s, 'kyc_upload', 'document', %s)
         """, (user_id, document_id))
+        
+        record_compliance_events(cursor, {'kyc_documents_submitted': 1})
+    
+    invalidate_investor_details(user_id)
     
     return jsonify({
         'message': 'Document uploaded successfully',
@@ -186,7 +202,7 @@ def get_kyc_documents():
     """Get list of uploaded KYC documents."""
     user_id = get_jwt_identity()
     
-    with get_db_connection() as conn:
+    with get_db_connection(intent='read') as conn:
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -203,7 +219,7 @@ def get_kyc_documents():
             'document_type': doc['document_type'],
             'file_name': doc['file_name'],
             'status': doc['status'],
-            'uploaded_at': doc['uploaded_at'].isoformat() if doc['uploaded_at'] else None,
+            'uploaded_at': timestamp(doc['uploaded_at']),
             'notes': doc['notes']
         } for doc in documents]), 200
 
@@ -229,4 +245,75 @@ def download_document(document_id):
             return jsonify({'message': 'Document not found'}), 404
         
         storage_service = StorageService()
-        return storage_service.serve_file(document['file_path'], document['file_name'])
\ No newline at end of file
+        return storage_service.serve_file(document['file_path'], document['file_name'])
+
+@investors_bp.route('/saved-searches', methods=['GET'])
+@jwt_required()
+def get_saved_searches():
+    """List the investor's saved searches."""
+    user_id = get_jwt_identity()
+    
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        return jsonify(saved_search_service.list_saved_searches(cursor, user_id)), 200
+
+@investors_bp.route('/saved-searches', methods=['POST'])
+@jwt_required()
+def create_saved_search():
+    """Save a listing filter to be alerted about matching deals."""
+    user_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
+    
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            search_id = saved_search_service.create_saved_search(cursor, user_id, data)
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+    
+    return jsonify({
+        'message': 'Search saved successfully',
+        'search_id': search_id
+    }), 201
+
+@investors_bp.route('/saved-searches/<int:search_id>', methods=['DELETE'])
+@jwt_required()
+def delete_saved_search(search_id):
+    """Stop alerting on a saved search."""
+    user_id = get_jwt_identity()
+    
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        if not saved_search_service.delete_saved_search(cursor, user_id, search_id):
+            return jsonify({'message': 'Saved search not found'}), 404
+    
+    return jsonify({'message': 'Saved search deleted'}), 200
+
+@investors_bp.route('/saved-searches/matches', methods=['GET'])
+@jwt_required()
+def get_saved_search_matches():
+    """Deals published since that match the investor's saved searches."""
+    user_id = get_jwt_identity()
+    unread_only = request.args.get('unread', type=int) == 1
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 200)
+    
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        return jsonify(saved_search_service.list_matches(cursor, user_id, unread_only, limit)), 200
+
+@investors_bp.route('/saved-searches/matches/read', methods=['POST'])
+@jwt_required()
+def mark_saved_search_matches_read():
+    """Mark the given matches (or all of them) as read."""
+    user_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
+    ids = data.get('ids')
+    
+    if ids is not None and (not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids)):
+        return jsonify({'message': 'ids must be a list of match IDs'}), 400
+    
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        updated = saved_search_service.mark_matches_read(cursor, user_id, ids)
+    
+    return jsonify({'updated': updated}), 200
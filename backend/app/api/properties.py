@@ -1,10 +1,15 @@
 # backend/app/api/properties.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.database import get_db_connection
+from app.database import get_db_connection, insert_many, placeholder
 from app.utils.auth import jwt_required_custom
-from app.services.calculation_service import ShariaCompliantCalculator
-import json
+from app.services.property_service import (
+    detail_projection, feed_filters, get_property_detail, get_property_details_batch,
+    listing_projection, property_version
+)
+from app.services import comparison_service
+from app.services.comparison_service import MAX_COMPARE, MIN_COMPARE
+from app.utils.etags import client_has, not_modified, weak_etag, with_etag
 
 properties_bp = Blueprint('properties', __name__)
 
@@ -24,134 +29,140 @@ def get_properties():
     sort_by = request.args.get('sort_by', 'created_at')
     sort_order = request.args.get('sort_order', 'desc')
     
-    with get_db_connection() as conn:
+    # ?fields=id,asking_price,metrics&lang=ar trims the cards (and the columns read)
+    projection = None
+    if request.args.get('fields') or request.args.get('lang'):
+        try:
+            projection = listing_projection.parse(request.args.get('fields'), request.args.get('lang'))
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+    
+    # Listing pages are served from the pre-rendered property_feed table:
+    # one indexed, single-table read with no joins, metrics or JSON parsing
+    where, params = feed_filters(min_price, max_price, city, property_type, strategy, alias='f')
+    
+    with get_db_connection(intent='read') as conn:
         cursor = conn.cursor()
         
-        # Build query
-        query = """
-            SELECT 
-                p.id, p.property_id, p.address, p.postcode, p.city,
-                p.property_type, p.bedrooms, p.bathrooms, p.square_feet,
-                p.asking_price, p.monthly_rent, p.bmv_score, p.tier,
-                dp.title_en, dp.title_ar, dp.description_en, dp.description_ar,
-                dp.strategy, dp.refurbishment_cost, dp.stamp_duty, dp.legal_fees,
-                dp.sourcing_fee, dp.other_costs, dp.annual_costs,
-                dp.images, dp.documents
-            FROM properties p
-            JOIN deal_packages dp ON p.id = dp.property_id
-            WHERE p.published = TRUE AND dp.published = TRUE
-        """
-        
-        params = []
-        
-        if min_price:
-            query += " AND p.asking_price >= %s"
-            params.append(min_price)
-        
-        if max_price:
-            query += " AND p.asking_price <= %s"
-            params.append(max_price)
-        
-        if city:
-            query += " AND p.city ILIKE %s"
-            params.append(f'%{city}%')
-        
-        if property_type:
-            query += " AND p.property_type = %s"
-            params.append(property_type)
+        # Total count plus version markers for the ETag: every feed refresh
+        # bumps refreshed_at, and (un)publishing changes the count
+        cursor.execute("""
+            SELECT COUNT(*) as total, MAX(f.refreshed_at) as refreshed_at
+            FROM property_feed f
+        """ + where, params)
+        version = cursor.fetchone()
+        total = version['total']
         
-        if strategy:
-            query += " AND dp.strategy = %s"
-            params.append(strategy)
+        etag = weak_etag(request.query_string, total, version['refreshed_at'])
+        if client_has(etag):
+            return not_modified(etag)
         
         # Add sorting
         valid_sort_fields = ['asking_price', 'monthly_rent', 'created_at', 'bmv_score']
-        if sort_by in valid_sort_fields:
-            query += f" ORDER BY p.{sort_by} {sort_order.upper()}"
+        if sort_by not in valid_sort_fields:
+            sort_by = 'created_at'
+        direction = 'ASC' if sort_order.lower() == 'asc' else 'DESC'
+        
+        # Projections read their columns from the feed, joining the source
+        # tables only for columns the feed does not carry
+        select = 'f.payload'
+        joins = ''
+        if projection:
+            select = ', '.join(listing_projection.columns(projection))
+            tables = listing_projection.tables(projection)
+            if 'p' in tables:
+                joins += ' JOIN properties p ON p.id = f.property_id'
+            if 'dp' in tables:
+                joins += ' JOIN deal_packages dp ON dp.id = f.deal_id'
         
         # Add pagination
-        query += " LIMIT %s OFFSET %s"
-        params.extend([per_page, (page - 1) * per_page])
-        
-        cursor.execute(query, params)
-        properties = cursor.fetchall()
-        
-        # Get total count
-        count_query = """
-            SELECT COUNT(*) as total
-            FROM properties p
-            JOIN deal_packages dp ON p.id = dp.property_id
-            WHERE p.published = TRUE AND dp.published = TRUE
-        """
-        
-        if min_price or max_price or city or property_type or strategy:
-            count_params = params[:-2]  # Remove pagination params
-            cursor.execute(count_query + query.split('WHERE')[1].split('ORDER')[0], count_params)
-        else:
-            cursor.execute(count_query)
-        
-        total = cursor.fetchone()['total']
-        
-        # Calculate Sharia-compliant metrics for each property
-        calculator = ShariaCompliantCalculator()
-        results = []
+        cursor.execute(f"""
+            SELECT {select}
+            FROM property_feed f{joins}
+            {where}
+            ORDER BY f.{sort_by} {direction}, f.property_id {direction}
+            LIMIT {placeholder()} OFFSET {placeholder()}
+        """, params + [per_page, (page - 1) * per_page])
+        rows = cursor.fetchall()
+    
+    pagination = {
+        'total': total,
+        'page': page,
+        'per_page': per_page,
+        'total_pages': (total + per_page - 1) // per_page
+    }
+    
+    if projection:
+        encode = listing_projection.encoder(projection)
+        return with_etag(jsonify({
+            'properties': [encode(row) for row in rows],
+            'pagination': pagination
+        }), etag), 200
+    
+    cards = ','.join(row['payload'] for row in rows)
+    body = '{"properties":[' + cards + '],"pagination":' + current_app.json.dumps(pagination) + '}'
+    return with_etag(current_app.response_class(body, mimetype='application/json'), etag), 200
+
+@properties_bp.route('/properties/batch', methods=['POST'])
+@jwt_required()
+def get_properties_batch():
+    """Get several properties' details in one round trip, in request order."""
+    data = request.get_json(silent=True) or {}
+    ids = data.get('ids')
+    max_ids = current_app.config.get('PROPERTY_BATCH_MAX_IDS', 100)
+    
+    if not isinstance(ids, list) or not ids:
+        return jsonify({'message': 'ids must be a non-empty list of property IDs'}), 400
+    if len(ids) > max_ids:
+        return jsonify({'message': f'At most {max_ids} IDs per request'}), 400
+    if not all(isinstance(pid, int) and not isinstance(pid, bool) for pid in ids):
+        return jsonify({'message': 'ids must be integers'}), 400
+    
+    try:
+        projection = detail_projection.parse(data.get('fields'), data.get('lang'))
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    user_id = get_jwt_identity()
+    
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        found = get_property_details_batch(cursor, ids, projection)
         
-        for prop in properties:
-            # Calculate metrics
-            total_costs = (
-                (prop['refurbishment_cost'] or 0) +
-                (prop['stamp_duty'] or 0) +
-                (prop['legal_fees'] or 0) +
-                (prop['sourcing_fee'] or 0) +
-                (prop['other_costs'] or 0)
-            )
-            
-            metrics = calculator.calculate_investment_metrics(
-                purchase_price=prop['asking_price'],
-                monthly_rent=prop['monthly_rent'],
-                annual_costs=prop['annual_costs'] or 0,
-                total_costs=total_costs
+        # Log one view per property returned, in a single statement
+        insert_many(cursor, 'activity_logs', ['user_id', 'action', 'resource_type', 'resource_id'],
+                    [(user_id, 'view_property', 'property', pid) for pid in found])
+    
+    return jsonify({
+        'properties': [
+            found[pid] if pid in found else {'id': pid, 'error': 'not_found'}
+            for pid in ids
+        ],
+        'not_found': [pid for pid in dict.fromkeys(ids) if pid not in found]
+    }), 200
+
+@properties_bp.route('/properties/compare', methods=['POST'])
+@jwt_required()
+def compare_properties():
+    """Compare 2-20 properties side by side under shared assumptions."""
+    data = request.get_json(silent=True) or {}
+    ids = data.get('ids')
+    
+    if not isinstance(ids, list) or not all(isinstance(pid, int) and not isinstance(pid, bool) for pid in ids):
+        return jsonify({'message': 'ids must be a list of property IDs'}), 400
+    if not MIN_COMPARE <= len(set(ids)) <= MAX_COMPARE:
+        return jsonify({'message': f'Compare between {MIN_COMPARE} and {MAX_COMPARE} properties'}), 400
+    
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            comparison = comparison_service.compare_properties(
+                cursor, ids, data.get('assumptions'), lang=data.get('lang')
             )
-            
-            # Parse JSON fields
-            images = json.loads(prop['images']) if prop['images'] else []
-            
-            results.append({
-                'id': prop['id'],
-                'property_id': prop['property_id'],
-                'title': {
-                    'en': prop['title_en'],
-                    'ar': prop['title_ar']
-                },
-                'description': {
-                    'en': prop['description_en'],
-                    'ar': prop['description_ar']
-                },
-                'address': prop['address'],
-                'city': prop['city'],
-                'postcode': prop['postcode'],
-                'property_type': prop['property_type'],
-                'bedrooms': prop['bedrooms'],
-                'bathrooms': prop['bathrooms'],
-                'square_feet': prop['square_feet'],
-                'asking_price': float(prop['asking_price']) if prop['asking_price'] else 0,
-                'monthly_rent': float(prop['monthly_rent']) if prop['monthly_rent'] else 0,
-                'strategy': prop['strategy'],
-                'bmv_score': prop['bmv_score'],
-                'tier': prop['tier'],
-                'images': images,
-                'metrics': metrics
-            })
-        
-        return jsonify({
-            'properties': results,
-            'pagination': {
-                'total': total,
-                'page': page,
-                'per_page': per_page,
-                'total_pages': (total + per_page - 1) // per_page
-            }
-        }), 200
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+    
+    return jsonify(comparison), 200
 
 @properties_bp.route('/properties/<int:property_id>', methods=['GET'])
 @jwt_required()
@@ -159,23 +170,20 @@ def get_property_details(property_id):
     """Get detailed property information."""
     user_id = get_jwt_identity()
     
+    # ?fields=id,title,location&lang=en returns (and reads) just those parts
+    try:
+        projection = detail_projection.parse(request.args.get('fields'), request.args.get('lang'))
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
     with get_db_connection() as conn:
         cursor = conn.cursor()
         
-        # Get property details
-        cursor.execute("""
-            SELECT 
-                p.*, 
-                dp.*,
-                p.id as property_id
-            FROM properties p
-            JOIN deal_packages dp ON p.id = dp.property_id
-            WHERE p.id = %s AND p.published = TRUE AND dp.published = TRUE
-        """, (property_id,))
-        
-        property_data = cursor.fetchone()
+        # Version check first, so up-to-date clients skip the full row,
+        # the metrics and serialization
+        etag = property_version(cursor, property_id)
         
-        if not property_data:
+        if not etag:
             return jsonify({'message': 'Property not found'}), 404
         
         # Log property view
@@ -184,73 +192,16 @@ def get_property_details(property_id):
             VALUES (%s, %s, %s, %s)
         """, (user_id, 'view_property', 'property', property_id))
         
-        # Calculate detailed Sharia-compliant metrics
-        calculator = ShariaCompliantCalculator()
+        # Projections are different representations of the same version
+        if request.args.get('fields') or request.args.get('lang'):
+            etag = weak_etag(etag, request.args.get('fields'), request.args.get('lang'))
         
-        total_costs = (
-            (property_data['refurbishment_cost'] or 0) +
-            (property_data['stamp_duty'] or 0) +
-            (property_data['legal_fees'] or 0) +
-            (property_data['sourcing_fee'] or 0) +
-            (property_data['other_costs'] or 0)
-        )
+        if client_has(etag):
+            return not_modified(etag)
         
-        detailed_metrics = calculator.calculate_detailed_metrics(
-            purchase_price=property_data['asking_price'],
-            monthly_rent=property_data['monthly_rent'],
-            refurbishment_cost=property_data['refurbishment_cost'] or 0,
-            stamp_duty=property_data['stamp_duty'] or 0,
-            legal_fees=property_data['legal_fees'] or 0,
-            sourcing_fee=property_data['sourcing_fee'] or 0,
-            other_costs=property_data['other_costs'] or 0,
-            annual_costs=property_data['annual_costs'] or 0,
-            void_percentage=property_data['void_percentage'] or 10,
-            maintenance_percentage=property_data['maintenance_percentage'] or 5,
-            management_percentage=property_data['management_percentage'] or 10
-        )
+        result = get_property_detail(cursor, property_id, etag, projection)
         
-        # Parse JSON fields
-        images = json.loads(property_data['images']) if property_data['images'] else []
-        documents = json.loads(property_data['documents']) if property_data['documents'] else []
-        location_data = json.loads(property_data['location_data']) if property_data['location_data'] else {}
-        
-        result = {
-            'id': property_data['property_id'],
-            'title': {
-                'en': property_data['title_en'],
-                'ar': property_data['title_ar']
-            },
-            'description': {
-                'en': property_data['description_en'],
-                'ar': property_data['description_ar']
-            },
-            'address': property_data['address'],
-            'city': property_data['city'],
-            'postcode': property_data['postcode'],
-            'property_details': {
-                'type': property_data['property_type'],
-                'bedrooms': property_data['bedrooms'],
-                'bathrooms': property_data['bathrooms'],
-                'square_feet': property_data['square_feet']
-            },
-            'financial_details': {
-                'asking_price': float(property_data['asking_price']) if property_data['asking_price'] else 0,
-                'refurbishment_cost': float(property_data['refurbishment_cost']) if property_data['refurbishment_cost'] else 0,
-                'stamp_duty': float(property_data['stamp_duty']) if property_data['stamp_duty'] else 0,
-                'legal_fees': float(property_data['legal_fees']) if property_data['legal_fees'] else 0,
-                'sourcing_fee': float(property_data['sourcing_fee']) if property_data['sourcing_fee'] else 0,
-                'other_costs': float(property_data['other_costs']) if property_data['other_costs'] else 0,
-                'monthly_rent': float(property_data['monthly_rent']) if property_data['monthly_rent'] else 0
-            },
-            'investment_strategy': property_data['strategy'],
-            'bmv_analysis': {
-                'score': property_data['bmv_score'],
-                'tier': property_data['tier']
-            },
-            'sharia_compliant_metrics': detailed_metrics,
-            'images': images,
-            'documents': documents,
-            'location': location_data
-        }
+        if not result:
+            return jsonify({'message': 'Property not found'}), 404
         
-        return jsonify(result), 200
\ No newline at end of file
+        return with_etag(jsonify(result), etag), 200
\ No newline at end of file
@@ -1,6 +1,6 @@
 # backend/app/api/public.py
 from flask import Blueprint, jsonify
-from app.database import get_db_connection, test_db_connection
+from app.database import get_db_connection, is_sqlite, test_db_connection
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,12 +10,12 @@ public_bp = Blueprint('public', __name__)
 def get_public_stats():
     """Get public platform statistics."""
     try:
-        with get_db_connection() as conn:
+        with get_db_connection(intent='read') as conn:
             cursor = conn.cursor()
             
             # Get property count
             cursor.execute("SELECT COUNT(*) as count FROM properties WHERE published = 1" if 
-                          conn.__class__.__name__ == 'Connection' else  # SQLite
+                          is_sqlite() else
                           "SELECT COUNT(*) as count FROM properties WHERE published = TRUE")
             
             result = cursor.fetchone()
@@ -0,0 +1,138 @@
+# backend/app/cli.py
+import click
+from flask import Flask
+
+def register_commands(app: Flask):
+    """Register maintenance commands on the Flask CLI."""
+
+    @app.cli.command('import-properties')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'file_format', type=click.Choice(['csv', 'jsonl']),
+                  help='File format (inferred from the extension by default).')
+    @click.option('--resume', 'job_id', type=int,
+                  help='Resume an interrupted import job after its last committed chunk.')
+    @click.option('--chunk-size', type=int, help='Rows upserted per committed chunk.')
+    def import_properties(path, file_format, job_id, chunk_size):
+        """Stream a CSV/JSONL listings dump into the properties table."""
+        from app.services.import_service import PropertyImporter, detect_format
+
+        file_format = file_format or detect_format(path)
+        if not file_format:
+            raise click.UsageError('Cannot infer format, pass --format csv|jsonl')
+
+        importer = PropertyImporter(chunk_size=chunk_size)
+        with open(path, 'rb') as stream:
+            try:
+                job = importer.run(stream, file_format, source_name=path, job_id=job_id)
+            except ValueError as e:
+                raise click.ClickException(str(e))
+
+        click.echo(
+            f"Import {job['id']} {job['status']}: {job['rows_processed']} rows processed, "
+            f"{job['rows_imported']} imported, {job['rows_failed']} failed"
+        )
+        for error in importer.get_errors(job['id'], per_page=20):
+            click.echo(f"  row {error['row']} [{error['field'] or '-'}]: {error['message']}")
+
+    @app.cli.command('send-queued-emails')
+    @click.option('--batch-size', type=int, default=100, help='Emails sent per SMTP connection.')
+    def send_queued_emails_command(batch_size):
+        """Deliver notification emails waiting in the email queue."""
+        from app.services.email_service import send_queued_emails
+
+        total = 0
+        while True:
+            sent = send_queued_emails(batch_size=batch_size)
+            total += sent
+            if sent < batch_size:
+                break
+        click.echo(f'Sent {total} queued emails')
+
+    @app.cli.command('send-search-digests')
+    @click.option('--batch-size', type=int, default=200, help='Investors digested per transaction.')
+    def send_search_digests_command(batch_size):
+        """Queue digest emails for new saved-search matches."""
+        from app.services.saved_search_service import send_search_digests
+
+        emails, digested = send_search_digests(batch_size=batch_size)
+        click.echo(f'Queued {emails} digest emails covering {digested} matches')
+
+    @app.cli.command('screen-users')
+    @click.option('--workers', type=int, help='Screening processes (defaults to CPU count).')
+    @click.option('--chunk-size', type=int, default=500, help='Users per worker task.')
+    def screen_users(workers, chunk_size):
+        """Screen every user against the configured sanctions/PEP lists."""
+        from app.services.screening_service import screen_all_users
+
+        screened, flagged = screen_all_users(workers=workers, chunk_size=chunk_size)
+        click.echo(f'Screened {screened} users, {flagged} potential matches')
+
+    @app.cli.command('rescreen-sanctions')
+    def rescreen_sanctions():
+        """Screen customers against entries added or changed since the last list version."""
+        from app.services.monitoring_service import rescreen_list_changes
+
+        for result in rescreen_list_changes():
+            click.echo(
+                f"{result['list_name']}: {result['changed']} of {result['entries']} entries changed, "
+                f"{result['removed']} removed, {result['alerts_created']} new alerts"
+            )
+
+    @app.cli.command('scan-kyc-expiry')
+    @click.option('--warning-days', type=int, help='Override ComplianceConfig.kyc_expiry_warning_days.')
+    def scan_kyc_expiry(warning_days):
+        """Expire lapsed KYC documents and queue reminders (safe to run every few minutes)."""
+        from app.services.kyc_service import scan_document_expiry
+
+        counts = scan_document_expiry(warning_days=warning_days)
+        click.echo(f"{counts['expired']} documents expired, {counts['requires_update']} entering the warning window")
+
+    @app.cli.command('compliance-report')
+    @click.option('--start', required=True, help='Period start (YYYY-MM-DD).')
+    @click.option('--end', required=True, help='Period end (YYYY-MM-DD).')
+    @click.option('--type', 'report_type', default='periodic', help='Report type label.')
+    @click.option('--output', type=click.Path(dir_okay=False), help='Write the report as .csv or .pdf.')
+    def compliance_report(start, end, report_type, output):
+        """Generate a compliance report from the daily rollups."""
+        from app.services.report_service import generate_compliance_report, report_to_csv, report_to_pdf
+
+        report = generate_compliance_report(start, end, report_type=report_type)
+        click.echo(
+            f'Report {report.id}: {report.total_customers} customers, {report.kyc_completed} KYC completed, '
+            f'{report.kyc_pending} pending, {report.sanctions_checks_performed} checks, '
+            f'{report.pep_matches} PEP matches, {report.alerts_generated} alerts raised, '
+            f'{report.alerts_resolved} resolved'
+        )
+        if output:
+            if output.endswith('.pdf'):
+                with open(output, 'wb') as handle:
+                    handle.write(report_to_pdf(report))
+            else:
+                with open(output, 'w', newline='') as handle:
+                    handle.write(report_to_csv(report))
+            click.echo(f'Written to {output}')
+
+    @app.cli.command('rebuild-compliance-rollups')
+    def rebuild_compliance_rollups():
+        """Recompute the daily compliance rollups from the raw tables."""
+        from app.services.report_service import rebuild_rollups
+
+        rebuild_rollups()
+        click.echo('Compliance rollups rebuilt')
+
+    @app.cli.command('rate-customers')
+    @click.option('--chunk-size', type=int, default=500, help='Customers evaluated per batch.')
+    def rate_customers_command(chunk_size):
+        """Re-rate customer risk for customers whose CDD inputs changed."""
+        from app.services.risk_service import rate_customers
+
+        summary = rate_customers(chunk_size=chunk_size)
+        ratings = ', '.join(f'{summary.get(rating, 0)} {rating}' for rating in ('low', 'medium', 'high', 'prohibited'))
+        click.echo(f"{summary.get('evaluated', 0)} customers evaluated, {summary.get('updated', 0)} updated ({ratings})")
+
+    @app.cli.command('rebuild-property-feed')
+    def rebuild_property_feed_command():
+        """Re-render every published listing card in the property feed."""
+        from app.services.property_service import rebuild_property_feed
+
+        click.echo(f'Property feed rebuilt with {rebuild_property_feed()} listings')
@@ -15,6 +15,25 @@ class Config:
     # Database - Use SQLite for development if PostgreSQL not available
     DATABASE_URL = os.environ.get('DATABASE_URL') or 'sqlite:///property_investment.db'
     
+    # PostgreSQL connections kept per worker process (0 connects per request),
+    # and executions of a statement before each connection PREPAREs it (0 never)
+    DATABASE_POOL_SIZE = int(os.environ.get('DATABASE_POOL_SIZE', 10))
+    DATABASE_POOL_TIMEOUT = float(os.environ.get('DATABASE_POOL_TIMEOUT', 10))
+    PREPARE_THRESHOLD = int(os.environ.get('PREPARE_THRESHOLD', 5))
+    PREPARED_STATEMENTS_MAX = int(os.environ.get('PREPARED_STATEMENTS_MAX', 100))
+    
+    # Read replicas for read-intent connections (comma-separated URLs; SQLite
+    # file copies work for local testing). Replicas further behind than
+    # REPLICA_MAX_LAG_SECONDS, or failing, are skipped for REPLICA_RETRY_SECONDS,
+    # and a user's reads stay on the primary for REPLICA_STICKY_SECONDS after
+    # they change something
+    DATABASE_REPLICA_URLS = os.environ.get('DATABASE_REPLICA_URLS', '')
+    REPLICA_SELECTION = os.environ.get('REPLICA_SELECTION', 'least_loaded')  # or round_robin
+    REPLICA_MAX_LAG_SECONDS = float(os.environ.get('REPLICA_MAX_LAG_SECONDS', 5))
+    REPLICA_LAG_CHECK_SECONDS = float(os.environ.get('REPLICA_LAG_CHECK_SECONDS', 2))
+    REPLICA_RETRY_SECONDS = float(os.environ.get('REPLICA_RETRY_SECONDS', 30))
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 5))
+    
     # JWT
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or SECRET_KEY
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
@@ -32,6 +51,15 @@ class Config:
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'pdf', 'jpg', 'jpeg', 'png', 'doc', 'docx'}
     
+    # Bulk property import (rows upserted per committed chunk)
+    PROPERTY_IMPORT_CHUNK_SIZE = int(os.environ.get('PROPERTY_IMPORT_CHUNK_SIZE', 1000))
+    
+    # Admin exports (rows fetched per server-side cursor round trip)
+    EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 2000))
+    
+    # Seconds an admin investor drill-down stays cached per worker
+    INVESTOR_DETAIL_CACHE_TTL = int(os.environ.get('INVESTOR_DETAIL_CACHE_TTL', 30))
+    
     # Google Maps (optional)
     GOOGLE_MAPS_API_KEY = os.environ.get('GOOGLE_MAPS_API_KEY', '')
     
@@ -42,6 +70,56 @@ class Config:
     PROPERTY_DATA_API_KEY = os.environ.get('PROPERTY_DATA_API_KEY', '')
     SEARCHLAND_API_KEY = os.environ.get('SEARCHLAND_API_KEY', '')
     
+    # Sanctions/PEP screening: comma-separated name=path list files (OFSI CSV or PEP CSV)
+    SANCTIONS_LISTS = os.environ.get('SANCTIONS_LISTS', '')
+    SCREENING_MATCH_THRESHOLD = float(os.environ.get('SCREENING_MATCH_THRESHOLD', 0.88))
+    SCREENING_WORKERS = int(os.environ.get('SCREENING_WORKERS', 0))
+    
+    # Customer risk rating: comma-separated country names/codes and the enhanced DD amount
+    HIGH_RISK_COUNTRIES = os.environ.get('HIGH_RISK_COUNTRIES', '')
+    PROHIBITED_COUNTRIES = os.environ.get('PROHIBITED_COUNTRIES', '')
+    ENHANCED_DD_THRESHOLD = float(os.environ.get('ENHANCED_DD_THRESHOLD', 10000))
+    
+    # Compliance alert queue: how long a claimed alert stays with an officer
+    ALERT_LEASE_SECONDS = int(os.environ.get('ALERT_LEASE_SECONDS', 900))
+    
+    # Request instrumentation (/metrics); Server-Timing headers are always sent in debug mode
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    SERVER_TIMING = os.environ.get('SERVER_TIMING', 'false').lower() == 'true'
+    
+    # Query tracing: slow-query log threshold/size, N+1 warning threshold and
+    # plan logging for statements slower than QUERY_EXPLAIN_MS (0 disables it)
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))
+    SLOW_QUERY_LOG_SIZE = int(os.environ.get('SLOW_QUERY_LOG_SIZE', 200))
+    N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 10))
+    QUERY_EXPLAIN_MS = float(os.environ.get('QUERY_EXPLAIN_MS', 0))
+    
+    # JSON responses: 'auto' uses orjson when installed, 'stdlib' forces the json module
+    JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+    
+    # Response compression: brotli when installed and accepted, else gzip
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))
+    GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', '6'))
+    BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', '5'))
+    
+    # Published property detail cache: per-worker LRU in front of Redis
+    # (REDIS_URL unset keeps both tiers in-process)
+    REDIS_URL = os.environ.get('REDIS_URL', '')
+    PROPERTY_CACHE_TTL = int(os.environ.get('PROPERTY_CACHE_TTL', 600))
+    PROPERTY_CACHE_LOCAL_TTL = int(os.environ.get('PROPERTY_CACHE_LOCAL_TTL', 60))
+    PROPERTY_CACHE_MAX_ENTRIES = int(os.environ.get('PROPERTY_CACHE_MAX_ENTRIES', 2048))
+    
+    # POST /api/properties/batch: maximum IDs per request
+    PROPERTY_BATCH_MAX_IDS = int(os.environ.get('PROPERTY_BATCH_MAX_IDS', 100))
+    
+    # Live updates (GET /api/events): LISTEN/NOTIFY channel, per-worker
+    # connection cap, heartbeat interval and events buffered per slow client
+    EVENTS_CHANNEL = os.environ.get('EVENTS_CHANNEL', 'proptech_events')
+    EVENTS_MAX_SUBSCRIBERS = int(os.environ.get('EVENTS_MAX_SUBSCRIBERS', 5000))
+    EVENTS_HEARTBEAT_SECONDS = int(os.environ.get('EVENTS_HEARTBEAT_SECONDS', 20))
+    EVENTS_QUEUE_SIZE = int(os.environ.get('EVENTS_QUEUE_SIZE', 100))
+    
     # Supported Languages
     LANGUAGES = ['en', 'ar']
     DEFAULT_LANGUAGE = 'en'
\ No newline at end of file
@@ -1,24 +1,104 @@
 # backend/app/database.py
 import sqlite3
 import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, connection as PsycopgConnection
 from psycopg2.extras import RealDictCursor
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
 from flask import current_app
 import logging
 import os
+import threading
+import uuid
+from app.utils.db_tracing import TracedConnection
+from app.utils.replicas import POSTGRES_LAG_QUERY, replica_router
+from app.utils.sql_dialect import postgres_dialect, sqlite_dialect
 
 logger = logging.getLogger(__name__)
 
+class PreparingConnection(PsycopgConnection):
+    """psycopg2 connection that remembers the statements it has PREPAREd."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
+
+class PoolExhausted(psycopg2.OperationalError):
+    """Every pooled connection stayed busy for the pool timeout.
+
+    The database itself may be healthy; the replica router must not take
+    this as a dead replica.
+    """
+
+class ConnectionPool:
+    """Per-process pool of PostgreSQL connections that waits when all are busy.
+
+    Reusing connections saves the connect handshake on every request and
+    keeps each connection's prepared statements alive.
+    """
+
+    def __init__(self, database_url, size=10, timeout=10):
+        self.database_url = database_url
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolExhausted(f'No database connection free after {self.timeout}s')
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None or conn.closed:
+            try:
+                conn = psycopg2.connect(self.database_url, connection_factory=PreparingConnection,
+                                        cursor_factory=RealDictCursor)
+            except Exception:
+                self._slots.release()
+                raise
+        return conn
+
+    def release(self, conn, broken=False):
+        try:
+            if broken or conn.closed or conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                conn.close()
+            else:
+                with self._lock:
+                    self._idle.append(conn)
+        finally:
+            self._slots.release()
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def _connection_pool(database_url):
+    """This process's pool for database_url, or None when pooling is disabled."""
+    size = current_app.config.get('DATABASE_POOL_SIZE', 10)
+    if size <= 0:
+        return None
+    # Keyed by pid: connections must not be shared with a forked parent
+    key = (os.getpid(), database_url)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(
+                    database_url, size, current_app.config.get('DATABASE_POOL_TIMEOUT', 10)
+                )
+    return pool
+
 @contextmanager
-def get_db_connection():
-    """Create a database connection context manager that works with both SQLite and PostgreSQL."""
-    database_url = current_app.config['DATABASE_URL']
-    
+def _connect(database_url, read_only=False):
+    """A committed-on-exit connection to one database (primary or replica)."""
     if database_url.startswith('sqlite'):
-        # SQLite connection
+        # SQLite connection (replica copies are opened read-only)
         db_path = database_url.replace('sqlite:///', '')
-        conn = sqlite3.connect(db_path)
+        if read_only:
+            conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+        else:
+            conn = sqlite3.connect(db_path)
         conn.row_factory = sqlite3.Row  # This makes rows accessible by column name
+        conn = TracedConnection(conn, sqlite_dialect)
         try:
             yield conn
             conn.commit()
@@ -28,20 +108,139 @@ def get_db_connection():
         finally:
             conn.close()
     else:
-        # PostgreSQL connection
+        # PostgreSQL connection, pooled per worker process
+        pool = _connection_pool(database_url)
         try:
-            conn = psycopg2.connect(database_url, cursor_factory=RealDictCursor)
-            try:
-                yield conn
-                conn.commit()
-            except Exception:
-                conn.rollback()
-                raise
-            finally:
-                conn.close()
+            if pool:
+                raw = pool.acquire()
+            else:
+                raw = psycopg2.connect(database_url, connection_factory=PreparingConnection,
+                                       cursor_factory=RealDictCursor)
         except psycopg2.OperationalError as e:
             logger.error(f"PostgreSQL connection failed: {e}")
             raise
+        
+        conn = TracedConnection(raw, postgres_dialect)
+        broken = False
+        try:
+            yield conn
+            conn.commit()
+        except Exception as e:
+            broken = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                broken = True
+            raise
+        finally:
+            if pool:
+                pool.release(raw, broken)
+            else:
+                raw.close()
+
+def _replica_lag(conn, database_url):
+    if database_url.startswith('sqlite'):
+        return 0
+    cursor = conn.cursor()
+    cursor.execute(POSTGRES_LAG_QUERY)
+    return cursor.fetchone()['lag']
+
+@contextmanager
+def get_db_connection(intent='write'):
+    """Create a database connection context manager that works with both SQLite and PostgreSQL.
+    
+    Statements may be written PostgreSQL-style (%s, ILIKE, ::casts); on
+    SQLite they are translated, on PostgreSQL hot ones run prepared.
+    intent='read' marks a read-only unit of work that a read replica may
+    serve (see app.utils.replicas); a replica that cannot be reached or is
+    lagging falls back to the primary, DATABASE_URL.
+    """
+    replica = replica_router.choose() if intent == 'read' else None
+    if replica is not None:
+        try:
+            stack = ExitStack()
+            try:
+                conn = stack.enter_context(_connect(replica.url, read_only=True))
+                if replica_router.lag_check_due(replica):
+                    replica_router.record_lag(replica, _replica_lag(conn, replica.url))
+            except PoolExhausted as e:
+                # Busy, not down: this read goes to the primary, the next may not
+                stack.__exit__(type(e), e, e.__traceback__)
+                conn = None
+            except (psycopg2.Error, sqlite3.Error) as e:
+                stack.__exit__(type(e), e, e.__traceback__)
+                replica_router.mark_down(replica, e)
+                conn = None
+            if conn is not None and replica.lag > replica_router.max_lag:
+                stack.close()
+                conn = None
+            if conn is not None:
+                with stack:
+                    yield conn
+                return
+        finally:
+            replica_router.release(replica)
+    
+    with _connect(current_app.config['DATABASE_URL']) as conn:
+        yield conn
+    if intent != 'read':
+        replica_router.record_write()
+
+def is_sqlite():
+    """Return True when the configured database is SQLite."""
+    return current_app.config['DATABASE_URL'].startswith('sqlite')
+
+def placeholder():
+    """Return the parameter placeholder for the configured database."""
+    return '?' if is_sqlite() else '%s'
+
+def any_clause(column, values):
+    """Build a set-membership predicate and its parameters.
+    
+    PostgreSQL binds the whole list as one array (`= ANY(%s)`); SQLite has
+    no arrays, so the list is expanded into `IN (?, ?, ...)`.
+    """
+    values = list(values)
+    if is_sqlite():
+        return f"{column} IN ({', '.join('?' for _ in values)})", values
+    return f"{column} = ANY(%s)", [values]
+
+def insert_many(cursor, table, columns, rows, on_conflict=''):
+    """Insert all rows with a single multi-row INSERT statement.
+    
+    on_conflict is appended verbatim, e.g. an `ON CONFLICT (...) DO UPDATE` clause.
+    """
+    if not rows:
+        return
+    p = placeholder()
+    row_sql = '(' + ', '.join(p for _ in columns) + ')'
+    cursor.execute(
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join(row_sql for _ in rows)} {on_conflict}",
+        [value for row in rows for value in row]
+    )
+
+def stream_query(conn, query, params=(), chunk_size=1000):
+    """Yield rows in chunks without holding the whole result set in memory.
+    
+    PostgreSQL uses a server-side (named) cursor so rows stay on the server
+    until fetched; SQLite cursors already step through results lazily.
+    """
+    if is_sqlite():
+        cursor = conn.cursor()
+    else:
+        cursor = conn.cursor(name=f'stream_{uuid.uuid4().hex}')
+        cursor.itersize = chunk_size
+    
+    try:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for row in rows:
+                yield row
+    finally:
+        cursor.close()
 
 def init_db():
     """Initialize the database with required tables."""
@@ -110,6 +309,399 @@ def init_db():
             );
             """)
             
+            # Deal packages: the investor-facing listing for a property
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS deal_packages (
+                id {auto_increment},
+                property_id INTEGER NOT NULL,
+                title_en VARCHAR(255),
+                title_ar VARCHAR(255),
+                description_en TEXT,
+                description_ar TEXT,
+                strategy VARCHAR(50),
+                refurbishment_cost DECIMAL(12,2) DEFAULT 0,
+                stamp_duty DECIMAL(12,2) DEFAULT 0,
+                legal_fees DECIMAL(12,2) DEFAULT 0,
+                sourcing_fee DECIMAL(12,2) DEFAULT 0,
+                other_costs DECIMAL(12,2) DEFAULT 0,
+                annual_costs DECIMAL(12,2) DEFAULT 0,
+                void_percentage DECIMAL(5,2) DEFAULT 10,
+                maintenance_percentage DECIMAL(5,2) DEFAULT 5,
+                management_percentage DECIMAL(5,2) DEFAULT 10,
+                images {json_type.replace(" DEFAULT '{}'", " DEFAULT '[]'")},
+                documents {json_type.replace(" DEFAULT '{}'", " DEFAULT '[]'")},
+                location_data {json_type},
+                published {boolean_type},
+                created_at {timestamp_default},
+                updated_at {timestamp_default}
+            );
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_deal_packages_property
+            ON deal_packages (property_id);
+            """)
+
+            # Published listing feed: one pre-rendered card per published deal,
+            # refreshed incrementally by property_service.refresh_property_feed
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS property_feed (
+                property_id INTEGER PRIMARY KEY,
+                deal_id INTEGER NOT NULL,
+                city VARCHAR(100),
+                property_type VARCHAR(50),
+                strategy VARCHAR(50),
+                asking_price DECIMAL(12,2),
+                monthly_rent DECIMAL(10,2),
+                bmv_score INTEGER,
+                created_at {timestamp_default.replace('DEFAULT CURRENT_TIMESTAMP', 'NULL')},
+                payload TEXT NOT NULL,
+                refreshed_at {timestamp_default}
+            );
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_property_feed_created
+            ON property_feed (created_at DESC, property_id DESC);
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_property_feed_price
+            ON property_feed (asking_price);
+            """)
+
+            # Investors' saved listing filters. '' in city/property_type/strategy
+            # means "any", so the match index can look up a deal's exact values
+            # and the wildcard with plain equality
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS saved_searches (
+                id {auto_increment},
+                user_id INTEGER NOT NULL,
+                name VARCHAR(100),
+                min_price DECIMAL(12,2) DEFAULT 0,
+                max_price DECIMAL(12,2),
+                city VARCHAR(100) NOT NULL DEFAULT '',
+                property_type VARCHAR(50) NOT NULL DEFAULT '',
+                strategy VARCHAR(50) NOT NULL DEFAULT '',
+                notify_email {'INTEGER DEFAULT 1' if is_sqlite else 'BOOLEAN DEFAULT TRUE'},
+                is_active {'INTEGER DEFAULT 1' if is_sqlite else 'BOOLEAN DEFAULT TRUE'},
+                created_at {timestamp_default},
+                updated_at {timestamp_default}
+            );
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_saved_searches_user
+            ON saved_searches (user_id);
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_saved_searches_match
+            ON saved_searches (property_type, strategy, city, min_price)
+            WHERE is_active = TRUE;
+            """)
+
+            # Deals that matched a saved search: the in-app inbox, and the
+            # outbox for email digests (digested_at IS NULL)
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS saved_search_matches (
+                id {auto_increment},
+                search_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                property_id INTEGER NOT NULL,
+                matched_at {timestamp_default},
+                read_at {timestamp_default.replace('DEFAULT CURRENT_TIMESTAMP', 'NULL')},
+                digested_at {timestamp_default.replace('DEFAULT CURRENT_TIMESTAMP', 'NULL')},
+                UNIQUE (search_id, property_id)
+            );
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_saved_search_matches_user
+            ON saved_search_matches (user_id, matched_at);
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_saved_search_matches_digest
+            ON saved_search_matches (user_id, id) WHERE digested_at IS NULL;
+            """)
+
+            # Investor preferences (list columns are arrays on PostgreSQL, JSON text on SQLite)
+            list_type = "TEXT" if is_sqlite else "TEXT[]"
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS investor_profiles (
+                id {auto_increment},
+                user_id INTEGER UNIQUE NOT NULL,
+                investor_type VARCHAR(50),
+                nationality VARCHAR(100),
+                min_investment DECIMAL(12,2),
+                max_investment DECIMAL(12,2),
+                target_yield DECIMAL(5,2),
+                preferred_regions {list_type},
+                preferred_property_types {list_type},
+                investment_strategies {list_type},
+                sharia_compliant_only {'INTEGER DEFAULT 1' if is_sqlite else 'BOOLEAN DEFAULT TRUE'},
+                created_at {timestamp_default},
+                updated_at {timestamp_default}
+            );
+            """)
+            
+            # KYC documents uploaded by investors
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS kyc_documents (
+                id {auto_increment},
+                user_id INTEGER NOT NULL,
+                document_type VARCHAR(50),
+                file_path TEXT,
+                file_name VARCHAR(255),
+                status VARCHAR(20) DEFAULT 'pending',
+                reviewed_by INTEGER,
+                reviewed_at {timestamp_default.replace('DEFAULT CURRENT_TIMESTAMP', 'NULL')},
+                notes TEXT,
+                expiry_date DATE,
+                status_changed_at {timestamp_default.replace('DEFAULT CURRENT_TIMESTAMP', 'NULL')},
+                uploaded_at {timestamp_default}
+            );
+            """)
+            document_columns = {
+                'expiry_date': 'DATE',
+                'status_changed_at': timestamp_default.replace('DEFAULT CURRENT_TIMESTAMP', 'NULL')
+            }
+            if is_sqlite:
+                cursor.execute("PRAGMA table_info(kyc_documents)")
+                existing = [column[1] for column in cursor.fetchall()]
+                for column, column_type in document_columns.items():
+                    if column not in existing:
+                        cursor.execute(f"ALTER TABLE kyc_documents ADD COLUMN {column} {column_type}")
+            else:
+                for column, column_type in document_columns.items():
+                    cursor.execute(f"ALTER TABLE kyc_documents ADD COLUMN IF NOT EXISTS {column} {column_type}")
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_kyc_documents_user
+            ON kyc_documents (user_id, uploaded_at);
+            """)
+            # Range scans by the expiry scanner
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_kyc_documents_expiry
+            ON kyc_documents (expiry_date, status);
+            """)
+            
+            # Audit trail of user and admin actions
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS activity_logs (
+                id {auto_increment},
+                user_id INTEGER,
+                action VARCHAR(100) NOT NULL,
+                resource_type VARCHAR(50),
+                resource_id INTEGER,
+                ip_address VARCHAR(45),
+                user_agent TEXT,
+                created_at {timestamp_default}
+            );
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_activity_logs_user
+            ON activity_logs (user_id, created_at);
+            """)
+            
+            # Outbox of notification emails, drained by `flask send-queued-emails`
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS email_queue (
+                id {auto_increment},
+                email_type VARCHAR(50) NOT NULL,
+                recipient VARCHAR(255) NOT NULL,
+                subject VARCHAR(255) NOT NULL,
+                body TEXT NOT NULL,
+                status VARCHAR(20) DEFAULT 'queued',
+                attempts INTEGER DEFAULT 0,
+                error_message TEXT,
+                created_at {timestamp_default},
+                sent_at {timestamp_default.replace('DEFAULT CURRENT_TIMESTAMP', 'NULL')}
+            );
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_email_queue_status
+            ON email_queue (status, id);
+            """)
+            
+            # Sanctions/PEP screening results (see models.compliance.SanctionsCheck)
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS sanctions_checks (
+                id {auto_increment},
+                user_id INTEGER,
+                check_name VARCHAR(255) NOT NULL,
+                date_of_birth {timestamp_default.replace('DEFAULT CURRENT_TIMESTAMP', 'NULL')},
+                nationality VARCHAR(100),
+                sanctions_match {boolean_type},
+                pep_match {boolean_type},
+                adverse_media_match {boolean_type},
+                matched_sanctions_lists {json_type.replace(" DEFAULT '{}'", " DEFAULT '[]'")},
+                match_confidence DECIMAL(5,4),
+                match_details {json_type.replace(" DEFAULT '{}'", " DEFAULT '[]'")},
+                cleared {boolean_type},
+                cleared_by INTEGER,
+                cleared_at {timestamp_default.replace('DEFAULT CURRENT_TIMESTAMP', 'NULL')},
+                clearance_notes TEXT,
+                provider_reference VARCHAR(100),
+                performed_at {timestamp_default},
+                created_at {timestamp_default}
+            );
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_sanctions_checks_user
+            ON sanctions_checks (user_id, performed_at);
+            """)
+            
+            # Last screened version of each sanctions list entry, for delta re-screening
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS sanctions_list_entries (
+                list_name VARCHAR(50) NOT NULL,
+                entry_id VARCHAR(100) NOT NULL,
+                fingerprint VARCHAR(40) NOT NULL,
+                updated_at {timestamp_default},
+                PRIMARY KEY (list_name, entry_id)
+            );
+            """)
+            
+            # Compliance alerts (see models.compliance.ComplianceAlert); alert_key deduplicates hits
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS compliance_alerts (
+                id {auto_increment},
+                user_id INTEGER,
+                alert_type VARCHAR(50) NOT NULL,
+                severity VARCHAR(20) NOT NULL,
+                title VARCHAR(255),
+                description TEXT,
+                triggered_by VARCHAR(100),
+                status VARCHAR(20) DEFAULT 'open',
+                assigned_to INTEGER,
+                resolved_by INTEGER,
+                resolved_at {timestamp_default.replace('DEFAULT CURRENT_TIMESTAMP', 'NULL')},
+                resolution_notes TEXT,
+                alert_key VARCHAR(255) UNIQUE,
+                priority SMALLINT,
+                lease_expires_at {timestamp_default.replace('DEFAULT CURRENT_TIMESTAMP', 'NULL')},
+                created_at {timestamp_default},
+                updated_at {timestamp_default}
+            );
+            """)
+            alert_columns = {
+                'priority': 'SMALLINT',
+                'lease_expires_at': timestamp_default.replace('DEFAULT CURRENT_TIMESTAMP', 'NULL')
+            }
+            if is_sqlite:
+                cursor.execute("PRAGMA table_info(compliance_alerts)")
+                existing = [column[1] for column in cursor.fetchall()]
+                for column, column_type in alert_columns.items():
+                    if column not in existing:
+                        cursor.execute(f"ALTER TABLE compliance_alerts ADD COLUMN {column} {column_type}")
+            else:
+                for column, column_type in alert_columns.items():
+                    cursor.execute(f"ALTER TABLE compliance_alerts ADD COLUMN IF NOT EXISTS {column} {column_type}")
+            cursor.execute("""
+            UPDATE compliance_alerts
+            SET priority = CASE severity WHEN 'critical' THEN 0 WHEN 'high' THEN 1 WHEN 'medium' THEN 2 ELSE 3 END
+            WHERE priority IS NULL
+            """)
+            # Work queue: open alerts by severity then age, and leases awaiting expiry
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_compliance_alerts_queue
+            ON compliance_alerts (priority, created_at, id) WHERE status = 'open';
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_compliance_alerts_lease
+            ON compliance_alerts (lease_expires_at) WHERE status = 'investigating';
+            """)
+            
+            # Bulk property import jobs and their per-row error reports
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS property_imports (
+                id {auto_increment},
+                source_name VARCHAR(255),
+                file_format VARCHAR(10) NOT NULL,
+                status VARCHAR(20) DEFAULT 'running',
+                rows_processed INTEGER DEFAULT 0,
+                rows_imported INTEGER DEFAULT 0,
+                rows_failed INTEGER DEFAULT 0,
+                created_by INTEGER,
+                created_at {timestamp_default},
+                updated_at {timestamp_default},
+                completed_at {timestamp_default.replace('DEFAULT CURRENT_TIMESTAMP', 'NULL')}
+            );
+            """)
+            
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS property_import_errors (
+                id {auto_increment},
+                import_id INTEGER NOT NULL,
+                row_number INTEGER NOT NULL,
+                field VARCHAR(50),
+                message TEXT NOT NULL
+            );
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_property_import_errors_import
+            ON property_import_errors (import_id, row_number);
+            """)
+            
+            # Customer due diligence records (see models.compliance.CustomerDueDiligence);
+            # input_hash/config_hash let the risk engine skip unchanged customers
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS customer_due_diligence (
+                id {auto_increment},
+                user_id INTEGER UNIQUE NOT NULL,
+                cdd_type VARCHAR(20),
+                status VARCHAR(20) DEFAULT 'pending',
+                customer_type VARCHAR(20) DEFAULT 'individual',
+                is_pep {boolean_type},
+                pep_details TEXT,
+                risk_rating VARCHAR(20),
+                risk_factors {json_type.replace(" DEFAULT '{}'", " DEFAULT '[]'")},
+                risk_assessment_notes TEXT,
+                source_of_wealth TEXT,
+                source_of_funds TEXT,
+                wealth_verification_documents {json_type.replace(" DEFAULT '{}'", " DEFAULT '[]'")},
+                last_review_date DATE,
+                next_review_date DATE,
+                monitoring_frequency VARCHAR(20),
+                approved_by INTEGER,
+                approved_at {timestamp_default.replace('DEFAULT CURRENT_TIMESTAMP', 'NULL')},
+                approval_notes TEXT,
+                input_hash VARCHAR(40),
+                config_hash VARCHAR(40),
+                evaluated_at {timestamp_default.replace('DEFAULT CURRENT_TIMESTAMP', 'NULL')},
+                created_at {timestamp_default},
+                updated_at {timestamp_default}
+            );
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_cdd_next_review
+            ON customer_due_diligence (next_review_date);
+            """)
+            
+            # Daily compliance counters, updated as events happen; reports sum these
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS compliance_daily_rollups (
+                day DATE NOT NULL,
+                metric VARCHAR(50) NOT NULL,
+                value INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, metric)
+            );
+            """)
+            
+            # Generated compliance reports (see models.compliance.ComplianceReport)
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS compliance_reports (
+                id {auto_increment},
+                report_type VARCHAR(50),
+                report_period_start DATE,
+                report_period_end DATE,
+                total_customers INTEGER,
+                kyc_completed INTEGER,
+                kyc_pending INTEGER,
+                sanctions_checks_performed INTEGER,
+                pep_matches INTEGER,
+                alerts_generated INTEGER,
+                alerts_resolved INTEGER,
+                report_data {json_type},
+                generated_by INTEGER,
+                generated_at {timestamp_default}
+            );
+            """)
+            
             # Insert some test data for development
             try:
                 cursor.execute("SELECT COUNT(*) as count FROM users")
@@ -52,6 +52,7 @@ class KYCDocument:
     document_number: Optional[str] = None
     issue_date: Optional[datetime] = None
     expiry_date: Optional[datetime] = None
+    status_changed_at: Optional[datetime] = None
     issuing_authority: Optional[str] = None
     issuing_country: Optional[str] = None
     
@@ -0,0 +1,168 @@
+# backend/app/services/alert_service.py
+from flask import current_app
+from app.database import get_db_connection, is_sqlite, placeholder, any_clause
+from app.services.report_service import record_compliance_events
+
+# Queue order: lower priority value is worked first, then oldest first
+SEVERITY_PRIORITY = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+
+RESOLVED_STATUSES = ('resolved', 'false_positive')
+
+ALERT_COLUMNS = """id, user_id, alert_type, severity, title, description, triggered_by,
+                   status, assigned_to, lease_expires_at, created_at"""
+
+def _lease_expiry_sql():
+    """SQL expression for now + a lease length bound as one parameter (seconds)."""
+    if is_sqlite():
+        return "datetime('now', '+' || ? || ' seconds')"
+    return "CURRENT_TIMESTAMP + %s * INTERVAL '1 second'"
+
+def _now_sql():
+    return "datetime('now')" if is_sqlite() else "CURRENT_TIMESTAMP"
+
+def alert_to_dict(row):
+    def iso(value):
+        return value.isoformat() if hasattr(value, 'isoformat') else value
+    return {
+        'id': row['id'],
+        'user_id': row['user_id'],
+        'alert_type': row['alert_type'],
+        'severity': row['severity'],
+        'title': row['title'],
+        'description': row['description'],
+        'triggered_by': row['triggered_by'],
+        'status': row['status'],
+        'assigned_to': row['assigned_to'],
+        'lease_expires_at': iso(row['lease_expires_at']),
+        'created_at': iso(row['created_at'])
+    }
+
+def claim_alerts(officer_id, limit=1, alert_types=None, lease_seconds=None):
+    """Claim the next open alerts (highest severity, then oldest) for an officer.
+
+    Alerts whose lease has run out are claimable again alongside open ones.
+    On PostgreSQL the candidate rows are picked with FOR UPDATE SKIP LOCKED,
+    so concurrent officers never wait on or receive the same alert. SQLite
+    has no row locks; there the single UPDATE ... WHERE id IN (SELECT ...)
+    statement runs under the database write lock, which serialises claims.
+    Open alerts and expired leases are picked separately and the two short
+    lists merged: open ones walk the partial queue index in order and stop
+    after `limit` rows, expired leases are read from the partial lease index,
+    which only holds alerts under investigation. Neither grows with the
+    length of the open queue.
+    """
+    lease_seconds = lease_seconds or current_app.config.get('ALERT_LEASE_SECONDS', 900)
+    p = placeholder()
+    type_filter, type_params = '', []
+    if alert_types:
+        type_filter, type_params = any_clause('alert_type', alert_types)
+        type_filter = f'AND {type_filter}'
+    lock = '' if is_sqlite() else 'FOR UPDATE SKIP LOCKED'
+
+    # One OR'd predicate would match neither partial index and scan the table.
+    # Each branch locks up to `limit` rows; the merge keeps the first `limit`.
+    def pick(condition):
+        return f"""
+            SELECT id, priority, created_at FROM (
+                SELECT id, priority, created_at FROM compliance_alerts
+                WHERE {condition} {type_filter}
+                ORDER BY priority, created_at, id
+                LIMIT {p}
+                {lock}
+            ) picked"""
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            UPDATE compliance_alerts
+            SET status = 'investigating', assigned_to = {p},
+                lease_expires_at = {_lease_expiry_sql()}, updated_at = CURRENT_TIMESTAMP
+            WHERE id IN (
+                SELECT id FROM (
+                    {pick("status = 'open'")}
+                    UNION ALL
+                    {pick(f"status = 'investigating' AND lease_expires_at < {_now_sql()}")}
+                ) candidates
+                ORDER BY priority, created_at, id
+                LIMIT {p}
+            )
+            RETURNING {ALERT_COLUMNS}, priority
+        """, [officer_id, lease_seconds] + (type_params + [limit]) * 2 + [limit])
+        alerts = cursor.fetchall()
+
+    # RETURNING does not preserve the subquery's order
+    alerts = sorted(alerts, key=lambda row: (row['priority'], str(row['created_at']), row['id']))
+    return [alert_to_dict(alert) for alert in alerts]
+
+def renew_lease(alert_id, officer_id, lease_seconds=None):
+    """Extend an officer's lease on a claimed alert. Returns the alert or None if not held."""
+    lease_seconds = lease_seconds or current_app.config.get('ALERT_LEASE_SECONDS', 900)
+    p = placeholder()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            UPDATE compliance_alerts
+            SET lease_expires_at = {_lease_expiry_sql()}, updated_at = CURRENT_TIMESTAMP
+            WHERE id = {p} AND assigned_to = {p} AND status = 'investigating'
+              AND lease_expires_at >= {_now_sql()}
+            RETURNING {ALERT_COLUMNS}
+        """, (lease_seconds, alert_id, officer_id))
+        alert = cursor.fetchone()
+    return alert_to_dict(alert) if alert else None
+
+def release_alert(alert_id, officer_id):
+    """Hand a claimed alert back to the queue. Returns False if the officer did not hold it."""
+    p = placeholder()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            UPDATE compliance_alerts
+            SET status = 'open', assigned_to = NULL, lease_expires_at = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE id = {p} AND assigned_to = {p} AND status = 'investigating'
+        """, (alert_id, officer_id))
+        return cursor.rowcount > 0
+
+def resolve_alerts(officer_id, alert_ids, status='resolved', notes=None):
+    """Resolve many alerts with one UPDATE. Returns (resolved_ids, skipped_ids).
+
+    Alerts that are already resolved or do not exist are skipped.
+    """
+    if status not in RESOLVED_STATUSES:
+        raise ValueError(f'Invalid status: {status}')
+
+    p = placeholder()
+    clause, params = any_clause('id', alert_ids)
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            UPDATE compliance_alerts
+            SET status = {p}, resolved_by = {p}, resolved_at = CURRENT_TIMESTAMP,
+                resolution_notes = {p}, lease_expires_at = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE {clause} AND status NOT IN ('resolved', 'false_positive')
+            RETURNING id
+        """, [status, officer_id, notes] + params)
+        resolved = {row['id'] for row in cursor.fetchall()}
+        record_compliance_events(cursor, {'alerts_resolved': len(resolved)})
+
+    return [alert_id for alert_id in alert_ids if alert_id in resolved], \
+           [alert_id for alert_id in alert_ids if alert_id not in resolved]
+
+def queue_stats():
+    """Open alert counts by severity plus alerts currently under investigation."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT status, severity, COUNT(*) AS alerts
+            FROM compliance_alerts
+            WHERE status IN ('open', 'investigating')
+            GROUP BY status, severity
+        """)
+        rows = cursor.fetchall()
+
+    stats = {'open': dict.fromkeys(SEVERITY_PRIORITY, 0), 'investigating': 0}
+    for row in rows:
+        if row['status'] == 'open':
+            stats['open'][row['severity']] = row['alerts']
+        else:
+            stats['investigating'] += row['alerts']
+    return stats
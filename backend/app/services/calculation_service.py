@@ -1,5 +1,6 @@
 # backend/app/services/calculation_service.py
 import json
+import numpy as np
 
 class ShariaCompliantCalculator:
     """Calculator for Sharia-compliant property investment metrics."""
@@ -134,4 +135,94 @@ class ShariaCompliantCalculator:
                 'maintenance_percentage': 5,
                 'management_percentage': 10
             }
-        }
\ No newline at end of file
+        }
+    
+    # Inputs of calculate_detailed_metrics, in argument order
+    DETAILED_INPUTS = (
+        'purchase_price', 'monthly_rent', 'refurbishment_cost', 'stamp_duty', 'legal_fees',
+        'sourcing_fee', 'other_costs', 'annual_costs', 'void_percentage',
+        'maintenance_percentage', 'management_percentage'
+    )
+    
+    def calculate_detailed_metrics_batch(self, **columns):
+        """Vectorized calculate_detailed_metrics over equal-length input sequences.
+        
+        Takes one sequence per DETAILED_INPUTS name (None counts as 0) and returns
+        a dict of float arrays: the inputs plus every derived figure, flat.
+        Rows without a price or rent are zeroed, as _empty_metrics does.
+        """
+        a = {name: np.array([float(value or 0) for value in columns[name]], dtype=float)
+             for name in self.DETAILED_INPUTS}
+        price, rent = a['purchase_price'], a['monthly_rent']
+        valid = (price != 0) & (rent != 0)
+        
+        out = dict(a)
+        out['valid'] = valid
+        out['total_purchase_costs'] = price + a['stamp_duty'] + a['legal_fees'] + a['sourcing_fee']
+        out['total_investment'] = out['total_purchase_costs'] + a['refurbishment_cost'] + a['other_costs']
+        
+        out['annual_rent'] = rent * 12
+        out['void_allowance'] = out['annual_rent'] * (a['void_percentage'] / 100)
+        out['effective_annual_rent'] = out['annual_rent'] - out['void_allowance']
+        
+        out['maintenance_cost'] = out['effective_annual_rent'] * (a['maintenance_percentage'] / 100)
+        out['management_cost'] = out['effective_annual_rent'] * (a['management_percentage'] / 100)
+        out['total_annual_expenses'] = a['annual_costs'] + out['maintenance_cost'] + out['management_cost']
+        out['net_annual_income'] = out['effective_annual_rent'] - out['total_annual_expenses']
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out['net_yield'] = np.where(price > 0, out['net_annual_income'] / price * 100, 0.0)
+            investment = out['total_investment']
+            out['roi'] = np.where(investment > 0, out['net_annual_income'] / investment * 100, 0.0)
+        out['cash_on_cash_return'] = out['roi'].copy()
+        
+        for name, values in out.items():
+            if name != 'valid':
+                out[name] = np.where(valid, values, 0.0)
+        # _empty_metrics reports the default assumptions
+        for name, default in (('void_percentage', 10), ('maintenance_percentage', 5), ('management_percentage', 10)):
+            out[name] = np.where(valid, a[name], default)
+        return out
+    
+    def detailed_metrics_at(self, batch, i):
+        """The calculate_detailed_metrics structure for row i of a batch result."""
+        if not batch['valid'][i]:
+            return self._empty_metrics()
+        v = {name: float(values[i]) for name, values in batch.items() if name != 'valid'}
+        return {
+            'purchase_metrics': {
+                'purchase_price': v['purchase_price'],
+                'stamp_duty': v['stamp_duty'],
+                'legal_fees': v['legal_fees'],
+                'sourcing_fee': v['sourcing_fee'],
+                'total_purchase_costs': v['total_purchase_costs']
+            },
+            'investment_metrics': {
+                'refurbishment_cost': v['refurbishment_cost'],
+                'other_costs': v['other_costs'],
+                'total_investment': v['total_investment']
+            },
+            'rental_metrics': {
+                'monthly_rent': v['monthly_rent'],
+                'annual_rent': v['annual_rent'],
+                'void_allowance': v['void_allowance'],
+                'effective_annual_rent': v['effective_annual_rent']
+            },
+            'expense_metrics': {
+                'annual_costs': v['annual_costs'],
+                'maintenance_cost': v['maintenance_cost'],
+                'management_cost': v['management_cost'],
+                'total_annual_expenses': v['total_annual_expenses']
+            },
+            'return_metrics': {
+                'net_annual_income': v['net_annual_income'],
+                'net_yield': round(v['net_yield'], 2),
+                'roi': round(v['roi'], 2),
+                'cash_on_cash_return': round(v['cash_on_cash_return'], 2)
+            },
+            'assumptions': {
+                'void_percentage': v['void_percentage'],
+                'maintenance_percentage': v['maintenance_percentage'],
+                'management_percentage': v['management_percentage']
+            }
+        }
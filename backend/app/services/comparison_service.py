@@ -0,0 +1,164 @@
+# backend/app/services/comparison_service.py
+import numpy as np
+from app.services.property_service import (
+    detail_projection, detailed_metrics_batch, load_published_rows, without_metrics
+)
+
+MIN_COMPARE = 2
+MAX_COMPARE = 20
+
+# Shared assumptions a comparison may override: name -> (default, minimum, maximum).
+# None keeps each property's own deal-package value.
+ASSUMPTIONS = {
+    'void_percentage': (None, 0, 100),
+    'maintenance_percentage': (None, 0, 100),
+    'management_percentage': (None, 0, 100),
+    'holding_period_years': (5, 1, 40),
+    'annual_rent_growth': (0, -50, 50),
+    'annual_capital_growth': (0, -50, 50),
+}
+
+# Projections step in whole years
+WHOLE_NUMBER_ASSUMPTIONS = {'holding_period_years'}
+
+# Compared metrics in output order: name -> True if higher is better,
+# False if lower is better
+COMPARE_METRICS = {
+    'total_investment': False,
+    'annual_rent': True,
+    'effective_annual_rent': True,
+    'total_annual_expenses': False,
+    'net_annual_income': True,
+    'net_yield': True,
+    'roi': True,
+    'cumulative_net_income': True,
+    'projected_value': True,
+    'total_return': True,
+    'total_return_pct': True,
+    'annualised_return': True,
+    'payback_years': False,
+}
+
+# Per-property header shown above each comparison column (the metrics
+# field only pulls in the calculator's input columns)
+HEADER_FIELDS = 'title,address,city,postcode,property_details,investment_strategy,bmv_analysis,sharia_compliant_metrics'
+
+def parse_assumptions(raw):
+    """Validate override values into {name: number or None}. Raises ValueError."""
+    if raw is None:
+        raw = {}
+    if not isinstance(raw, dict):
+        raise ValueError('assumptions must be an object of name: value pairs')
+    unknown = set(raw) - set(ASSUMPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown assumption(s): {', '.join(sorted(unknown))}")
+
+    assumptions = {}
+    for name, (default, low, high) in ASSUMPTIONS.items():
+        value = raw.get(name, default)
+        if value is None:
+            assumptions[name] = None
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f'{name} must be a number')
+        if not low <= value <= high:
+            raise ValueError(f'{name} must be between {low} and {high}')
+        if name in WHOLE_NUMBER_ASSUMPTIONS:
+            if not float(value).is_integer():
+                raise ValueError(f'{name} must be a whole number')
+            assumptions[name] = int(value)
+        else:
+            assumptions[name] = float(value)
+    return assumptions
+
+def project(batch, years, rent_growth, capital_growth):
+    """Add holding-period projections to a calculate_detailed_metrics_batch result.
+
+    Net income grows with rents; the exit value compounds at the capital
+    growth rate. All figures are before finance costs, as the platform's
+    deals are unleveraged.
+    """
+    rent_factor = ((1 + rent_growth / 100) ** np.arange(years)).sum()
+    price = batch['purchase_price']
+    investment = batch['total_investment']
+    income = batch['net_annual_income']
+
+    cumulative = income * rent_factor
+    value = price * (1 + capital_growth / 100) ** years
+    total_return = cumulative + value - price
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total_return_pct = np.where(investment > 0, total_return / investment * 100, np.nan)
+        growth = (investment + total_return) / investment
+        annualised = np.where((investment > 0) & (growth > 0), (growth ** (1 / years) - 1) * 100, np.nan)
+        payback = np.where(income > 0, investment / income, np.nan)
+
+    batch['cumulative_net_income'] = cumulative
+    batch['projected_value'] = value
+    batch['total_return'] = total_return
+    batch['total_return_pct'] = total_return_pct
+    batch['annualised_return'] = annualised
+    batch['payback_years'] = payback
+    return batch
+
+def rank(values, higher_is_better):
+    """Competition ranks (1 = best, ties share a rank); NaN values are unranked."""
+    present = ~np.isnan(values)
+    filled = np.where(present, values, -np.inf if higher_is_better else np.inf)
+    if higher_is_better:
+        better = filled[None, :] > filled[:, None]
+    else:
+        better = filled[None, :] < filled[:, None]
+    ranks = 1 + (better & present[None, :]).sum(axis=1)
+    return np.where(present, ranks, 0)
+
+def _column(values, digits=2):
+    return [None if np.isnan(value) else round(float(value), digits) for value in values]
+
+def compare_properties(cursor, property_ids, assumptions=None, lang=None):
+    """Side-by-side metrics for published properties under shared assumptions.
+
+    Returns aligned columns (one entry per found property, in request order)
+    with each metric's values, deltas against the first property and ranks.
+    """
+    assumptions = parse_assumptions(assumptions)
+    header_key = detail_projection.parse(HEADER_FIELDS, lang)
+
+    rows_by_id = {}
+    for row in load_published_rows(cursor, property_ids, header_key):
+        rows_by_id.setdefault(row['id'], row)
+    order = [pid for pid in dict.fromkeys(property_ids) if pid in rows_by_id]
+    rows = [rows_by_id[pid] for pid in order]
+
+    result = {
+        'ids': order,
+        'not_found': [pid for pid in dict.fromkeys(property_ids) if pid not in rows_by_id],
+        'assumptions': assumptions,
+        'properties': [],
+        'metrics': {}
+    }
+    if not rows:
+        return result
+
+    overrides = {name: assumptions[name] for name in ('void_percentage', 'maintenance_percentage', 'management_percentage')}
+    _, batch = detailed_metrics_batch(rows, **overrides)
+    batch = project(batch, assumptions['holding_period_years'],
+                    assumptions['annual_rent_growth'], assumptions['annual_capital_growth'])
+    # Rows without a price or rent cannot be compared meaningfully
+    for name in COMPARE_METRICS:
+        batch[name] = np.where(batch['valid'], batch[name], np.nan)
+
+    encode = detail_projection.encoder(without_metrics(header_key))
+    result['properties'] = [encode(row) for row in rows]
+
+    for name, higher_is_better in COMPARE_METRICS.items():
+        values = batch[name]
+        ranks = rank(values, higher_is_better)
+        result['metrics'][name] = {
+            'values': _column(values),
+            'delta': _column(values - values[0]),
+            'rank': [int(r) or None for r in ranks],
+            'best': [pid for pid, r in zip(order, ranks) if r == 1],
+            'higher_is_better': higher_is_better
+        }
+    return result
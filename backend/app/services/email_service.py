@@ -1,7 +1,7 @@
 # backend/app/services/email_service.py
 from flask import current_app
 from flask_mail import Message
-from app.database import get_db_connection
+from app.database import get_db_connection, placeholder, any_clause, insert_many
 import os
 
 def send_verification_email(email, token, language='en'):
@@ -184,4 +184,212 @@ def send_welcome_email(email, full_name, language='en'):
                 VALUES (%s, %s, %s, %s)
             """, ('welcome', 'Welcome Email', 'failed', str(e)))
         
-        return False
\ No newline at end of file
+        return False
+
+def build_kyc_review_email(full_name, status, language='en'):
+    """Build the subject and body for a KYC review outcome notification."""
+    verified = status == 'verified'
+    
+    if language == 'ar':
+        if verified:
+            subject = "تم التحقق من حسابك - PropTech"
+            body = f"""
+            مرحباً {full_name}!
+            
+            تمت مراجعة مستنداتك والتحقق من حسابك بنجاح.
+            يمكنك الآن الاطلاع على جميع تفاصيل الصفقات المتاحة.
+            
+            شكراً لك،
+            فريق PropTech
+            """
+        else:
+            subject = "تحديث حالة مستنداتك - PropTech"
+            body = f"""
+            مرحباً {full_name}!
+            
+            تمت مراجعة مستنداتك وتحتاج إلى تحديث.
+            يرجى تسجيل الدخول إلى حسابك للاطلاع على الملاحظات ورفع المستندات المطلوبة.
+            
+            شكراً لك،
+            فريق PropTech
+            """
+    else:
+        if verified:
+            subject = "Your Account Has Been Verified - PropTech"
+            body = f"""
+            Hello {full_name}!
+            
+            Your documents have been reviewed and your account is now verified.
+            You can now view the full details of all available deals.
+            
+            Thank you,
+            The PropTech Team
+            """
+        else:
+            subject = "Update on Your Documents - PropTech"
+            body = f"""
+            Hello {full_name}!
+            
+            Your documents have been reviewed and need to be updated.
+            Please log in to your account to see the review notes and upload the requested documents.
+            
+            Thank you,
+            The PropTech Team
+            """
+    
+    return subject, body
+
+def build_kyc_expiry_email(full_name, document_types, expired, language='en'):
+    """Build a reminder for documents that have expired or are about to."""
+    documents = ', '.join(document_types)
+    
+    if language == 'ar':
+        if expired:
+            subject = "انتهت صلاحية مستنداتك - PropTech"
+            body = f"""
+            مرحباً {full_name}!
+            
+            انتهت صلاحية المستندات التالية: {documents}
+            يرجى رفع نسخ سارية المفعول للحفاظ على حالة التحقق من حسابك.
+            
+            شكراً لك،
+            فريق PropTech
+            """
+        else:
+            subject = "مستنداتك على وشك الانتهاء - PropTech"
+            body = f"""
+            مرحباً {full_name}!
+            
+            ستنتهي صلاحية المستندات التالية قريباً: {documents}
+            يرجى رفع نسخ محدثة قبل تاريخ الانتهاء.
+            
+            شكراً لك،
+            فريق PropTech
+            """
+    else:
+        if expired:
+            subject = "Your Documents Have Expired - PropTech"
+            body = f"""
+            Hello {full_name}!
+            
+            The following documents have expired: {documents}
+            Please upload valid copies to keep your account verified.
+            
+            Thank you,
+            The PropTech Team
+            """
+        else:
+            subject = "Your Documents Are About to Expire - PropTech"
+            body = f"""
+            Hello {full_name}!
+            
+            The following documents will expire soon: {documents}
+            Please upload updated copies before they expire.
+            
+            Thank you,
+            The PropTech Team
+            """
+    
+    return subject, body
+
+def build_search_digest_email(full_name, deals, language='en'):
+    """Build a digest of new deals matching an investor's saved searches.
+    
+    Each deal is a (title, city, asking_price, search_name) tuple.
+    """
+    frontend_url = current_app.config.get('FRONTEND_URL', '')
+    lines = '\n'.join(
+        f"            - {title} ({city}) - £{float(price or 0):,.0f}" + (f" [{search}]" if search else '')
+        for title, city, price, search in deals
+    )
+    
+    if language == 'ar':
+        subject = f"{len(deals)} صفقات جديدة تطابق عمليات البحث المحفوظة - PropTech"
+        body = f"""
+            مرحباً {full_name}!
+            
+            تم نشر صفقات جديدة تطابق عمليات البحث المحفوظة لديك:
+{lines}
+            
+            اطلع عليها هنا: {frontend_url}/properties
+            
+            شكراً لك،
+            فريق PropTech
+            """
+    else:
+        subject = f"{len(deals)} New {'Deal Matches' if len(deals) == 1 else 'Deals Match'} Your Saved Searches - PropTech"
+        body = f"""
+            Hello {full_name}!
+            
+            New deals matching your saved searches have been published:
+{lines}
+            
+            View them here: {frontend_url}/properties
+            
+            Thank you,
+            The PropTech Team
+            """
+    
+    return subject, body
+
+def queue_emails(cursor, messages):
+    """Queue many emails with one insert inside the caller's transaction.
+    
+    Each message is an (email_type, recipient, subject, body) tuple. Queued
+    emails are only visible once the surrounding transaction commits and are
+    delivered by send_queued_emails().
+    """
+    insert_many(cursor, 'email_queue', ['email_type', 'recipient', 'subject', 'body'], messages)
+
+def send_queued_emails(batch_size=100, max_attempts=3):
+    """Deliver queued emails over a single SMTP connection. Returns the number sent."""
+    p = placeholder()
+    
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT id, recipient, subject, body
+            FROM email_queue
+            WHERE status = 'queued' AND attempts < {p}
+            ORDER BY id
+            LIMIT {p}
+        """, (max_attempts, batch_size))
+        queued = cursor.fetchall()
+        
+        if not queued:
+            return 0
+        
+        sent_ids = []
+        failures = []
+        
+        from flask_mail import Mail
+        mail = Mail(current_app)
+        try:
+            with mail.connect() as connection:
+                for email in queued:
+                    try:
+                        connection.send(Message(email['subject'], recipients=[email['recipient']], body=email['body']))
+                        sent_ids.append(email['id'])
+                    except Exception as e:
+                        failures.append((str(e), email['id']))
+        except Exception as e:
+            # SMTP connection itself failed; retry the whole batch later
+            failures = [(str(e), email['id']) for email in queued]
+        
+        if sent_ids:
+            clause, params = any_clause('id', sent_ids)
+            cursor.execute(f"""
+                UPDATE email_queue
+                SET status = 'sent', attempts = attempts + 1, sent_at = CURRENT_TIMESTAMP
+                WHERE {clause}
+            """, params)
+        
+        if failures:
+            cursor.executemany(f"""
+                UPDATE email_queue
+                SET attempts = attempts + 1, error_message = {p},
+                    status = CASE WHEN attempts + 1 >= {max_attempts:d} THEN 'failed' ELSE 'queued' END
+                WHERE id = {p}
+            """, failures)
+        
+        return len(sent_ids)
@@ -0,0 +1,85 @@
+# backend/app/services/export_service.py
+import csv
+import io
+import tempfile
+from flask import Response, current_app, stream_with_context
+from app.database import get_db_connection, stream_query
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+}
+
+# Leading characters that make Excel/LibreOffice evaluate a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+def _cell(value):
+    """Neutralise user-supplied text that a spreadsheet would run as a formula."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+class ExportService:
+    """Stream query results to CSV or XLSX downloads in constant memory."""
+
+    def __init__(self, chunk_size=None):
+        self.chunk_size = chunk_size or current_app.config.get('EXPORT_CHUNK_SIZE', 2000)
+
+    def _rows(self, query, params, columns):
+        """Yield ordered value lists straight from a server-side cursor."""
+        with get_db_connection() as conn:
+            for row in stream_query(conn, query, params, self.chunk_size):
+                yield [row[column] for column in columns]
+
+    def _csv_chunks(self, query, params, columns):
+        """Yield encoded CSV text, flushing once per fetched chunk."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+
+        for count, values in enumerate(self._rows(query, params, columns), start=1):
+            writer.writerow(['' if value is None else _cell(value) for value in values])
+            if count % self.chunk_size == 0:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue().encode('utf-8')
+
+    def _xlsx_chunks(self, query, params, columns, sheet_title):
+        """Build the workbook in write-only mode on disk, then stream the file."""
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(title=sheet_title[:31])
+        sheet.append(columns)
+        for values in self._rows(query, params, columns):
+            sheet.append([_cell(value) for value in values])
+
+        with tempfile.TemporaryFile() as tmp:
+            workbook.save(tmp)
+            tmp.seek(0)
+            while True:
+                data = tmp.read(64 * 1024)
+                if not data:
+                    break
+                yield data
+
+    def export(self, query, params, columns, file_format, filename):
+        """Return a streaming download response for a query."""
+        if file_format == 'xlsx':
+            try:
+                import openpyxl  # noqa: F401
+            except ImportError:
+                raise ValueError('XLSX export requires openpyxl to be installed')
+            chunks = self._xlsx_chunks(query, params, columns, filename)
+        elif file_format == 'csv':
+            chunks = self._csv_chunks(query, params, columns)
+        else:
+            raise ValueError(f'Unsupported export format: {file_format}')
+
+        return Response(
+            stream_with_context(chunks),
+            mimetype=EXPORT_FORMATS[file_format],
+            headers={'Content-Disposition': f'attachment; filename={filename}.{file_format}'}
+        )
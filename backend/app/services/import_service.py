@@ -0,0 +1,294 @@
+# backend/app/services/import_service.py
+import csv
+import io
+import json
+from flask import current_app
+from app.database import any_clause, get_db_connection, is_sqlite
+from app.services.property_service import refresh_property_feed
+from app.utils.validators import validate_postcode, validate_price, validate_property_type, validate_bmv_score
+
+SUPPORTED_FORMATS = {'csv', 'jsonl'}
+
+# Columns written by the import, in insert order
+IMPORT_COLUMNS = [
+    'property_id', 'address', 'postcode', 'city', 'property_type',
+    'bedrooms', 'bathrooms', 'square_feet', 'asking_price', 'monthly_rent',
+    'bmv_score', 'tier'
+]
+
+def detect_format(filename):
+    """Infer the import format from a file name."""
+    ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+    if ext == 'csv':
+        return 'csv'
+    if ext in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    return None
+
+class PropertyImporter:
+    """Stream CSV/JSONL property listings into the properties table in committed chunks."""
+
+    def __init__(self, chunk_size=None):
+        self.chunk_size = chunk_size or current_app.config.get('PROPERTY_IMPORT_CHUNK_SIZE', 1000)
+        self.placeholder = '?' if is_sqlite() else '%s'
+
+    def iter_records(self, stream, file_format):
+        """Yield (row_number, record) pairs from a binary stream without reading it all."""
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+        if file_format == 'csv':
+            reader = csv.DictReader(text)
+            for row_number, record in enumerate(reader, start=1):
+                yield row_number, record
+        else:
+            for row_number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield row_number, {'__error__': f'Invalid JSON: {e}'}
+                    continue
+                if not isinstance(record, dict):
+                    record = {'__error__': 'Each line must be a JSON object'}
+                yield row_number, record
+
+    def validate_record(self, record):
+        """Validate and normalise one record. Returns (values, errors)."""
+        if '__error__' in record:
+            return None, [(None, record['__error__'])]
+
+        errors = []
+
+        def text(field, max_length=None, required=False):
+            value = record.get(field)
+            value = str(value).strip() if value is not None else ''
+            if not value:
+                if required:
+                    errors.append((field, f'{field} is required'))
+                return None
+            if max_length and len(value) > max_length:
+                errors.append((field, f'{field} must be at most {max_length} characters'))
+            return value
+
+        def number(field, cast, required=False):
+            value = record.get(field)
+            if value is None or str(value).strip() == '':
+                if required:
+                    errors.append((field, f'{field} is required'))
+                return None
+            try:
+                return cast(str(value).replace(',', '').replace('£', '').strip())
+            except ValueError:
+                errors.append((field, f'{field} must be a number'))
+                return None
+
+        property_id = text('property_id', max_length=50, required=True)
+        address = text('address', required=True)
+
+        postcode = text('postcode', required=True)
+        if postcode:
+            postcode = postcode.upper()
+            if not validate_postcode(postcode):
+                errors.append(('postcode', 'Invalid UK postcode'))
+
+        property_type = text('property_type', max_length=50)
+        if property_type:
+            property_type = property_type.lower()
+            if not validate_property_type(property_type):
+                errors.append(('property_type', 'Invalid property type'))
+
+        asking_price = number('asking_price', float, required=True)
+        if asking_price is not None and not validate_price(asking_price):
+            errors.append(('asking_price', 'Asking price must be greater than zero'))
+
+        monthly_rent = number('monthly_rent', float)
+        if monthly_rent is not None and not validate_price(monthly_rent):
+            errors.append(('monthly_rent', 'Monthly rent must be greater than zero'))
+
+        bmv_score = number('bmv_score', int)
+        if bmv_score is not None and not validate_bmv_score(bmv_score):
+            errors.append(('bmv_score', 'BMV score must be between 0 and 100'))
+
+        values = {
+            'property_id': property_id,
+            'address': address,
+            'postcode': postcode,
+            'city': text('city', max_length=100),
+            'property_type': property_type,
+            'bedrooms': number('bedrooms', int),
+            'bathrooms': number('bathrooms', int),
+            'square_feet': number('square_feet', int),
+            'asking_price': asking_price,
+            'monthly_rent': monthly_rent,
+            'bmv_score': bmv_score,
+            'tier': text('tier', max_length=10)
+        }
+
+        if errors:
+            return None, errors
+        return tuple(values[column] for column in IMPORT_COLUMNS), []
+
+    def start_job(self, cursor, source_name, file_format, user_id=None):
+        """Create an import job row and return its ID."""
+        p = self.placeholder
+        cursor.execute(f"""
+            INSERT INTO property_imports (source_name, file_format, status, created_by)
+            VALUES ({p}, {p}, 'running', {p})
+            RETURNING id
+        """, (source_name, file_format, user_id))
+        return cursor.fetchone()['id']
+
+    def get_job(self, cursor, job_id):
+        """Fetch an import job by ID."""
+        cursor.execute(f"""
+            SELECT id, source_name, file_format, status, rows_processed, rows_imported,
+                   rows_failed, created_by, created_at, updated_at, completed_at
+            FROM property_imports
+            WHERE id = {self.placeholder}
+        """, (job_id,))
+        return cursor.fetchone()
+
+    def run(self, stream, file_format, source_name=None, user_id=None, job_id=None):
+        """Import a stream, resuming after the last committed chunk when job_id is given."""
+        if file_format not in SUPPORTED_FORMATS:
+            raise ValueError(f'Unsupported import format: {file_format}')
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+
+            if job_id:
+                job = self.get_job(cursor, job_id)
+                if not job:
+                    raise ValueError(f'Import job {job_id} not found')
+                # Resuming skips the rows already processed, which is only
+                # correct for the same file
+                if job['file_format'] != file_format or (source_name and source_name != job['source_name']):
+                    raise ValueError(
+                        f"Import job {job_id} was started from {job['source_name']} ({job['file_format']}); "
+                        f"resume it with the same file"
+                    )
+                if job['status'] == 'completed':
+                    return self.job_summary(job)
+                resume_after = job['rows_processed']
+            else:
+                job_id = self.start_job(cursor, source_name, file_format, user_id)
+                resume_after = 0
+            conn.commit()
+
+            batch = {}
+            errors = []
+            chunk_rows = 0
+            last_row = resume_after
+
+            for row_number, record in self.iter_records(stream, file_format):
+                if row_number <= resume_after:
+                    continue
+
+                last_row = row_number
+                chunk_rows += 1
+                values, row_errors = self.validate_record(record)
+                if row_errors:
+                    errors.extend((row_number, field, message) for field, message in row_errors)
+                else:
+                    # Later rows for the same property_id win within a chunk
+                    batch.pop(values[0], None)
+                    batch[values[0]] = values
+
+                if chunk_rows >= self.chunk_size:
+                    self._commit_chunk(conn, cursor, job_id, batch, errors, last_row)
+                    batch, errors, chunk_rows = {}, [], 0
+
+            self._commit_chunk(conn, cursor, job_id, batch, errors, last_row, final=True)
+            return self.job_summary(self.get_job(cursor, job_id))
+
+    def _commit_chunk(self, conn, cursor, job_id, batch, errors, last_row, final=False):
+        """Upsert one chunk, record its errors and checkpoint the job in a single transaction."""
+        p = self.placeholder
+        rows = list(batch.values())
+
+        if rows:
+            self._upsert(cursor, rows)
+            self._refresh_feed(cursor, rows)
+
+        if errors:
+            cursor.executemany(f"""
+                INSERT INTO property_import_errors (import_id, row_number, field, message)
+                VALUES ({p}, {p}, {p}, {p})
+            """, [(job_id, row_number, field, message) for row_number, field, message in errors])
+
+        failed_rows = len({row_number for row_number, _, _ in errors})
+        cursor.execute(f"""
+            UPDATE property_imports
+            SET rows_processed = {p}, rows_imported = rows_imported + {p},
+                rows_failed = rows_failed + {p}, status = {p},
+                updated_at = CURRENT_TIMESTAMP
+                {', completed_at = CURRENT_TIMESTAMP' if final else ''}
+            WHERE id = {p}
+        """, (last_row, len(rows), failed_rows, 'completed' if final else 'running', job_id))
+
+        conn.commit()
+
+    def _upsert(self, cursor, rows):
+        """Insert or update properties keyed on property_id.
+
+        Fields left empty in the file keep the stored value, so a partial
+        re-import never blanks existing data.
+        """
+        columns = ', '.join(IMPORT_COLUMNS)
+        updates = ', '.join(f'{column} = COALESCE(EXCLUDED.{column}, properties.{column})'
+                            for column in IMPORT_COLUMNS[1:])
+        conflict = f"""
+            ON CONFLICT (property_id) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP
+        """
+
+        if is_sqlite():
+            placeholders = ', '.join('?' for _ in IMPORT_COLUMNS)
+            cursor.executemany(
+                f"INSERT INTO properties ({columns}) VALUES ({placeholders}) {conflict}",
+                rows
+            )
+        else:
+            from psycopg2.extras import execute_values
+            execute_values(
+                cursor,
+                f"INSERT INTO properties ({columns}) VALUES %s {conflict}",
+                rows,
+                page_size=len(rows)
+            )
+
+    def _refresh_feed(self, cursor, rows):
+        """Re-render listing cards for re-imported properties that are already published."""
+        clause, params = any_clause('property_id', [row[0] for row in rows])
+        cursor.execute(f"SELECT id FROM properties WHERE published = TRUE AND {clause}", params)
+        refresh_property_feed(cursor, [row['id'] for row in cursor.fetchall()])
+
+    def get_errors(self, job_id, page=1, per_page=100):
+        """Return one page of a job's per-row error report."""
+        p = self.placeholder
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT row_number, field, message
+                FROM property_import_errors
+                WHERE import_id = {p}
+                ORDER BY row_number, id
+                LIMIT {p} OFFSET {p}
+            """, (job_id, per_page, (page - 1) * per_page))
+            return [{
+                'row': error['row_number'],
+                'field': error['field'],
+                'message': error['message']
+            } for error in cursor.fetchall()]
+
+    def job_summary(self, job):
+        """Serialise an import job row."""
+        return {
+            'id': job['id'],
+            'source_name': job['source_name'],
+            'format': job['file_format'],
+            'status': job['status'],
+            'rows_processed': job['rows_processed'],
+            'rows_imported': job['rows_imported'],
+            'rows_failed': job['rows_failed']
+        }
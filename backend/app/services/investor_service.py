@@ -0,0 +1,156 @@
+# backend/app/services/investor_service.py
+import json
+from flask import current_app
+from app.database import get_db_connection, is_sqlite
+from app.utils.cache import TTLCache
+
+# Short-lived per-process cache of admin investor drill-downs, keyed by
+# (investor_id, documents page, documents per page, activities page, activities per page)
+_details_cache = TTLCache(ttl=30, max_entries=512)
+
+_POSTGRES_DETAILS_QUERY = """
+    SELECT
+        u.id, u.email, u.full_name, u.phone, u.user_type, u.language_preference,
+        u.is_active, u.is_verified, u.created_at,
+        ip.investor_type, ip.nationality, ip.min_investment, ip.max_investment,
+        ip.target_yield, ip.preferred_regions, ip.preferred_property_types,
+        ip.investment_strategies, ip.sharia_compliant_only,
+        (SELECT COUNT(*) FROM kyc_documents WHERE user_id = u.id) AS documents_total,
+        (SELECT COALESCE(json_agg(d ORDER BY d.uploaded_at DESC, d.id DESC), '[]'::json) FROM (
+            SELECT id, document_type, file_name, status, uploaded_at, reviewed_at, notes
+            FROM kyc_documents
+            WHERE user_id = u.id
+            ORDER BY uploaded_at DESC, id DESC
+            LIMIT %(documents_limit)s OFFSET %(documents_offset)s
+        ) d) AS documents,
+        (SELECT COUNT(*) FROM activity_logs WHERE user_id = u.id) AS activities_total,
+        (SELECT COALESCE(json_agg(a ORDER BY a.created_at DESC, a.id DESC), '[]'::json) FROM (
+            SELECT id, action, resource_type, resource_id, created_at
+            FROM activity_logs
+            WHERE user_id = u.id
+            ORDER BY created_at DESC, id DESC
+            LIMIT %(activities_limit)s OFFSET %(activities_offset)s
+        ) a) AS activities
+    FROM users u
+    LEFT JOIN investor_profiles ip ON u.id = ip.user_id
+    WHERE u.id = %(investor_id)s AND u.user_type = 'investor'
+"""
+
+_SQLITE_DETAILS_QUERY = """
+    SELECT
+        u.id, u.email, u.full_name, u.phone, u.user_type, u.language_preference,
+        u.is_active, u.is_verified, u.created_at,
+        ip.investor_type, ip.nationality, ip.min_investment, ip.max_investment,
+        ip.target_yield, ip.preferred_regions, ip.preferred_property_types,
+        ip.investment_strategies, ip.sharia_compliant_only,
+        (SELECT COUNT(*) FROM kyc_documents WHERE user_id = u.id) AS documents_total,
+        (SELECT json_group_array(json_object(
+            'id', id, 'document_type', document_type, 'file_name', file_name,
+            'status', status, 'uploaded_at', uploaded_at, 'reviewed_at', reviewed_at,
+            'notes', notes
+        )) FROM (
+            SELECT id, document_type, file_name, status, uploaded_at, reviewed_at, notes
+            FROM kyc_documents
+            WHERE user_id = u.id
+            ORDER BY uploaded_at DESC, id DESC
+            LIMIT :documents_limit OFFSET :documents_offset
+        )) AS documents,
+        (SELECT COUNT(*) FROM activity_logs WHERE user_id = u.id) AS activities_total,
+        (SELECT json_group_array(json_object(
+            'id', id, 'action', action, 'resource_type', resource_type,
+            'resource_id', resource_id, 'created_at', created_at
+        )) FROM (
+            SELECT id, action, resource_type, resource_id, created_at
+            FROM activity_logs
+            WHERE user_id = u.id
+            ORDER BY created_at DESC, id DESC
+            LIMIT :activities_limit OFFSET :activities_offset
+        )) AS activities
+    FROM users u
+    LEFT JOIN investor_profiles ip ON u.id = ip.user_id
+    WHERE u.id = :investor_id AND u.user_type = 'investor'
+"""
+
+def _iso(value):
+    """Format a timestamp that may already be a string (SQLite, JSON aggregates)."""
+    if value is None:
+        return None
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+def _json_list(value):
+    """Decode a JSON aggregate column (already decoded by psycopg2)."""
+    if value is None:
+        return []
+    return json.loads(value) if isinstance(value, str) else value
+
+def _pagination(total, page, per_page):
+    """Build a pagination block matching the list endpoints."""
+    return {
+        'total': total,
+        'page': page,
+        'per_page': per_page,
+        'total_pages': (total + per_page - 1) // per_page
+    }
+
+def get_investor_details(investor_id, documents_page=1, documents_per_page=20,
+                         activities_page=1, activities_per_page=20):
+    """Fetch an investor, a page of KYC documents and a page of activity in one statement.
+
+    Returns None when the investor does not exist.
+    """
+    cache_key = (investor_id, documents_page, documents_per_page, activities_page, activities_per_page)
+    cached = _details_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    params = {
+        'investor_id': investor_id,
+        'documents_limit': documents_per_page,
+        'documents_offset': (documents_page - 1) * documents_per_page,
+        'activities_limit': activities_per_page,
+        'activities_offset': (activities_page - 1) * activities_per_page
+    }
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(_SQLITE_DETAILS_QUERY if is_sqlite() else _POSTGRES_DETAILS_QUERY, params)
+        investor = cursor.fetchone()
+
+    if not investor:
+        return None
+
+    details = {
+        'investor': {
+            'id': investor['id'],
+            'email': investor['email'],
+            'full_name': investor['full_name'],
+            'phone': investor['phone'],
+            'user_type': investor['user_type'],
+            'language_preference': investor['language_preference'],
+            'is_active': investor['is_active'],
+            'is_verified': investor['is_verified'],
+            'created_at': _iso(investor['created_at']),
+            'profile': {
+                'investor_type': investor['investor_type'],
+                'nationality': investor['nationality'],
+                'min_investment': float(investor['min_investment']) if investor['min_investment'] else None,
+                'max_investment': float(investor['max_investment']) if investor['max_investment'] else None,
+                'target_yield': float(investor['target_yield']) if investor['target_yield'] else None,
+                'preferred_regions': _json_list(investor['preferred_regions']),
+                'preferred_property_types': _json_list(investor['preferred_property_types']),
+                'investment_strategies': _json_list(investor['investment_strategies']),
+                'sharia_compliant_only': investor['sharia_compliant_only']
+            }
+        },
+        'documents': _json_list(investor['documents']),
+        'documents_pagination': _pagination(investor['documents_total'], documents_page, documents_per_page),
+        'recent_activities': _json_list(investor['activities']),
+        'activities_pagination': _pagination(investor['activities_total'], activities_page, activities_per_page)
+    }
+
+    _details_cache.set(cache_key, details, current_app.config.get('INVESTOR_DETAIL_CACHE_TTL', 30))
+    return details
+
+def invalidate_investor_details(investor_id):
+    """Drop cached drill-downs for an investor after their KYC data changes."""
+    _details_cache.delete_where(lambda key: key[0] == investor_id)
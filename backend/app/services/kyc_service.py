@@ -0,0 +1,238 @@
+# backend/app/services/kyc_service.py
+from collections import defaultdict
+from datetime import date, timedelta
+from app.database import get_db_connection, placeholder, any_clause, insert_many
+from app.models.compliance import ComplianceConfig, ComplianceStatus
+from app.services.email_service import build_kyc_expiry_email, build_kyc_review_email, queue_emails
+from app.services.investor_service import invalidate_investor_details
+from app.services.report_service import record_compliance_events
+from app.utils.events import event_bus
+
+REVIEW_STATUSES = {'verified', 'rejected', 'pending'}
+
+def review_kyc_batch(cursor, admin_id, items):
+    """Apply many KYC review decisions with set-based statements.
+
+    Each item is a dict with `investor_id` and optional `document_ids`,
+    `status` (default 'verified'), `notes` and `verify_investor` (defaults to
+    True when the status is 'verified'). Runs on the caller's cursor so the
+    whole batch shares one transaction. Returns one result dict per item, in
+    request order; pass them to invalidate_reviewed_investors once committed.
+    """
+    p = placeholder()
+    results = []
+    valid_items = []
+
+    for item in items:
+        investor_id = item.get('investor_id')
+        status = item.get('status', 'verified')
+        if not isinstance(investor_id, int):
+            results.append({'investor_id': investor_id, 'success': False, 'message': 'investor_id is required'})
+        elif status not in REVIEW_STATUSES:
+            results.append({'investor_id': investor_id, 'success': False, 'message': f'Invalid status: {status}'})
+        else:
+            results.append({'investor_id': investor_id, 'success': True})
+            valid_items.append((len(results) - 1, item, status))
+
+    if not valid_items:
+        return results
+
+    # Resolve every referenced investor and document in two queries
+    investor_ids = {item['investor_id'] for _, item, _ in valid_items}
+    clause, params = any_clause('id', investor_ids)
+    cursor.execute(f"""
+        SELECT id, email, full_name, language_preference
+        FROM users
+        WHERE {clause} AND user_type = 'investor'
+    """, params)
+    investors = {row['id']: row for row in cursor.fetchall()}
+
+    document_ids = {doc_id for _, item, _ in valid_items for doc_id in item.get('document_ids') or []}
+    document_owners = {}
+    first_reviews = set()
+    if document_ids:
+        clause, params = any_clause('id', document_ids)
+        cursor.execute(f"SELECT id, user_id, reviewed_at FROM kyc_documents WHERE {clause}", params)
+        rows = cursor.fetchall()
+        document_owners = {row['id']: row['user_id'] for row in rows}
+        first_reviews = {row['id'] for row in rows if row['reviewed_at'] is None}
+
+    # Group document updates by (status, notes) so each group is one UPDATE
+    document_groups = defaultdict(list)
+    verify_ids = set()
+    activity_rows = []
+    notifications = {}
+    live_events = []
+
+    for index, item, status in valid_items:
+        investor_id = item['investor_id']
+        result = results[index]
+
+        if investor_id not in investors:
+            result.update({'success': False, 'message': 'Investor not found'})
+            continue
+
+        requested = item.get('document_ids') or []
+        updated = [doc_id for doc_id in requested if document_owners.get(doc_id) == investor_id]
+        document_groups[(status, item.get('notes'))].extend(updated)
+        result['documents_updated'] = updated
+        result['documents_not_found'] = [doc_id for doc_id in requested if doc_id not in updated]
+
+        verify = item.get('verify_investor', status == 'verified')
+        if verify:
+            verify_ids.add(investor_id)
+        result['investor_verified'] = bool(verify)
+
+        activity_rows.append((admin_id, 'verify_investor' if verify else 'review_kyc', 'user', investor_id))
+        activity_rows.extend((admin_id, f'kyc_{status}', 'document', doc_id) for doc_id in updated)
+        live_events.append((
+            'verify_investor' if verify else 'review_kyc',
+            {'status': status, 'verified': bool(verify), 'documents': updated},
+            investor_id
+        ))
+
+        if status in ('verified', 'rejected') and (verify or updated):
+            notifications[investor_id] = status
+
+    for (status, notes), doc_ids in document_groups.items():
+        if not doc_ids:
+            continue
+        clause, params = any_clause('id', doc_ids)
+        cursor.execute(f"""
+            UPDATE kyc_documents
+            SET status = {p}, reviewed_by = {p}, reviewed_at = CURRENT_TIMESTAMP, notes = {p}
+            WHERE {clause}
+        """, [status, admin_id, notes] + params)
+
+    if verify_ids:
+        clause, params = any_clause('id', verify_ids)
+        cursor.execute(f"""
+            UPDATE users
+            SET is_verified = TRUE, updated_at = CURRENT_TIMESTAMP
+            WHERE {clause}
+        """, params)
+
+    insert_many(cursor, 'activity_logs', ['user_id', 'action', 'resource_type', 'resource_id'], activity_rows)
+
+    reviewed = {doc_id for doc_ids in document_groups.values() for doc_id in doc_ids}
+    record_compliance_events(cursor, {
+        'kyc_documents_reviewed': len(reviewed & first_reviews),
+        'kyc_completed': len(verify_ids)
+    })
+
+    messages = []
+    for investor_id, status in notifications.items():
+        investor = investors[investor_id]
+        subject, body = build_kyc_review_email(
+            investor['full_name'], status, investor['language_preference'] or 'en'
+        )
+        messages.append((f'kyc_{status}', investor['email'], subject, body))
+    queue_emails(cursor, messages)
+    # Each investor's open /api/events streams see their own review
+    event_bus.publish_many(cursor, live_events)
+
+    return results
+
+def invalidate_reviewed_investors(results):
+    """Drop cached drill-downs for the investors a review_kyc_batch call touched.
+
+    Call after the review's transaction has committed: invalidating earlier
+    lets a concurrent read re-cache the pre-commit state.
+    """
+    for investor_id in {result['investor_id'] for result in results if result['success']}:
+        invalidate_investor_details(investor_id)
+
+def _transition_documents(cursor, new_status, from_statuses, date_from, date_to, limit):
+    """Move one batch of documents in an expiry_date range to new_status.
+
+    The status filter makes the transition idempotent: a document that has
+    already moved is never selected again. The change is stamped in
+    status_changed_at; reviewed_at stays reserved for human reviews.
+    Returns (id, user_id, document_type) rows.
+    """
+    p = placeholder()
+    lower = f"expiry_date > {p} AND " if date_from else ""
+    params = ([date_from] if date_from else []) + [date_to] + list(from_statuses) + [limit]
+    status_list = ', '.join(p for _ in from_statuses)
+
+    cursor.execute(f"""
+        UPDATE kyc_documents
+        SET status = {p}, status_changed_at = CURRENT_TIMESTAMP
+        WHERE id IN (
+            SELECT id FROM kyc_documents
+            WHERE {lower}expiry_date <= {p} AND status IN ({status_list})
+            ORDER BY expiry_date
+            LIMIT {p}
+        )
+        RETURNING id, user_id, document_type
+    """, [new_status] + params)
+    return cursor.fetchall()
+
+def scan_document_expiry(warning_days=None, batch_size=500):
+    """Expire lapsed KYC documents and flag those inside the warning window.
+
+    Uses the (expiry_date, status) index for range scans and updates in
+    batches, queuing one reminder email per investor per batch. Safe to run
+    every few minutes: documents only move forward through the statuses, so
+    each one is transitioned and emailed once. Returns counts per status.
+    """
+    config = ComplianceConfig()
+    warning_days = config.kyc_expiry_warning_days if warning_days is None else warning_days
+    today = date.today()
+    warn_until = today + timedelta(days=warning_days)
+    counts = {ComplianceStatus.EXPIRED.value: 0, ComplianceStatus.REQUIRES_UPDATE.value: 0}
+
+    transitions = [
+        # Lapsed documents expire whatever their review state; unreviewed ones
+        # go separately so they are counted out of the pending KYC rollup
+        (ComplianceStatus.EXPIRED.value, None, today.isoformat(), ('pending', 'in_review')),
+        (ComplianceStatus.EXPIRED.value, None, today.isoformat(),
+         ('verified', 'approved', ComplianceStatus.REQUIRES_UPDATE.value)),
+        # Approved documents entering the warning window need a fresh copy
+        (ComplianceStatus.REQUIRES_UPDATE.value, today.isoformat(), warn_until.isoformat(),
+         ('verified', 'approved')),
+    ]
+
+    for new_status, date_from, date_to, from_statuses in transitions:
+        while True:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                documents = _transition_documents(cursor, new_status, from_statuses, date_from, date_to, batch_size)
+                if not documents:
+                    break
+
+                by_user = defaultdict(list)
+                for document in documents:
+                    by_user[document['user_id']].append(document['document_type'] or 'document')
+
+                clause, params = any_clause('id', by_user.keys())
+                cursor.execute(f"""
+                    SELECT id, email, full_name, language_preference
+                    FROM users
+                    WHERE {clause}
+                """, params)
+
+                messages = []
+                for user in cursor.fetchall():
+                    subject, body = build_kyc_expiry_email(
+                        user['full_name'], by_user[user['id']],
+                        new_status == ComplianceStatus.EXPIRED.value,
+                        user['language_preference'] or 'en'
+                    )
+                    messages.append((f'kyc_{new_status}', user['email'], subject, body))
+                queue_emails(cursor, messages)
+
+                insert_many(cursor, 'activity_logs', ['user_id', 'action', 'resource_type', 'resource_id'],
+                            [(document['user_id'], f'kyc_{new_status}', 'document', document['id'])
+                             for document in documents])
+                if 'pending' in from_statuses:
+                    record_compliance_events(cursor, {'kyc_documents_lapsed': len(documents)})
+
+            for user_id in by_user:
+                invalidate_investor_details(user_id)
+            counts[new_status] += len(documents)
+
+            if len(documents) < batch_size:
+                break
+
+    return counts
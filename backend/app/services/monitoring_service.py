@@ -0,0 +1,164 @@
+# backend/app/services/monitoring_service.py
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import List, Optional
+from flask import current_app
+from app.database import get_db_connection, placeholder, any_clause
+from app.models.compliance import ComplianceConfig
+from app.services.alert_service import SEVERITY_PRIORITY
+from app.services.report_service import record_compliance_events
+from app.services.screening_service import ScreeningIndex, configured_lists, load_list
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CustomerRecord:
+    user_id: int
+    names: List[str] = field(default_factory=list)
+    nationalities: List[str] = field(default_factory=list)
+    dates_of_birth: List[str] = field(default_factory=list)
+
+def _digest(entry):
+    return hashlib.sha1(entry.fingerprint().encode('utf-8')).hexdigest()
+
+def diff_list(cursor, list_name, entries):
+    """Compare a new list version with the stored snapshot.
+
+    Returns (changed, removed_ids, new_fingerprints) where changed holds
+    entries that were added or whose screening fields changed.
+    """
+    p = placeholder()
+    cursor.execute(f"""
+        SELECT entry_id, fingerprint
+        FROM sanctions_list_entries
+        WHERE list_name = {p}
+    """, (list_name,))
+    previous = {row['entry_id']: row['fingerprint'] for row in cursor.fetchall()}
+
+    fingerprints = {entry.entry_id: _digest(entry) for entry in entries}
+    changed = [entry for entry in entries if previous.get(entry.entry_id) != fingerprints[entry.entry_id]]
+    removed_ids = [entry_id for entry_id in previous if entry_id not in fingerprints]
+    return changed, removed_ids, fingerprints
+
+def save_snapshot(cursor, list_name, changed, removed_ids, fingerprints):
+    """Record the new list version so the next run only sees later changes."""
+    p = placeholder()
+    if changed:
+        cursor.executemany(f"""
+            INSERT INTO sanctions_list_entries (list_name, entry_id, fingerprint)
+            VALUES ({p}, {p}, {p})
+            ON CONFLICT (list_name, entry_id) DO UPDATE
+            SET fingerprint = EXCLUDED.fingerprint, updated_at = CURRENT_TIMESTAMP
+        """, [(list_name, entry.entry_id, fingerprints[entry.entry_id]) for entry in changed])
+
+    if removed_ids:
+        clause, params = any_clause('entry_id', removed_ids)
+        cursor.execute(f"""
+            DELETE FROM sanctions_list_entries
+            WHERE list_name = {p} AND {clause}
+        """, [list_name] + params)
+
+def build_customer_index(cursor):
+    """Index every customer's name (and nationality) for reverse screening."""
+    cursor.execute("""
+        SELECT u.id, u.full_name, ip.nationality
+        FROM users u
+        LEFT JOIN investor_profiles ip ON u.id = ip.user_id
+        WHERE u.user_type = 'investor'
+    """)
+    index = ScreeningIndex()
+    for row in cursor.fetchall():
+        index.add(CustomerRecord(
+            user_id=row['id'],
+            names=[row['full_name']],
+            nationalities=[row['nationality']] if row['nationality'] else []
+        ))
+    return index
+
+def _alert_for(entry, customer, match_score, matched_name):
+    """Build the compliance_alerts row for a new customer/list-entry hit."""
+    if entry.list_type == 'pep':
+        severity = 'medium'
+        alert_type = 'pep_match'
+    else:
+        severity = 'critical' if match_score >= 0.95 else 'high'
+        alert_type = 'sanctions_match'
+    primary_name = entry.names[0] if entry.names else entry.entry_id
+    return (
+        customer.user_id,
+        alert_type,
+        severity,
+        SEVERITY_PRIORITY[severity],
+        f'Possible {entry.list_name} match: {primary_name}',
+        f'Customer name "{matched_name}" matched list entry {entry.entry_id} '
+        f'({entry.regime or entry.list_type}) with confidence {match_score:.2f}',
+        f'list_update:{entry.list_name}',
+        'open',
+        f'{alert_type}:{entry.list_name}:{entry.entry_id}:{customer.user_id}'
+    )
+
+def rescreen_list_changes(config: Optional[ComplianceConfig] = None):
+    """Screen only added/changed list entries against all customers.
+
+    Cost grows with the size of the list delta rather than with
+    customers x entries. Alerts are deduplicated on (list, entry, customer),
+    so re-running a day or re-screening an unchanged hit creates nothing.
+    Returns a per-list summary.
+    """
+    config = config or ComplianceConfig()
+    if not config.ongoing_monitoring_enabled:
+        return []
+
+    threshold = current_app.config.get('SCREENING_MATCH_THRESHOLD', 0.88)
+    p = placeholder()
+    summary = []
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        customers = None
+
+        for list_name, path in configured_lists():
+            entries = load_list(path, list_name)
+            changed, removed_ids, fingerprints = diff_list(cursor, list_name, entries)
+
+            alerts = []
+            if changed:
+                # Built lazily: quiet days with no list changes never touch customers
+                if customers is None:
+                    customers = build_customer_index(cursor)
+                for entry in changed:
+                    hits = {}
+                    for name in entry.names:
+                        nationality = entry.nationalities[0] if entry.nationalities else None
+                        for match in customers.search(name, nationality=nationality, threshold=threshold):
+                            customer = match.entry
+                            if match.score > hits.get(customer.user_id, (0, None, None))[0]:
+                                hits[customer.user_id] = (match.score, customer, match.matched_name)
+                    alerts.extend(_alert_for(entry, customer, score, matched_name)
+                                  for score, customer, matched_name in hits.values())
+
+            created = 0
+            for alert in alerts:
+                cursor.execute(f"""
+                    INSERT INTO compliance_alerts
+                    (user_id, alert_type, severity, priority, title, description, triggered_by, status, alert_key)
+                    VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p})
+                    ON CONFLICT (alert_key) DO NOTHING
+                """, alert)
+                created += cursor.rowcount if cursor.rowcount and cursor.rowcount > 0 else 0
+            record_compliance_events(cursor, {'alerts_generated': created})
+
+            save_snapshot(cursor, list_name, changed, removed_ids, fingerprints)
+            conn.commit()
+
+            logger.info(f"{list_name}: {len(changed)} changed, {len(removed_ids)} removed, {created} new alerts")
+            summary.append({
+                'list_name': list_name,
+                'entries': len(entries),
+                'changed': len(changed),
+                'removed': len(removed_ids),
+                'alerts_created': created
+            })
+
+    return summary
@@ -0,0 +1,356 @@
+# backend/app/services/property_service.py
+from datetime import datetime
+from flask import current_app
+from app.database import any_clause, get_db_connection, insert_many, placeholder
+from app.services.calculation_service import ShariaCompliantCalculator
+from app.utils.cache import TwoTierCache, redis_client
+from app.utils.etags import weak_etag
+from app.utils.serializers import Field, Localized, Projection, json_list, json_object, money, row_encoder
+
+# Published detail pages, keyed by property id and stored with their version
+# (the detail ETag), so a copy is only served while the rows are unchanged
+_detail_cache = TwoTierCache('property-detail', ttl=600, local_ttl=60, max_entries=2048)
+
+encode_property_summary = row_encoder({
+    'id': 'id',
+    'property_id': 'property_id',
+    'title': {'en': 'title_en', 'ar': 'title_ar'},
+    'description': {'en': 'description_en', 'ar': 'description_ar'},
+    'address': 'address',
+    'city': 'city',
+    'postcode': 'postcode',
+    'property_type': 'property_type',
+    'bedrooms': 'bedrooms',
+    'bathrooms': 'bathrooms',
+    'square_feet': 'square_feet',
+    'asking_price': Field('asking_price', money),
+    'monthly_rent': Field('monthly_rent', money),
+    'strategy': 'strategy',
+    'bmv_score': 'bmv_score',
+    'tier': 'tier',
+    'images': Field('images', json_list),
+})
+
+def init_property_cache(app):
+    """Point the detail cache at REDIS_URL (or a per-process stand-in) and apply its limits."""
+    _detail_cache.configure(
+        redis=redis_client(app.config.get('REDIS_URL')),
+        ttl=app.config.get('PROPERTY_CACHE_TTL'),
+        local_ttl=app.config.get('PROPERTY_CACHE_LOCAL_TTL'),
+        max_entries=app.config.get('PROPERTY_CACHE_MAX_ENTRIES')
+    )
+
+def total_costs(row):
+    """One-off acquisition costs on top of the asking price."""
+    return (
+        (row['refurbishment_cost'] or 0) +
+        (row['stamp_duty'] or 0) +
+        (row['legal_fees'] or 0) +
+        (row['sourcing_fee'] or 0) +
+        (row['other_costs'] or 0)
+    )
+
+def summary_metrics(row, calculator=None):
+    """Headline yield/ROI figures shown on listing cards."""
+    calculator = calculator or ShariaCompliantCalculator()
+    return calculator.calculate_investment_metrics(
+        purchase_price=row['asking_price'],
+        monthly_rent=row['monthly_rent'],
+        annual_costs=row['annual_costs'] or 0,
+        total_costs=total_costs(row)
+    )
+
+def detailed_metrics(row, calculator=None):
+    """Full Sharia-compliant breakdown shown on the detail page."""
+    calculator = calculator or ShariaCompliantCalculator()
+    return calculator.calculate_detailed_metrics(
+        purchase_price=row['asking_price'],
+        monthly_rent=row['monthly_rent'],
+        refurbishment_cost=row['refurbishment_cost'] or 0,
+        stamp_duty=row['stamp_duty'] or 0,
+        legal_fees=row['legal_fees'] or 0,
+        sourcing_fee=row['sourcing_fee'] or 0,
+        other_costs=row['other_costs'] or 0,
+        annual_costs=row['annual_costs'] or 0,
+        void_percentage=row['void_percentage'] or 10,
+        maintenance_percentage=row['maintenance_percentage'] or 5,
+        management_percentage=row['management_percentage'] or 10
+    )
+
+_COST_COLUMNS = [
+    'dp.refurbishment_cost', 'dp.stamp_duty', 'dp.legal_fees',
+    'dp.sourcing_fee', 'dp.other_costs', 'dp.annual_costs'
+]
+
+# ?fields= / ?lang= projections. Listing columns come from property_feed (f)
+# where it has them, so a narrow projection joins only what it needs
+listing_projection = Projection({
+    'id': (['f.property_id AS id'], 'id'),
+    'property_id': (['p.property_id'], 'property_id'),
+    'title': Localized('dp', 'title'),
+    'description': Localized('dp', 'description'),
+    'address': (['p.address'], 'address'),
+    'city': (['f.city'], 'city'),
+    'postcode': (['p.postcode'], 'postcode'),
+    'property_type': (['f.property_type'], 'property_type'),
+    'bedrooms': (['p.bedrooms'], 'bedrooms'),
+    'bathrooms': (['p.bathrooms'], 'bathrooms'),
+    'square_feet': (['p.square_feet'], 'square_feet'),
+    'asking_price': (['f.asking_price'], Field('asking_price', money)),
+    'monthly_rent': (['f.monthly_rent'], Field('monthly_rent', money)),
+    'strategy': (['f.strategy'], 'strategy'),
+    'bmv_score': (['f.bmv_score'], 'bmv_score'),
+    'tier': (['p.tier'], 'tier'),
+    'images': (['dp.images'], Field('images', json_list)),
+    'metrics': (['f.asking_price', 'f.monthly_rent'] + _COST_COLUMNS, summary_metrics),
+    'location': (['dp.location_data'], Field('location_data', json_object)),
+}, optional=('location',))
+
+detail_projection = Projection({
+    'id': (['p.id'], 'id'),
+    'title': Localized('dp', 'title'),
+    'description': Localized('dp', 'description'),
+    'address': (['p.address'], 'address'),
+    'city': (['p.city'], 'city'),
+    'postcode': (['p.postcode'], 'postcode'),
+    'property_details': (['p.property_type', 'p.bedrooms', 'p.bathrooms', 'p.square_feet'], {
+        'type': 'property_type',
+        'bedrooms': 'bedrooms',
+        'bathrooms': 'bathrooms',
+        'square_feet': 'square_feet',
+    }),
+    'financial_details': (['p.asking_price', 'p.monthly_rent'] + _COST_COLUMNS, {
+        'asking_price': Field('asking_price', money),
+        'refurbishment_cost': Field('refurbishment_cost', money),
+        'stamp_duty': Field('stamp_duty', money),
+        'legal_fees': Field('legal_fees', money),
+        'sourcing_fee': Field('sourcing_fee', money),
+        'other_costs': Field('other_costs', money),
+        'monthly_rent': Field('monthly_rent', money),
+    }),
+    'investment_strategy': (['dp.strategy'], 'strategy'),
+    'bmv_analysis': (['p.bmv_score', 'p.tier'], {'score': 'bmv_score', 'tier': 'tier'}),
+    'images': (['dp.images'], Field('images', json_list)),
+    'documents': (['dp.documents'], Field('documents', json_list)),
+    'location': (['dp.location_data'], Field('location_data', json_object)),
+    'sharia_compliant_metrics': (
+        ['p.asking_price', 'p.monthly_rent'] + _COST_COLUMNS +
+        ['dp.void_percentage', 'dp.maintenance_percentage', 'dp.management_percentage'],
+        detailed_metrics
+    ),
+})
+
+FULL_DETAIL = detail_projection.parse(None)
+
+def detailed_metrics_batch(rows, **overrides):
+    """detailed_metrics for many rows in one vectorized pass.
+
+    `overrides` replace a column for every row (e.g. void_percentage=8).
+    Returns (calculator, batch arrays) for use with detailed_metrics_at.
+    """
+    defaults = {'void_percentage': 10, 'maintenance_percentage': 5, 'management_percentage': 10}
+    columns = {}
+    for name in ShariaCompliantCalculator.DETAILED_INPUTS:
+        column = 'asking_price' if name == 'purchase_price' else name
+        if overrides.get(name) is not None:
+            columns[name] = [overrides[name]] * len(rows)
+        else:
+            columns[name] = [row[column] or defaults.get(name, 0) for row in rows]
+    calculator = ShariaCompliantCalculator()
+    return calculator, calculator.calculate_detailed_metrics_batch(**columns)
+
+def property_version(cursor, property_id):
+    """ETag for a published property's detail page, or None if it is not published.
+
+    Every write to a property or its packages refreshes its feed entry, and
+    refreshed_at has microsecond resolution even on SQLite, so the tag
+    changes with each write rather than once per second.
+    """
+    cursor.execute(f"SELECT refreshed_at FROM property_feed WHERE property_id = {placeholder()}", (property_id,))
+    version = cursor.fetchone()
+    if not version:
+        return None
+    return weak_etag(property_id, version['refreshed_at'])
+
+def _build_property_detail(cursor, property_id, projection=FULL_DETAIL):
+    cursor.execute(f"""
+        SELECT {', '.join(detail_projection.columns(projection))}
+        FROM properties p
+        JOIN deal_packages dp ON p.id = dp.property_id
+        WHERE p.id = {placeholder()} AND p.published = TRUE AND dp.published = TRUE
+    """, (property_id,))
+    property_data = cursor.fetchone()
+    if not property_data:
+        return None
+    return detail_projection.encoder(projection)(property_data)
+
+def get_property_detail(cursor, property_id, version, projection=FULL_DETAIL):
+    """Detail payload for a published property at `version`.
+
+    Full payloads are read through the cache; projections select only their
+    own columns. The returned dict may be shared with the cache and must not
+    be modified.
+    """
+    if projection != FULL_DETAIL:
+        return _build_property_detail(cursor, property_id, projection)
+    return _detail_cache.get_or_compute(
+        property_id, version, lambda: _build_property_detail(cursor, property_id)
+    )
+
+def load_published_rows(cursor, property_ids, projection=FULL_DETAIL):
+    """Rows (one per published property) with the columns a detail projection needs."""
+    clause, params = any_clause('p.id', list(dict.fromkeys(property_ids)))
+    cursor.execute(f"""
+        SELECT {', '.join(detail_projection.columns(projection))}
+        FROM properties p
+        JOIN deal_packages dp ON p.id = dp.property_id
+        WHERE {clause} AND p.published = TRUE AND dp.published = TRUE
+    """, params)
+    return cursor.fetchall()
+
+def without_metrics(projection):
+    """The projection minus sharia_compliant_metrics, for callers that batch them."""
+    names, lang = projection
+    return tuple(name for name in names if name != 'sharia_compliant_metrics'), lang
+
+def get_property_details_batch(cursor, property_ids, projection=FULL_DETAIL):
+    """Detail payloads for many published properties with one query.
+
+    Returns {property_id: payload} for the ids that exist; metrics are
+    computed for all of them in a single vectorized pass.
+    """
+    names, lang = projection
+    with_metrics = 'sharia_compliant_metrics' in names
+    rows = load_published_rows(cursor, property_ids, projection)
+
+    encode = detail_projection.encoder(without_metrics(projection))
+    if with_metrics and rows:
+        calculator, batch = detailed_metrics_batch(rows)
+
+    results = {}
+    for i, row in enumerate(rows):
+        if row['id'] in results:
+            continue
+        payload = encode(row)
+        if with_metrics:
+            # Last in the registry, so appending keeps the usual key order
+            payload['sharia_compliant_metrics'] = calculator.detailed_metrics_at(batch, i)
+        results[row['id']] = payload
+    return results
+
+def invalidate_property_detail(property_id):
+    """Drop cached detail pages for a property after its deal package changes."""
+    _detail_cache.invalidate(property_id)
+
+# Columns copied into property_feed next to the pre-rendered card, for
+# filtering and sorting listing pages without touching the source tables
+FEED_COLUMNS = [
+    'property_id', 'deal_id', 'city', 'property_type', 'strategy', 'asking_price',
+    'monthly_rent', 'bmv_score', 'created_at', 'payload', 'refreshed_at'
+]
+
+_FEED_SOURCE_QUERY = """
+    SELECT
+        p.id, p.property_id, p.address, p.postcode, p.city,
+        p.property_type, p.bedrooms, p.bathrooms, p.square_feet,
+        p.asking_price, p.monthly_rent, p.bmv_score, p.tier, p.created_at,
+        dp.id as deal_id, dp.title_en, dp.title_ar, dp.description_en, dp.description_ar,
+        dp.strategy, dp.refurbishment_cost, dp.stamp_duty, dp.legal_fees,
+        dp.sourcing_fee, dp.other_costs, dp.annual_costs,
+        dp.images, dp.documents
+    FROM properties p
+    JOIN deal_packages dp ON p.id = dp.property_id
+    WHERE p.published = TRUE AND dp.published = TRUE
+"""
+
+def render_card(row, calculator=None):
+    """Listing card for a published property, as compact JSON text."""
+    card = encode_property_summary(row)
+    card['metrics'] = summary_metrics(row, calculator)
+    return current_app.json.dumps(card)
+
+def _feed_rows(rows):
+    calculator = ShariaCompliantCalculator()
+    # Microsecond refresh stamps keep the listing ETag moving on SQLite,
+    # whose CURRENT_TIMESTAMP only has one-second resolution
+    refreshed_at = datetime.utcnow()
+    feed = {}
+    for row in rows:
+        # A property with several published packages shows the newest one
+        if row['id'] in feed and feed[row['id']][1] > row['deal_id']:
+            continue
+        feed[row['id']] = (
+            row['id'], row['deal_id'], row['city'], row['property_type'], row['strategy'],
+            row['asking_price'], row['monthly_rent'], row['bmv_score'], row['created_at'],
+            render_card(row, calculator), refreshed_at
+        )
+    return list(feed.values())
+
+# Concurrent refreshes of one property (a publish racing an edit or an
+# import) overwrite each other's entry instead of colliding on the key
+_FEED_UPSERT = 'ON CONFLICT (property_id) DO UPDATE SET ' + ', '.join(
+    f'{column} = EXCLUDED.{column}' for column in FEED_COLUMNS[1:]
+)
+
+def refresh_property_feed(cursor, property_ids):
+    """Re-render the feed entries of these properties in the caller's transaction.
+
+    Properties that are no longer published (or have no published package)
+    drop out of the feed.
+    """
+    property_ids = list(property_ids)
+    if not property_ids:
+        return 0
+    clause, params = any_clause('p.id', property_ids)
+    cursor.execute(_FEED_SOURCE_QUERY + f" AND {clause}", params)
+    rows = _feed_rows(cursor.fetchall())
+    insert_many(cursor, 'property_feed', FEED_COLUMNS, rows, on_conflict=_FEED_UPSERT)
+
+    dropped = set(property_ids) - {row[0] for row in rows}
+    if dropped:
+        clause, params = any_clause('property_id', dropped)
+        cursor.execute(f"DELETE FROM property_feed WHERE {clause}", params)
+    return len(rows)
+
+def rebuild_property_feed(chunk_size=500):
+    """Re-render the whole feed from the source tables. Returns the number of entries."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM property_feed")
+        cursor.execute(_FEED_SOURCE_QUERY)
+        rows = _feed_rows(cursor.fetchall())
+        for start in range(0, len(rows), chunk_size):
+            insert_many(cursor, 'property_feed', FEED_COLUMNS, rows[start:start + chunk_size],
+                        on_conflict=_FEED_UPSERT)
+        return len(rows)
+
+def backfill_property_feed():
+    """Build the feed on first start-up against a database that predates it."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM property_feed LIMIT 1")
+        if cursor.fetchone():
+            return 0
+    return rebuild_property_feed()
+
+def feed_filters(min_price=None, max_price=None, city=None, property_type=None, strategy=None, alias=''):
+    """WHERE clause and parameters for a listing query against property_feed."""
+    p = placeholder()
+    prefix = f'{alias}.' if alias else ''
+    where, params = [], []
+    if min_price:
+        where.append(f"{prefix}asking_price >= {p}")
+        params.append(min_price)
+    if max_price:
+        where.append(f"{prefix}asking_price <= {p}")
+        params.append(max_price)
+    if city:
+        where.append(f"LOWER({prefix}city) LIKE {p}")
+        params.append(f'%{city.lower()}%')
+    if property_type:
+        where.append(f"{prefix}property_type = {p}")
+        params.append(property_type)
+    if strategy:
+        where.append(f"{prefix}strategy = {p}")
+        params.append(strategy)
+    return (' WHERE ' + ' AND '.join(where)) if where else '', params
@@ -0,0 +1,224 @@
+# backend/app/services/report_service.py
+import csv
+import io
+import json
+from datetime import date, datetime
+from app.database import get_db_connection, placeholder
+from app.models.compliance import ComplianceReport
+
+# Daily counters kept in compliance_daily_rollups. Stock figures (total
+# customers, pending KYC) are cumulative sums of these flows; documents
+# that expire before anyone reviews them leave pending KYC as 'lapsed'.
+ROLLUP_METRICS = [
+    'customers_registered',
+    'kyc_documents_submitted',
+    'kyc_documents_reviewed',
+    'kyc_documents_lapsed',
+    'kyc_completed',
+    'sanctions_checks_performed',
+    'sanctions_matches',
+    'pep_matches',
+    'alerts_generated',
+    'alerts_resolved',
+]
+
+def record_compliance_events(cursor, counts, day=None):
+    """Add event counts to today's rollup rows inside the caller's transaction."""
+    p = placeholder()
+    rows = [(metric, value) for metric, value in counts.items() if value]
+    if not rows:
+        return
+
+    day_sql = p if day else 'CURRENT_DATE'
+    cursor.executemany(f"""
+        INSERT INTO compliance_daily_rollups (day, metric, value)
+        VALUES ({day_sql}, {p}, {p})
+        ON CONFLICT (day, metric) DO UPDATE
+        SET value = compliance_daily_rollups.value + EXCLUDED.value
+    """, [((day.isoformat(),) if day else ()) + row for row in rows])
+
+def rebuild_rollups():
+    """Recompute all rollups from the raw tables (initial backfill or repair)."""
+    sources = [
+        ('customers_registered', "SELECT DATE(created_at) AS day, COUNT(*) AS value FROM users WHERE user_type = 'investor' GROUP BY DATE(created_at)"),
+        ('kyc_documents_submitted', "SELECT DATE(uploaded_at) AS day, COUNT(*) AS value FROM kyc_documents GROUP BY DATE(uploaded_at)"),
+        ('kyc_documents_reviewed', "SELECT DATE(reviewed_at) AS day, COUNT(*) AS value FROM kyc_documents WHERE reviewed_at IS NOT NULL GROUP BY DATE(reviewed_at)"),
+        ('kyc_documents_lapsed', "SELECT DATE(status_changed_at) AS day, COUNT(*) AS value FROM kyc_documents WHERE status = 'expired' AND reviewed_at IS NULL GROUP BY DATE(status_changed_at)"),
+        ('kyc_completed', "SELECT DATE(created_at) AS day, COUNT(*) AS value FROM activity_logs WHERE action = 'verify_investor' GROUP BY DATE(created_at)"),
+        ('sanctions_checks_performed', "SELECT DATE(performed_at) AS day, COUNT(*) AS value FROM sanctions_checks GROUP BY DATE(performed_at)"),
+        ('sanctions_matches', "SELECT DATE(performed_at) AS day, COUNT(*) AS value FROM sanctions_checks WHERE sanctions_match = TRUE GROUP BY DATE(performed_at)"),
+        ('pep_matches', "SELECT DATE(performed_at) AS day, COUNT(*) AS value FROM sanctions_checks WHERE pep_match = TRUE GROUP BY DATE(performed_at)"),
+        ('alerts_generated', "SELECT DATE(created_at) AS day, COUNT(*) AS value FROM compliance_alerts GROUP BY DATE(created_at)"),
+        ('alerts_resolved', "SELECT DATE(resolved_at) AS day, COUNT(*) AS value FROM compliance_alerts WHERE resolved_at IS NOT NULL GROUP BY DATE(resolved_at)"),
+    ]
+    p = placeholder()
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM compliance_daily_rollups")
+        for metric, query in sources:
+            cursor.execute(f"""
+                INSERT INTO compliance_daily_rollups (day, metric, value)
+                SELECT day, {p}, value FROM ({query}) source
+                WHERE day IS NOT NULL
+            """, (metric,))
+
+def _parse_day(value):
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+def generate_compliance_report(period_start, period_end, report_type='periodic', generated_by=None):
+    """Build and store a ComplianceReport by summing daily rollups.
+
+    Cost is one grouped scan of the rollup table for the period plus one for
+    the cumulative stock figures, independent of raw event volume.
+    """
+    period_start, period_end = _parse_day(period_start), _parse_day(period_end)
+    p = placeholder()
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute(f"""
+            SELECT day, metric, value
+            FROM compliance_daily_rollups
+            WHERE day >= {p} AND day <= {p}
+            ORDER BY day
+        """, (period_start.isoformat(), period_end.isoformat()))
+        daily = {}
+        totals = dict.fromkeys(ROLLUP_METRICS, 0)
+        for row in cursor.fetchall():
+            day = str(row['day'])[:10]
+            daily.setdefault(day, dict.fromkeys(ROLLUP_METRICS, 0))[row['metric']] = row['value']
+            totals[row['metric']] = totals.get(row['metric'], 0) + row['value']
+
+        cursor.execute(f"""
+            SELECT metric, SUM(value) AS value
+            FROM compliance_daily_rollups
+            WHERE day <= {p}
+            GROUP BY metric
+        """, (period_end.isoformat(),))
+        cumulative = {row['metric']: row['value'] or 0 for row in cursor.fetchall()}
+
+        report = ComplianceReport(
+            report_type=report_type,
+            report_period_start=datetime.combine(period_start, datetime.min.time()),
+            report_period_end=datetime.combine(period_end, datetime.min.time()),
+            total_customers=cumulative.get('customers_registered', 0),
+            kyc_completed=totals['kyc_completed'],
+            kyc_pending=max(cumulative.get('kyc_documents_submitted', 0) - cumulative.get('kyc_documents_reviewed', 0)
+                            - cumulative.get('kyc_documents_lapsed', 0), 0),
+            sanctions_checks_performed=totals['sanctions_checks_performed'],
+            pep_matches=totals['pep_matches'],
+            alerts_generated=totals['alerts_generated'],
+            alerts_resolved=totals['alerts_resolved'],
+            report_data={
+                'totals': totals,
+                'daily': [dict(day=day, **values) for day, values in sorted(daily.items())]
+            },
+            generated_by=generated_by,
+            generated_at=datetime.utcnow()
+        )
+
+        cursor.execute(f"""
+            INSERT INTO compliance_reports
+            (report_type, report_period_start, report_period_end, total_customers,
+             kyc_completed, kyc_pending, sanctions_checks_performed, pep_matches,
+             alerts_generated, alerts_resolved, report_data, generated_by, generated_at)
+            VALUES ({', '.join(p for _ in range(13))})
+            RETURNING id
+        """, (
+            report.report_type, period_start.isoformat(), period_end.isoformat(),
+            report.total_customers, report.kyc_completed, report.kyc_pending,
+            report.sanctions_checks_performed, report.pep_matches,
+            report.alerts_generated, report.alerts_resolved,
+            json.dumps(report.report_data), report.generated_by, report.generated_at
+        ))
+        report.id = cursor.fetchone()['id']
+
+    return report
+
+def get_compliance_report(report_id):
+    """Load a stored ComplianceReport."""
+    p = placeholder()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT * FROM compliance_reports WHERE id = {p}", (report_id,))
+        row = cursor.fetchone()
+
+    if not row:
+        return None
+
+    report_data = row['report_data']
+    return ComplianceReport(
+        id=row['id'],
+        report_type=row['report_type'],
+        report_period_start=row['report_period_start'],
+        report_period_end=row['report_period_end'],
+        total_customers=row['total_customers'],
+        kyc_completed=row['kyc_completed'],
+        kyc_pending=row['kyc_pending'],
+        sanctions_checks_performed=row['sanctions_checks_performed'],
+        pep_matches=row['pep_matches'],
+        alerts_generated=row['alerts_generated'],
+        alerts_resolved=row['alerts_resolved'],
+        report_data=json.loads(report_data) if isinstance(report_data, str) else report_data,
+        generated_by=row['generated_by'],
+        generated_at=row['generated_at']
+    )
+
+SUMMARY_FIELDS = [
+    ('total_customers', 'Total customers'),
+    ('kyc_completed', 'KYC completed'),
+    ('kyc_pending', 'KYC documents pending'),
+    ('sanctions_checks_performed', 'Sanctions checks performed'),
+    ('pep_matches', 'PEP matches'),
+    ('alerts_generated', 'Alerts generated'),
+    ('alerts_resolved', 'Alerts resolved'),
+]
+
+def _period(report):
+    return str(report.report_period_start)[:10], str(report.report_period_end)[:10]
+
+def report_to_csv(report):
+    """Render a report summary and daily breakdown as CSV text."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    start, end = _period(report)
+    writer.writerow(['Compliance report', report.report_type, start, end])
+    writer.writerow([])
+    for field, label in SUMMARY_FIELDS:
+        writer.writerow([label, getattr(report, field)])
+    writer.writerow([])
+    writer.writerow(['day'] + ROLLUP_METRICS)
+    for row in report.report_data.get('daily', []):
+        writer.writerow([row['day']] + [row.get(metric, 0) for metric in ROLLUP_METRICS])
+    return buffer.getvalue()
+
+def report_to_pdf(report):
+    """Render a one-page PDF summary (requires reportlab)."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    start, end = _period(report)
+
+    y = height - 72
+    pdf.setFont('Helvetica-Bold', 16)
+    pdf.drawString(72, y, f'Compliance Report ({report.report_type})')
+    y -= 24
+    pdf.setFont('Helvetica', 11)
+    pdf.drawString(72, y, f'Period: {start} to {end}')
+    y -= 32
+
+    for field, label in SUMMARY_FIELDS:
+        pdf.drawString(72, y, label)
+        pdf.drawRightString(width - 72, y, str(getattr(report, field)))
+        y -= 18
+
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
@@ -0,0 +1,270 @@
+# backend/app/services/risk_service.py
+import calendar
+import hashlib
+import json
+import logging
+from collections import Counter, defaultdict
+from datetime import date
+import numpy as np
+from flask import current_app
+from app.database import get_db_connection, placeholder, any_clause, insert_many
+from app.models.compliance import ComplianceConfig, RiskRating
+
+logger = logging.getLogger(__name__)
+
+# (factor, weight) - a customer's score is the sum of the weights of its factors
+RISK_WEIGHTS = {
+    'high_risk_country': 2,
+    'pep': 2,
+    'sanctions_match': 3,
+    'large_investment': 1,
+    'expired_documents': 1,
+    'rejected_documents': 1,
+    'missing_documents': 1,
+}
+
+REVIEW_MONTHS = {'quarterly': 3, 'biannual': 6, 'annual': 12}
+
+MONITORING_FREQUENCY = {
+    RiskRating.PROHIBITED.value: 'quarterly',
+    RiskRating.HIGH.value: 'quarterly',
+    RiskRating.MEDIUM.value: 'biannual',
+    RiskRating.LOW.value: 'annual',
+}
+
+CDD_COLUMNS = [
+    'user_id', 'cdd_type', 'is_pep', 'risk_rating', 'risk_factors', 'last_review_date',
+    'next_review_date', 'monitoring_frequency', 'input_hash', 'config_hash', 'evaluated_at'
+]
+
+def _country(value):
+    return (value or '').strip().upper()
+
+def _country_list(value):
+    return [_country(country) for country in value.split(',') if country.strip()]
+
+def risk_config():
+    """Build a ComplianceConfig from the app's risk settings."""
+    return ComplianceConfig(
+        enhanced_dd_threshold=current_app.config.get('ENHANCED_DD_THRESHOLD', 10000.0),
+        high_risk_countries=_country_list(current_app.config.get('HIGH_RISK_COUNTRIES', '')),
+        prohibited_countries=_country_list(current_app.config.get('PROHIBITED_COUNTRIES', ''))
+    )
+
+def config_hash(config):
+    """Fingerprint the rules inputs so a config change re-rates everybody."""
+    payload = json.dumps({
+        'high_risk': sorted(config.high_risk_countries),
+        'prohibited': sorted(config.prohibited_countries),
+        'threshold': config.enhanced_dd_threshold,
+        'required': sorted(doc.value for doc in config.kyc_required_documents),
+        'weights': RISK_WEIGHTS
+    }, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def add_months(day, months):
+    """Shift a date by whole months, clamping to the end of shorter months."""
+    month = day.month - 1 + months
+    year, month = day.year + month // 12, month % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+def _load_inputs(cursor, user_ids):
+    """Collect screening hits and document state for a chunk of customers in two grouped queries."""
+    clause, params = any_clause('user_id', user_ids)
+    cursor.execute(f"""
+        SELECT user_id,
+               SUM(CASE WHEN sanctions_match = TRUE AND (cleared IS NULL OR cleared = FALSE) THEN 1 ELSE 0 END) AS sanctions_hits,
+               SUM(CASE WHEN pep_match = TRUE AND (cleared IS NULL OR cleared = FALSE) THEN 1 ELSE 0 END) AS pep_hits
+        FROM sanctions_checks
+        WHERE {clause}
+        GROUP BY user_id
+    """, params)
+    hits = {row['user_id']: (row['sanctions_hits'] or 0, row['pep_hits'] or 0) for row in cursor.fetchall()}
+
+    cursor.execute(f"""
+        SELECT user_id, document_type, status, COUNT(*) AS documents
+        FROM kyc_documents
+        WHERE {clause}
+        GROUP BY user_id, document_type, status
+    """, params)
+    documents = defaultdict(list)
+    for row in cursor.fetchall():
+        documents[row['user_id']].append((row['document_type'] or '', row['status'] or '', row['documents']))
+
+    return hits, documents
+
+def evaluate_chunk(customers, hits, documents, config):
+    """Rate a chunk of customers with array operations over the rule inputs.
+
+    customers is a list of (user_id, nationality, investment) tuples. Returns
+    (ratings, factors, is_pep) aligned with the input order.
+    """
+    user_ids = [customer[0] for customer in customers]
+    nationality = np.array([_country(customer[1]) for customer in customers], dtype=object)
+    investment = np.array([float(customer[2] or 0) for customer in customers])
+
+    sanctions_hits = np.array([hits.get(user_id, (0, 0))[0] for user_id in user_ids])
+    pep_hits = np.array([hits.get(user_id, (0, 0))[1] for user_id in user_ids])
+
+    required = {doc.value for doc in config.kyc_required_documents}
+    expired = np.zeros(len(customers), dtype=bool)
+    rejected = np.zeros(len(customers), dtype=bool)
+    missing = np.ones(len(customers), dtype=bool)
+    for i, user_id in enumerate(user_ids):
+        held = set()
+        for document_type, status, _ in documents.get(user_id, []):
+            if status in ('expired', 'requires_update'):
+                expired[i] = True
+            elif status == 'rejected':
+                rejected[i] = True
+            elif status in ('verified', 'approved'):
+                held.add(document_type)
+        missing[i] = not required <= held
+
+    masks = {
+        'high_risk_country': np.isin(nationality, config.high_risk_countries),
+        'pep': pep_hits > 0,
+        'sanctions_match': sanctions_hits > 0,
+        'large_investment': investment >= config.enhanced_dd_threshold,
+        'expired_documents': expired,
+        'rejected_documents': rejected,
+        'missing_documents': missing,
+    }
+    prohibited = np.isin(nationality, config.prohibited_countries)
+
+    score = sum(mask.astype(int) * RISK_WEIGHTS[name] for name, mask in masks.items())
+    ratings = np.select(
+        [prohibited, score >= 2, score >= 1],
+        [RiskRating.PROHIBITED.value, RiskRating.HIGH.value, RiskRating.MEDIUM.value],
+        default=RiskRating.LOW.value
+    )
+
+    factors = [[] for _ in customers]
+    for i in np.flatnonzero(prohibited):
+        factors[i].append('prohibited_country')
+    for name, mask in masks.items():
+        for i in np.flatnonzero(mask):
+            factors[i].append(name)
+
+    return ratings.tolist(), factors, masks['pep'].tolist()
+
+def _input_hash(customer, hits, documents):
+    user_id, nationality, investment = customer
+    payload = json.dumps([
+        _country(nationality), float(investment or 0),
+        list(hits.get(user_id, (0, 0))), sorted(documents.get(user_id, []))
+    ])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def _candidates(cursor, last_id, current_config_hash, today, limit):
+    """One keyset page of customers whose inputs changed since they were last rated.
+
+    A customer is a candidate when it has no CDD record, the rules changed,
+    its review is due, or its user/profile/documents/screening rows were
+    touched after evaluated_at.
+    """
+    p = placeholder()
+    cursor.execute(f"""
+        SELECT u.id, ip.nationality, COALESCE(ip.max_investment, ip.min_investment) AS investment,
+               cdd.input_hash, cdd.config_hash, cdd.next_review_date
+        FROM users u
+        LEFT JOIN investor_profiles ip ON u.id = ip.user_id
+        LEFT JOIN customer_due_diligence cdd ON u.id = cdd.user_id
+        WHERE u.user_type = 'investor' AND u.id > {p}
+          AND (
+            cdd.id IS NULL
+            OR cdd.config_hash IS NULL OR cdd.config_hash <> {p}
+            OR cdd.next_review_date <= {p}
+            OR u.updated_at > cdd.evaluated_at
+            OR ip.updated_at > cdd.evaluated_at
+            OR EXISTS (
+                SELECT 1 FROM kyc_documents d
+                WHERE d.user_id = u.id
+                  AND (COALESCE(d.reviewed_at, d.uploaded_at) > cdd.evaluated_at OR d.status_changed_at > cdd.evaluated_at)
+            )
+            OR EXISTS (
+                SELECT 1 FROM sanctions_checks s
+                WHERE s.user_id = u.id AND (s.performed_at > cdd.evaluated_at OR s.cleared_at > cdd.evaluated_at)
+            )
+          )
+        ORDER BY u.id
+        LIMIT {p}
+    """, (last_id, current_config_hash, today.isoformat(), limit))
+    return cursor.fetchall()
+
+def rate_customers(chunk_size=500, config=None):
+    """Re-rate customers whose risk inputs changed since the last run.
+
+    Customers are read in keyset-paginated chunks; each chunk costs two
+    grouped input queries, one array evaluation and one multi-row upsert.
+    Candidates whose inputs hash to the stored value only have evaluated_at
+    advanced. Returns counts of evaluated, updated and per-rating results.
+    """
+    config = config or risk_config()
+    current_config_hash = config_hash(config)
+    today = date.today()
+    p = placeholder()
+    summary = Counter()
+    last_id = 0
+
+    while True:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            # Take the watermark before reading so changes made during the run are seen next time
+            cursor.execute("SELECT CURRENT_TIMESTAMP AS now")
+            run_started = cursor.fetchone()['now']
+
+            rows = _candidates(cursor, last_id, current_config_hash, today, chunk_size)
+            if not rows:
+                break
+            last_id = rows[-1]['id']
+
+            customers = [(row['id'], row['nationality'], row['investment']) for row in rows]
+            hits, documents = _load_inputs(cursor, [customer[0] for customer in customers])
+            hashes = [_input_hash(customer, hits, documents) for customer in customers]
+
+            changed, unchanged = [], []
+            for i, row in enumerate(rows):
+                due = row['next_review_date'] is not None and str(row['next_review_date'])[:10] <= today.isoformat()
+                if row['input_hash'] != hashes[i] or row['config_hash'] != current_config_hash or due:
+                    changed.append(i)
+                else:
+                    unchanged.append(row['id'])
+
+            if changed:
+                selected = [customers[i] for i in changed]
+                ratings, factors, is_pep = evaluate_chunk(selected, hits, documents, config)
+                upserts = []
+                for j, i in enumerate(changed):
+                    frequency = MONITORING_FREQUENCY[ratings[j]]
+                    upserts.append((
+                        customers[i][0],
+                        'enhanced' if ratings[j] in (RiskRating.HIGH.value, RiskRating.PROHIBITED.value) or is_pep[j] else
+                        'simplified' if ratings[j] == RiskRating.LOW.value else 'standard',
+                        is_pep[j], ratings[j], json.dumps(factors[j]),
+                        today.isoformat(), add_months(today, REVIEW_MONTHS[frequency]).isoformat(), frequency,
+                        hashes[i], current_config_hash, run_started
+                    ))
+                    summary[ratings[j]] += 1
+
+                updates = ', '.join(f'{column} = EXCLUDED.{column}' for column in CDD_COLUMNS[1:])
+                insert_many(cursor, 'customer_due_diligence', CDD_COLUMNS, upserts,
+                            on_conflict=f'ON CONFLICT (user_id) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP')
+
+            if unchanged:
+                # Touched but not materially changed (e.g. profile saved with the same values)
+                clause, params = any_clause('user_id', unchanged)
+                cursor.execute(f"""
+                    UPDATE customer_due_diligence
+                    SET evaluated_at = {p}
+                    WHERE {clause}
+                """, [run_started] + params)
+
+            summary['evaluated'] += len(rows)
+            summary['updated'] += len(changed)
+
+        if len(rows) < chunk_size:
+            break
+
+    logger.info(f"Risk rating: {summary['evaluated']} evaluated, {summary['updated']} updated")
+    return dict(summary)
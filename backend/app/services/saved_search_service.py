@@ -0,0 +1,237 @@
+# backend/app/services/saved_search_service.py
+from app.database import any_clause, get_db_connection, insert_many, placeholder
+from app.services.email_service import build_search_digest_email, queue_emails
+from app.utils.serializers import Field, boolean, money_or_none, row_encoder, timestamp
+
+# Maximum saved searches per investor
+MAX_SEARCHES = 20
+
+# Filters a saved search can hold, mirroring GET /api/properties
+SEARCH_FILTERS = ('min_price', 'max_price', 'city', 'property_type', 'strategy')
+
+encode_saved_search = row_encoder({
+    'id': 'id',
+    'name': 'name',
+    'filters': {
+        'min_price': Field('min_price', money_or_none),
+        'max_price': Field('max_price', money_or_none),
+        'city': lambda row: row['city'] or None,
+        'property_type': lambda row: row['property_type'] or None,
+        'strategy': lambda row: row['strategy'] or None,
+    },
+    'notify_email': Field('notify_email', boolean),
+    'created_at': Field('created_at', timestamp),
+})
+
+encode_match = row_encoder({
+    'id': 'id',
+    'search_id': 'search_id',
+    'search_name': 'search_name',
+    'property_id': 'property_id',
+    'matched_at': Field('matched_at', timestamp),
+    'read': lambda row: row['read_at'] is not None,
+})
+
+def normalize_city(city):
+    """Saved searches match cities case-insensitively on the whole name."""
+    return (city or '').strip().lower()
+
+def parse_search(data):
+    """Validate a saved search payload into column values. Raises ValueError."""
+    search = {'name': (data.get('name') or '').strip()[:100] or None}
+    for field in ('min_price', 'max_price'):
+        value = data.get(field)
+        if value in (None, ''):
+            search[field] = None
+            continue
+        try:
+            search[field] = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'{field} must be a number')
+        if search[field] < 0:
+            raise ValueError(f'{field} must not be negative')
+    if search['min_price'] and search['max_price'] and search['min_price'] > search['max_price']:
+        raise ValueError('min_price must not exceed max_price')
+
+    search['city'] = normalize_city(data.get('city'))[:100]
+    search['property_type'] = (data.get('property_type') or '').strip()[:50]
+    search['strategy'] = (data.get('strategy') or '').strip()[:50]
+    if not any(search[field] for field in SEARCH_FILTERS):
+        raise ValueError('A saved search needs at least one filter')
+    search['notify_email'] = bool(data.get('notify_email', True))
+    return search
+
+def create_saved_search(cursor, user_id, data):
+    """Store a saved search for an investor. Returns its id. Raises ValueError."""
+    search = parse_search(data)
+    p = placeholder()
+
+    cursor.execute(f"SELECT COUNT(*) as total FROM saved_searches WHERE user_id = {p} AND is_active = TRUE", (user_id,))
+    if cursor.fetchone()['total'] >= MAX_SEARCHES:
+        raise ValueError(f'At most {MAX_SEARCHES} saved searches per investor')
+
+    cursor.execute(f"""
+        INSERT INTO saved_searches (user_id, name, min_price, max_price, city, property_type, strategy, notify_email)
+        VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p}, {p})
+        RETURNING id
+    """, (user_id, search['name'], search['min_price'] or 0, search['max_price'],
+          search['city'], search['property_type'], search['strategy'], search['notify_email']))
+    return cursor.fetchone()['id']
+
+def list_saved_searches(cursor, user_id):
+    cursor.execute(f"""
+        SELECT id, name, min_price, max_price, city, property_type, strategy, notify_email, created_at
+        FROM saved_searches
+        WHERE user_id = {placeholder()} AND is_active = TRUE
+        ORDER BY created_at DESC, id DESC
+    """, (user_id,))
+    return [encode_saved_search(row) for row in cursor.fetchall()]
+
+def delete_saved_search(cursor, user_id, search_id):
+    """Deactivate one of an investor's searches. Returns False if it is not theirs."""
+    p = placeholder()
+    cursor.execute(f"""
+        UPDATE saved_searches
+        SET is_active = FALSE, updated_at = CURRENT_TIMESTAMP
+        WHERE id = {p} AND user_id = {p} AND is_active = TRUE
+    """, (search_id, user_id))
+    return cursor.rowcount > 0
+
+def match_published_property(cursor, property_id):
+    """Record a newly published deal against every saved search it satisfies.
+
+    The deal's own city/type/strategy and the '' wildcard are looked up on
+    idx_saved_searches_match (at most eight index ranges), so the cost
+    follows the number of candidate searches rather than all searches.
+    Returns the number of new matches.
+    """
+    p = placeholder()
+    cursor.execute(f"""
+        SELECT p.city, p.property_type, p.asking_price, dp.strategy
+        FROM properties p
+        JOIN deal_packages dp ON p.id = dp.property_id
+        WHERE p.id = {p} AND p.published = TRUE AND dp.published = TRUE
+    """, (property_id,))
+    deal = cursor.fetchone()
+    if not deal:
+        return 0
+
+    price = float(deal['asking_price'] or 0)
+    property_types, type_params = any_clause('property_type', [deal['property_type'] or '', ''])
+    strategies, strategy_params = any_clause('strategy', [deal['strategy'] or '', ''])
+    cities, city_params = any_clause('city', [normalize_city(deal['city']), ''])
+    cursor.execute(f"""
+        SELECT id, user_id
+        FROM saved_searches
+        WHERE is_active = TRUE
+          AND {property_types} AND {strategies} AND {cities}
+          AND min_price <= {p}
+          AND (max_price IS NULL OR max_price >= {p})
+    """, type_params + strategy_params + city_params + [price, price])
+    searches = cursor.fetchall()
+
+    conflict = 'ON CONFLICT (search_id, property_id) DO NOTHING'
+    insert_many(cursor, 'saved_search_matches', ['search_id', 'user_id', 'property_id'],
+                [(search['id'], search['user_id'], property_id) for search in searches],
+                on_conflict=conflict)
+    return len(searches)
+
+def list_matches(cursor, user_id, unread_only=False, limit=50):
+    """An investor's in-app digest of deals matching their saved searches, newest first."""
+    p = placeholder()
+    cursor.execute(f"""
+        SELECT m.id, m.search_id, s.name as search_name, m.property_id, m.matched_at, m.read_at
+        FROM saved_search_matches m
+        JOIN saved_searches s ON s.id = m.search_id
+        WHERE m.user_id = {p} {'AND m.read_at IS NULL' if unread_only else ''}
+        ORDER BY m.matched_at DESC, m.id DESC
+        LIMIT {p}
+    """, (user_id, limit))
+    return [encode_match(row) for row in cursor.fetchall()]
+
+def mark_matches_read(cursor, user_id, match_ids=None):
+    """Mark some (or all) of an investor's matches as read. Returns the number updated."""
+    p = placeholder()
+    query = f"UPDATE saved_search_matches SET read_at = CURRENT_TIMESTAMP WHERE user_id = {p} AND read_at IS NULL"
+    params = [user_id]
+    if match_ids is not None:
+        if not match_ids:
+            return 0
+        clause, clause_params = any_clause('id', match_ids)
+        query += f" AND {clause}"
+        params += clause_params
+    cursor.execute(query, params)
+    return cursor.rowcount
+
+def send_search_digests(batch_size=200):
+    """Queue one digest email per investor covering all their undigested matches.
+
+    Investors are processed batch_size at a time, each batch in its own
+    transaction. Matches of searches with email turned off (or of deals
+    unpublished, searches or accounts deleted since) are marked digested
+    without an email. A property with several published packages is shown
+    with the newest, as on the listing feed.
+    Returns (emails queued, matches digested).
+    """
+    p = placeholder()
+    emails = digested = 0
+    last_user_id = 0
+    while True:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT DISTINCT user_id
+                FROM saved_search_matches
+                WHERE digested_at IS NULL AND user_id > {p}
+                ORDER BY user_id
+                LIMIT {p}
+            """, (last_user_id, batch_size))
+            user_ids = [row['user_id'] for row in cursor.fetchall()]
+            if not user_ids:
+                break
+            last_user_id = user_ids[-1]
+
+            clause, params = any_clause('m.user_id', user_ids)
+            cursor.execute(f"""
+                SELECT m.id, m.user_id, s.name as search_name, s.notify_email,
+                       u.email, u.full_name, u.language_preference,
+                       dp.title_en, dp.title_ar, p.city, p.asking_price, p.published
+                FROM saved_search_matches m
+                LEFT JOIN saved_searches s ON s.id = m.search_id
+                LEFT JOIN users u ON u.id = m.user_id
+                LEFT JOIN properties p ON p.id = m.property_id
+                LEFT JOIN deal_packages dp ON dp.id = (
+                    SELECT MAX(id) FROM deal_packages WHERE property_id = p.id AND published = TRUE
+                )
+                WHERE m.digested_at IS NULL AND {clause}
+                ORDER BY m.user_id, m.id
+            """, params)
+            rows = cursor.fetchall()
+
+            by_user = {}
+            for row in rows:
+                if row['email'] and row['notify_email'] and row['published'] and row['title_en']:
+                    by_user.setdefault(row['user_id'], []).append(row)
+
+            messages = []
+            for user_rows in by_user.values():
+                first = user_rows[0]
+                language = first['language_preference'] or 'en'
+                deals = [
+                    ((row['title_ar'] if language == 'ar' and row['title_ar'] else row['title_en']),
+                     row['city'], row['asking_price'], row['search_name'] or '')
+                    for row in user_rows
+                ]
+                subject, body = build_search_digest_email(first['full_name'], deals, language)
+                messages.append(('saved_search_digest', first['email'], subject, body))
+            queue_emails(cursor, messages)
+
+            if rows:
+                clause, params = any_clause('id', [row['id'] for row in rows])
+                cursor.execute(f"UPDATE saved_search_matches SET digested_at = CURRENT_TIMESTAMP WHERE {clause}", params)
+
+            emails += len(messages)
+            digested += len(rows)
+        if len(user_ids) < batch_size:
+            break
+    return emails, digested
@@ -0,0 +1,565 @@
+# backend/app/services/screening_service.py
+import csv
+import io
+import json
+import logging
+import os
+import re
+import unicodedata
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+from flask import current_app
+from app.database import get_db_connection, insert_many, placeholder
+from app.models.compliance import SanctionsCheck
+from app.services.report_service import record_compliance_events
+
+logger = logging.getLogger(__name__)
+
+# Common romanisations of Arabic names, folded onto one canonical spelling
+NAME_EQUIVALENTS = {
+    'muhammad': ['mohammed', 'mohammad', 'mohamed', 'mohamad', 'muhammed', 'muhamed', 'mohd', 'mhmd', 'mehmet'],
+    'ahmad': ['ahmed', 'ahmet', 'ahmd'],
+    'abd': ['abdul', 'abdel', 'abdal', 'abdol', 'abdoul'],
+    'abdullah': ['abdallah', 'abdulla', 'abdalla', 'abdellah'],
+    'abu': ['abou', 'abo'],
+    'husayn': ['hussein', 'husein', 'hussain', 'husain', 'hossein', 'hosein'],
+    'hasan': ['hassan', 'hasen'],
+    'usama': ['osama', 'usamah', 'osamah'],
+    'yusuf': ['youssef', 'yousef', 'yusef', 'yousif', 'youssif', 'yousuf'],
+    'umar': ['omar', 'omer'],
+    'uthman': ['othman', 'osman', 'usman', 'othmane'],
+    'khalid': ['khaled'],
+    'mahmud': ['mahmoud', 'mahmood'],
+    'mustafa': ['mostafa', 'moustafa', 'mustapha'],
+    'ibrahim': ['ebrahim', 'ibraheem'],
+    'said': ['saeed', 'saied', 'sayed', 'sayyid', 'sayid'],
+    'qasim': ['kassem', 'qassem', 'kasim', 'qassim', 'kasem'],
+    'salih': ['saleh', 'salah'],
+    'jamal': ['gamal'],
+    'abdulrahman': ['abdelrahman', 'abdurrahman', 'abdalrahman', 'abdulrehman'],
+    'faisal': ['faysal', 'feisal'],
+    'jafar': ['jaafar', 'jaffar'],
+    'zayd': ['zaid', 'zeid', 'zayed'],
+    'aisha': ['aicha', 'ayesha', 'aysha'],
+    'fatima': ['fatma', 'fatimah'],
+}
+_CANONICAL = {variant: canonical for canonical, variants in NAME_EQUIVALENTS.items() for variant in variants}
+
+# Names and family-name stems commonly written with a fused article
+# ("alrashid", "elsayed"). The article is only split off when the rest is one
+# of these, so names like "Albert" or "Elliott" are left whole.
+FUSED_ARTICLE_NAMES = (
+    set(NAME_EQUIVALENTS) | set(_CANONICAL) | {
+        'rashid', 'rashidi', 'asad', 'assad', 'bashir', 'hakim', 'amin', 'amiri', 'hashimi', 'hashemi',
+        'masri', 'qahtani', 'zahrani', 'ghamdi', 'otaibi', 'harbi', 'shehhi', 'maktoum', 'nahyan',
+        'thani', 'saud', 'sabah', 'khalifa', 'baghdadi', 'zawahiri', 'tikriti', 'shami', 'najjar',
+        'haddad', 'khatib', 'qadhafi', 'gaddafi', 'mansour', 'mansur', 'jazeera', 'kuwaiti', 'sharif',
+        'hussaini', 'husseini', 'tamimi', 'dosari', 'mutairi', 'shammari', 'anazi', 'sudairi',
+    }
+)
+
+# Articles and patronymic particles carry little identifying signal
+STOP_TOKENS = {'al', 'el', 'ul', 'ad', 'ar', 'as', 'ash', 'at', 'az', 'bin', 'ibn', 'ben', 'bint', 'binti', 'mr', 'mrs', 'ms', 'dr'}
+
+ARABIC_TO_LATIN = {
+    'ا': 'a', 'أ': 'a', 'إ': 'i', 'آ': 'a', 'ٱ': 'a', 'ب': 'b', 'ت': 't', 'ث': 'th',
+    'ج': 'j', 'ح': 'h', 'خ': 'kh', 'د': 'd', 'ذ': 'dh', 'ر': 'r', 'ز': 'z', 'س': 's',
+    'ش': 'sh', 'ص': 's', 'ض': 'd', 'ط': 't', 'ظ': 'z', 'ع': '', 'غ': 'gh', 'ف': 'f',
+    'ق': 'q', 'ك': 'k', 'ل': 'l', 'م': 'm', 'ن': 'n', 'ه': 'h', 'ة': 'a', 'و': 'w',
+    'ي': 'y', 'ى': 'a', 'ء': '', 'ئ': 'y', 'ؤ': 'w', 'ـ': '',
+}
+
+_PHONETIC_CLASSES = {}
+for _letters, _code in (('bfpv', '1'), ('cgjkqsxz', '2'), ('dt', '3'), ('l', '4'), ('mn', '5'), ('r', '6')):
+    for _letter in _letters:
+        _PHONETIC_CLASSES[_letter] = _code
+
+def transliterate(text):
+    """Romanise Arabic script; other characters pass through unchanged."""
+    return ''.join(ARABIC_TO_LATIN.get(char, char) for char in text)
+
+def normalize_name(name):
+    """Lowercase, strip accents and punctuation, and fold spelling variants.
+
+    Returns the list of significant tokens.
+    """
+    if not name:
+        return []
+    text = unicodedata.normalize('NFKD', transliterate(name))
+    text = ''.join(char for char in text if not unicodedata.combining(char)).lower()
+    text = re.sub(r"['`’]", '', text)
+    text = re.sub(r'[^a-z0-9]+', ' ', text)
+
+    tokens = []
+    for token in text.split():
+        # Split fused articles such as "alrashid" only when the rest is a known name
+        if token.startswith(('al', 'el')) and token not in _CANONICAL and token[2:] in FUSED_ARTICLE_NAMES:
+            token = token[2:]
+        token = _CANONICAL.get(token, token)
+        if token not in STOP_TOKENS:
+            tokens.append(token)
+    return tokens
+
+def phonetic_key(token):
+    """Soundex-style consonant skeleton, tolerant of vowel-less romanisations."""
+    if not token:
+        return ''
+    first = token[0]
+    if first in 'aeiouy':
+        first = 'a'
+    elif first in _PHONETIC_CLASSES:
+        first = {'c': 'k', 'q': 'k', 'z': 's', 'v': 'f', 'p': 'b'}.get(first, first)
+    digits = []
+    previous = _PHONETIC_CLASSES.get(token[0], '')
+    for char in token[1:]:
+        code = _PHONETIC_CLASSES.get(char)
+        # Vowels do not separate repeated consonants, so "mhmd" and "muhammad" agree
+        if code and code != previous:
+            digits.append(code)
+            previous = code
+    return first + ''.join(digits)[:4]
+
+def trigrams(text):
+    """Character trigrams of a padded string."""
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def jaro_winkler(a, b, prefix_scale=0.1):
+    """Jaro-Winkler similarity between two strings (0..1)."""
+    if a == b:
+        return 1.0
+    len_a, len_b = len(a), len(b)
+    if not len_a or not len_b:
+        return 0.0
+
+    window = max(max(len_a, len_b) // 2 - 1, 0)
+    matched_a = [False] * len_a
+    matched_b = [False] * len_b
+    matches = 0
+    for i, char in enumerate(a):
+        for j in range(max(0, i - window), min(i + window + 1, len_b)):
+            if not matched_b[j] and b[j] == char:
+                matched_a[i] = matched_b[j] = True
+                matches += 1
+                break
+    if not matches:
+        return 0.0
+
+    transpositions = 0
+    j = 0
+    for i in range(len_a):
+        if matched_a[i]:
+            while not matched_b[j]:
+                j += 1
+            if a[i] != b[j]:
+                transpositions += 1
+            j += 1
+
+    jaro = (matches / len_a + matches / len_b + (matches - transpositions / 2) / matches) / 3
+    prefix = 0
+    for char_a, char_b in zip(a[:4], b[:4]):
+        if char_a != char_b:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+def _token_score(token, other, phonetic, other_phonetic):
+    score = jaro_winkler(token, other)
+    # Same consonant skeleton (e.g. "mhmd"/"muhammad") counts as a strong match
+    if phonetic == other_phonetic and len(phonetic) >= 3:
+        score = max(score, 0.9)
+    return score
+
+def name_similarity(tokens_a, tokens_b):
+    """Order-insensitive token-set similarity using Jaro-Winkler per token."""
+    if not tokens_a or not tokens_b:
+        return 0.0
+    keys_a = [phonetic_key(token) for token in tokens_a]
+    keys_b = [phonetic_key(token) for token in tokens_b]
+
+    def directed(tokens, keys, others, other_keys):
+        return sum(
+            max(_token_score(token, other, key, other_key) for other, other_key in zip(others, other_keys))
+            for token, key in zip(tokens, keys)
+        ) / len(tokens)
+
+    forward = directed(tokens_a, keys_a, tokens_b, keys_b)
+    backward = directed(tokens_b, keys_b, tokens_a, keys_a)
+    # Weight toward the shorter name so a missing middle name is not over-penalised
+    return 0.6 * max(forward, backward) + 0.4 * min(forward, backward)
+
+def parse_date(value):
+    """Parse list dates such as 01/02/1960, 00/00/1960 or 1960-02-01.
+
+    Returns (year, month, day) with unknown parts as None.
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.year, value.month, value.day
+    value = str(value).strip()
+    match = re.match(r'^(\d{1,2})/(\d{1,2})/(\d{4})$', value)
+    if match:
+        day, month, year = (int(part) for part in match.groups())
+    else:
+        match = re.match(r'^(\d{4})(?:-(\d{1,2}))?(?:-(\d{1,2}))?', value)
+        if not match:
+            return None
+        year, month, day = (int(part) if part else 0 for part in match.groups())
+    return year or None, month or None, day or None
+
+@dataclass
+class WatchlistEntry:
+    entry_id: str
+    list_name: str
+    list_type: str  # 'sanctions' or 'pep'
+    names: List[str] = field(default_factory=list)
+    entity_type: Optional[str] = None
+    dates_of_birth: List[str] = field(default_factory=list)
+    nationalities: List[str] = field(default_factory=list)
+    regime: Optional[str] = None
+
+    def fingerprint(self):
+        """Stable digest of the screening-relevant fields."""
+        return json.dumps([
+            sorted(set(self.names)), sorted(set(self.dates_of_birth)),
+            sorted(set(self.nationalities)), self.entity_type, self.regime
+        ], sort_keys=True)
+
+@dataclass
+class ScreeningMatch:
+    entry: WatchlistEntry
+    matched_name: str
+    score: float
+
+    def to_dict(self):
+        return {
+            'entry_id': self.entry.entry_id,
+            'list_name': self.entry.list_name,
+            'list_type': self.entry.list_type,
+            'matched_name': self.matched_name,
+            'primary_name': self.entry.names[0] if self.entry.names else None,
+            'regime': self.entry.regime,
+            'score': round(self.score, 4)
+        }
+
+def _read_text(source):
+    if isinstance(source, str):
+        return open(source, encoding='utf-8-sig', newline='')
+    return io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+
+def load_ofsi_csv(source, list_name='OFSI'):
+    """Load the UK OFSI consolidated list CSV, grouping alias rows by Group ID."""
+    entries = {}
+    with _read_text(source) as handle:
+        first = handle.readline()
+        if not first.lower().startswith('last updated'):
+            handle.seek(0)
+        for row in csv.DictReader(handle):
+            group_id = (row.get('Group ID') or '').strip()
+            if not group_id:
+                continue
+            entry = entries.get(group_id)
+            if entry is None:
+                entry = entries[group_id] = WatchlistEntry(
+                    entry_id=group_id,
+                    list_name=list_name,
+                    list_type='sanctions',
+                    entity_type=(row.get('Group Type') or '').strip() or None,
+                    regime=(row.get('Regime') or '').strip() or None
+                )
+
+            parts = [(row.get(f'Name {i}') or '').strip() for i in range(1, 6)]
+            full_name = ' '.join(part for part in parts + [(row.get('Name 6') or '').strip()] if part)
+            if full_name and full_name not in entry.names:
+                entry.names.append(full_name)
+            non_latin = (row.get('Name Non-Latin Script') or '').strip()
+            if non_latin and non_latin not in entry.names:
+                entry.names.append(non_latin)
+
+            dob = (row.get('DOB') or '').strip()
+            if dob and dob not in entry.dates_of_birth:
+                entry.dates_of_birth.append(dob)
+            nationality = (row.get('Nationality') or '').strip()
+            if nationality and nationality not in entry.nationalities:
+                entry.nationalities.append(nationality)
+    return list(entries.values())
+
+def load_pep_csv(source, list_name='PEP'):
+    """Load a PEP list with name, aliases (';'-separated), dob and nationality columns."""
+    entries = []
+    with _read_text(source) as handle:
+        for index, row in enumerate(csv.DictReader(handle), start=1):
+            name = (row.get('name') or '').strip()
+            if not name:
+                continue
+            aliases = [alias.strip() for alias in (row.get('aliases') or '').split(';') if alias.strip()]
+            entries.append(WatchlistEntry(
+                entry_id=(row.get('id') or '').strip() or str(index),
+                list_name=list_name,
+                list_type='pep',
+                names=[name] + aliases,
+                entity_type='Individual',
+                dates_of_birth=[row['dob'].strip()] if (row.get('dob') or '').strip() else [],
+                nationalities=[row['nationality'].strip()] if (row.get('nationality') or '').strip() else [],
+                regime=(row.get('position') or '').strip() or None
+            ))
+    return entries
+
+def load_list(path, list_name):
+    """Load a list file, detecting the OFSI format from its header."""
+    with open(path, encoding='utf-8-sig') as handle:
+        head = handle.read(4096)
+    if 'Group ID' in head or head.lower().startswith('last updated'):
+        return load_ofsi_csv(path, list_name)
+    return load_pep_csv(path, list_name)
+
+class ScreeningIndex:
+    """In-memory fuzzy name index: trigram and phonetic candidate retrieval,
+    Jaro-Winkler re-ranking, DOB/nationality adjustment.
+
+    Records can be watchlist entries (screen a customer against lists) or
+    customers (screen list changes against the customer base).
+    """
+
+    # Trigrams shared by more than this fraction of names are not used for retrieval
+    MAX_TRIGRAM_FREQUENCY = 0.05
+
+    def __init__(self, records=()):
+        self.records = []
+        self._names = []  # (record index, original name, tokens)
+        self._trigram_postings = defaultdict(list)
+        self._phonetic_postings = defaultdict(list)
+        for record in records:
+            self.add(record)
+
+    def add(self, record, names=None):
+        """Index a record under each of its names."""
+        record_index = len(self.records)
+        self.records.append(record)
+        for name in names if names is not None else record.names:
+            tokens = normalize_name(name)
+            if not tokens:
+                continue
+            name_index = len(self._names)
+            self._names.append((record_index, name, tokens))
+            for gram in trigrams(' '.join(sorted(tokens))):
+                self._trigram_postings[gram].append(name_index)
+            for key in {phonetic_key(token) for token in tokens}:
+                self._phonetic_postings[key].append(name_index)
+
+    def __len__(self):
+        return len(self.records)
+
+    def _candidates(self, tokens):
+        grams = trigrams(' '.join(sorted(tokens)))
+        limit = max(50, int(len(self._names) * self.MAX_TRIGRAM_FREQUENCY))
+        counts = Counter()
+        for gram in grams:
+            postings = self._trigram_postings.get(gram)
+            if postings and len(postings) <= limit:
+                counts.update(postings)
+        minimum = max(1, int(len(grams) * 0.3))
+        candidates = {name_index for name_index, count in counts.items() if count >= minimum}
+
+        # Phonetic postings catch vowel-less and heavily re-spelled romanisations
+        keys = Counter()
+        for key in {phonetic_key(token) for token in tokens}:
+            keys.update(self._phonetic_postings.get(key, ()))
+        needed = max(1, (len(tokens) + 1) // 2)
+        candidates.update(name_index for name_index, count in keys.items() if count >= needed)
+        return candidates
+
+    def search(self, name, date_of_birth=None, nationality=None, threshold=0.85, limit=10):
+        """Return the best match per record scoring at least threshold, best first."""
+        tokens = normalize_name(name)
+        if not tokens:
+            return []
+
+        dob = parse_date(date_of_birth)
+        nationality = (nationality or '').strip().lower()
+        best = {}
+
+        for name_index in self._candidates(tokens):
+            record_index, candidate_name, candidate_tokens = self._names[name_index]
+            score = name_similarity(tokens, candidate_tokens)
+            if score < threshold - 0.15:
+                continue
+            score = self._adjust(score, self.records[record_index], dob, nationality)
+            if score >= threshold and score > best.get(record_index, (0, None))[0]:
+                best[record_index] = (score, candidate_name)
+
+        matches = [
+            ScreeningMatch(self.records[record_index], candidate_name, min(score, 1.0))
+            for record_index, (score, candidate_name) in best.items()
+        ]
+        matches.sort(key=lambda match: match.score, reverse=True)
+        return matches[:limit]
+
+    def _adjust(self, score, record, dob, nationality):
+        """Raise or lower a name score using date of birth and nationality."""
+        record_dobs = [parse_date(value) for value in getattr(record, 'dates_of_birth', [])]
+        record_dobs = [value for value in record_dobs if value and value[0]]
+        if dob and dob[0] and record_dobs:
+            if any(value == dob for value in record_dobs):
+                score += 0.08
+            elif any(value[0] == dob[0] for value in record_dobs):
+                score += 0.03
+            elif any(abs(value[0] - dob[0]) <= 1 for value in record_dobs):
+                pass
+            else:
+                score -= 0.15
+
+        record_nationalities = [value.lower() for value in getattr(record, 'nationalities', [])]
+        if nationality and record_nationalities:
+            if any(nationality in value or value in nationality for value in record_nationalities):
+                score += 0.02
+            else:
+                score -= 0.05
+        return score
+
+_index = None
+
+def configured_lists():
+    """Parse SANCTIONS_LISTS (comma-separated name=path pairs) into (name, path) tuples."""
+    lists = []
+    for item in current_app.config.get('SANCTIONS_LISTS', '').split(','):
+        list_name, _, path = item.strip().partition('=')
+        if list_name and path:
+            lists.append((list_name.strip(), path.strip()))
+    return lists
+
+def get_screening_index(reload=False):
+    """Build (once per process) the index over the configured lists."""
+    global _index
+    if _index is None or reload:
+        entries = []
+        for list_name, path in configured_lists():
+            entries.extend(load_list(path, list_name))
+        _index = ScreeningIndex(entries)
+        logger.info(f"Screening index built with {len(entries)} list entries")
+    return _index
+
+def build_sanctions_check(matches, name, user_id=None, date_of_birth=None, nationality=None):
+    """Summarise screening matches as a SanctionsCheck."""
+    now = datetime.utcnow()
+    sanctions = [match for match in matches if match.entry.list_type == 'sanctions']
+    peps = [match for match in matches if match.entry.list_type == 'pep']
+    dob = parse_date(date_of_birth)
+    return SanctionsCheck(
+        user_id=user_id,
+        check_name=name,
+        date_of_birth=datetime(*dob) if dob and all(dob) else None,
+        nationality=nationality,
+        sanctions_match=bool(sanctions),
+        pep_match=bool(peps),
+        matched_sanctions_lists=sorted({match.entry.list_name for match in matches}),
+        match_confidence=round(matches[0].score, 4) if matches else 0.0,
+        match_details=json.dumps([match.to_dict() for match in matches]),
+        provider_reference='local',
+        performed_at=now
+    )
+
+SANCTIONS_CHECK_COLUMNS = [
+    'user_id', 'check_name', 'date_of_birth', 'nationality', 'sanctions_match',
+    'pep_match', 'adverse_media_match', 'matched_sanctions_lists', 'match_confidence',
+    'match_details', 'cleared', 'provider_reference', 'performed_at'
+]
+
+def save_sanctions_checks(cursor, checks: List[SanctionsCheck]):
+    """Persist SanctionsCheck rows with one multi-row insert."""
+    insert_many(cursor, 'sanctions_checks', SANCTIONS_CHECK_COLUMNS, [(
+        check.user_id, check.check_name, check.date_of_birth, check.nationality,
+        check.sanctions_match, check.pep_match, check.adverse_media_match,
+        json.dumps(check.matched_sanctions_lists), check.match_confidence,
+        check.match_details, check.cleared, check.provider_reference, check.performed_at
+    ) for check in checks])
+    record_compliance_events(cursor, {
+        'sanctions_checks_performed': len(checks),
+        'sanctions_matches': sum(1 for check in checks if check.sanctions_match),
+        'pep_matches': sum(1 for check in checks if check.pep_match)
+    })
+
+def screen_name(name, date_of_birth=None, nationality=None, user_id=None, persist=False):
+    """Screen one name against the loaded lists. Returns (check, matches)."""
+    threshold = current_app.config.get('SCREENING_MATCH_THRESHOLD', 0.88)
+    matches = get_screening_index().search(name, date_of_birth, nationality, threshold=threshold)
+    check = build_sanctions_check(matches, name, user_id, date_of_birth, nationality)
+
+    if persist:
+        with get_db_connection() as conn:
+            save_sanctions_checks(conn.cursor(), [check])
+    return check, matches
+
+# Worker-process state for parallel batch screening
+_worker_index = None
+_worker_threshold = None
+
+def _init_worker(index, threshold):
+    global _worker_index, _worker_threshold
+    _worker_index, _worker_threshold = index, threshold
+
+def _screen_chunk(customers):
+    """Screen (user_id, full_name, nationality) tuples inside a worker process."""
+    checks = []
+    for user_id, full_name, nationality in customers:
+        matches = _worker_index.search(full_name, nationality=nationality, threshold=_worker_threshold)
+        checks.append(build_sanctions_check(matches, full_name, user_id, nationality=nationality))
+    return checks
+
+def _iter_customer_chunks(chunk_size):
+    """Yield users in keyset-paginated chunks so no cursor stays open between pages."""
+    p = placeholder()
+    last_id = 0
+    while True:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT u.id, u.full_name, ip.nationality
+                FROM users u
+                LEFT JOIN investor_profiles ip ON u.id = ip.user_id
+                WHERE u.id > {p}
+                ORDER BY u.id
+                LIMIT {p}
+            """, (last_id, chunk_size))
+            rows = cursor.fetchall()
+        if not rows:
+            return
+        last_id = rows[-1]['id']
+        yield [(row['id'], row['full_name'], row['nationality']) for row in rows]
+
+def screen_all_users(workers=None, chunk_size=500):
+    """Screen every user against the lists across a process pool.
+
+    Users are read in chunks, screened in parallel with a bounded number of
+    chunks in flight, and persisted as sanctions_checks rows. Returns
+    (screened, flagged) counts.
+    """
+    index = get_screening_index()
+    threshold = current_app.config.get('SCREENING_MATCH_THRESHOLD', 0.88)
+    workers = workers or current_app.config.get('SCREENING_WORKERS') or os.cpu_count() or 1
+    screened = flagged = 0
+
+    def save(checks):
+        with get_db_connection() as conn:
+            save_sanctions_checks(conn.cursor(), checks)
+        return len(checks), sum(1 for check in checks if check.sanctions_match or check.pep_match)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(index, threshold)) as pool:
+        in_flight = deque()
+        for chunk in _iter_customer_chunks(chunk_size):
+            in_flight.append(pool.submit(_screen_chunk, chunk))
+            if len(in_flight) >= workers * 2:
+                done, hits = save(in_flight.popleft().result())
+                screened += done
+                flagged += hits
+        while in_flight:
+            done, hits = save(in_flight.popleft().result())
+            screened += done
+            flagged += hits
+
+    return screened, flagged
@@ -0,0 +1,225 @@
+# backend/app/utils/cache.py
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from app.utils.json_provider import default as json_default
+
+logger = logging.getLogger(__name__)
+
+class TTLCache:
+    """Thread-safe in-process cache with per-entry expiry and LRU eviction.
+
+    Entries live in the worker process only, so each gunicorn worker keeps its
+    own copy; keep TTLs short for data that other workers can change.
+    """
+
+    def __init__(self, ttl=30, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return a live entry, refreshing its LRU position."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Store a value, evicting the least recently used entries when full."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Drop a single entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_where(self, predicate):
+        """Drop every entry whose key matches predicate(key)."""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class LocalRedis:
+    """In-process stand-in for the subset of the Redis API TwoTierCache uses.
+
+    Used when REDIS_URL is not set (development, tests, single-process runs).
+    Values are bytes, like redis-py without decode_responses.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key):
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] < time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key)
+            return entry[0] if entry else None
+
+    def set(self, key, value, ex=None, nx=False):
+        with self._lock:
+            if nx and self._live(key) is not None:
+                return None
+            if isinstance(value, str):
+                value = value.encode('utf-8')
+            self._data[key] = (value, time.monotonic() + ex if ex else None)
+            return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def flushdb(self):
+        with self._lock:
+            self._data.clear()
+
+def redis_client(url):
+    """A redis-py client for `url`, or a LocalRedis when no URL is configured."""
+    if not url:
+        return LocalRedis()
+    import redis
+    return redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+class TwoTierCache:
+    """Read-through cache: a per-process TTLCache in front of a shared Redis tier.
+
+    Entries are stored under `key` together with a `version` (anything that
+    changes when the underlying data does, e.g. an updated_at-derived ETag);
+    an entry whose version differs from the caller's is treated as a miss, so
+    stale copies held by other workers are never served. Concurrent misses for
+    the same key are collapsed: threads in one process wait on a shared lock,
+    and processes race for a short-lived Redis `SET NX` lock, the losers
+    polling the shared tier until the winner has filled it. Redis errors
+    degrade to the local tier instead of failing the request.
+    """
+
+    def __init__(self, namespace, ttl=300, local_ttl=60, max_entries=1024, lock_timeout=5.0, lock_wait=2.0):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.local = TTLCache(ttl=local_ttl, max_entries=max_entries)
+        self.lock_timeout = lock_timeout
+        self.lock_wait = lock_wait
+        self.redis = LocalRedis()
+        # Striped locks: bounded memory however many keys pass through
+        self._key_locks = [threading.Lock() for _ in range(64)]
+
+    def configure(self, redis=None, ttl=None, local_ttl=None, max_entries=None):
+        if redis is not None:
+            self.redis = redis
+        if ttl is not None:
+            self.ttl = ttl
+        if local_ttl is not None:
+            self.local.ttl = local_ttl
+        if max_entries is not None:
+            self.local.max_entries = max_entries
+
+    def _redis_key(self, key):
+        return f'{self.namespace}:{key}'
+
+    def _redis(self, method, *args, _fallback=None, **kwargs):
+        try:
+            return getattr(self.redis, method)(*args, **kwargs)
+        except Exception as e:
+            logger.warning('Cache tier unavailable (%s %s): %s', method, self.namespace, e)
+            return _fallback
+
+    def _load_shared(self, key, version):
+        raw = self._redis('get', self._redis_key(key))
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        if entry.get('version') != version:
+            return None
+        return entry['value']
+
+    def _store(self, key, version, value):
+        self.local.set(key, (version, value))
+        # Jitter the shared TTL so entries filled together do not all expire together
+        ttl = max(int(self.ttl * random.uniform(0.9, 1.1)), 1)
+        payload = json.dumps({'version': version, 'value': value}, default=json_default)
+        self._redis('set', self._redis_key(key), payload, ex=ttl)
+
+    def _key_lock(self, key):
+        return self._key_locks[hash(key) % len(self._key_locks)]
+
+    def get(self, key, version):
+        """The cached value for this version, or None."""
+        entry = self.local.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        value = self._load_shared(key, version)
+        if value is not None:
+            self.local.set(key, (version, value))
+        return value
+
+    def get_or_compute(self, key, version, compute):
+        """Return the cached value or build it with compute() (None results are not cached)."""
+        value = self.get(key, version)
+        if value is not None:
+            return value
+
+        with self._key_lock(key):
+            # Another thread may have filled it while we waited
+            value = self.get(key, version)
+            if value is not None:
+                return value
+
+            lock_key = self._redis_key(f'{key}:lock')
+            token = uuid.uuid4().hex
+            # An unreachable shared tier counts as holding the lock: nobody to wait for
+            acquired = self._redis('set', lock_key, token, ex=max(int(self.lock_timeout), 1), nx=True, _fallback=True)
+            if not acquired:
+                deadline = time.monotonic() + self.lock_wait
+                while time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    value = self._load_shared(key, version)
+                    if value is not None:
+                        self.local.set(key, (version, value))
+                        return value
+                # The holder is slow or gone; compute rather than keep waiting
+
+            try:
+                value = compute()
+                if value is not None:
+                    self._store(key, version, value)
+                return value
+            finally:
+                held = self._redis('get', lock_key)
+                if held is not None and (held.decode() if isinstance(held, bytes) else held) == token:
+                    self._redis('delete', lock_key)
+
+    def invalidate(self, key):
+        """Drop a key from this worker and the shared tier."""
+        self.local.delete(key)
+        self._redis('delete', self._redis_key(key))
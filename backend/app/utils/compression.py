@@ -0,0 +1,66 @@
+# backend/app/utils/compression.py
+import gzip
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript', 'image/svg+xml')
+
+def choose_encoding(accept_encodings):
+    """Pick 'br' or 'gzip' from the client's Accept-Encoding (None for identity)."""
+    if brotli is not None and accept_encodings.quality('br') > 0:
+        return 'br'
+    if accept_encodings.quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+def compress(data, encoding, config):
+    if encoding == 'br':
+        return brotli.compress(data, quality=config.get('BROTLI_QUALITY', 5))
+    return gzip.compress(data, compresslevel=config.get('GZIP_LEVEL', 6))
+
+def _is_compressible(response):
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if response.direct_passthrough or response.is_streamed:
+        return False
+    if 'Content-Encoding' in response.headers or 'Content-Range' in response.headers:
+        return False
+    return (response.mimetype or '').startswith(COMPRESSIBLE_TYPES)
+
+def init_compression(app):
+    """Compress buffered text/JSON responses above COMPRESSION_MIN_SIZE bytes.
+
+    Brotli is used when the client accepts it and the brotli package is
+    installed, gzip otherwise. Streamed responses (CSV/XLSX exports) are left
+    alone so they keep flushing rows as they are produced.
+    """
+    if not app.config.get('COMPRESSION_ENABLED', True):
+        return
+
+    min_size = app.config.get('COMPRESSION_MIN_SIZE', 1024)
+
+    @app.after_request
+    def compress_response(response):
+        if not _is_compressible(response):
+            return response
+
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        response.set_data(compress(data, encoding, app.config))
+        response.headers['Content-Encoding'] = encoding
+        # Strong validators describe the uncompressed bytes; weaken them
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
@@ -0,0 +1,90 @@
+# backend/app/utils/db_tracing.py
+import time
+from app.utils.metrics import record_query
+from app.utils.query_tracer import query_tracer
+
+class TracedCursor:
+    """Cursor proxy that times statements, charges them to the request and feeds the query tracer."""
+
+    def __init__(self, cursor, dialect=None):
+        self._cursor = cursor
+        self._dialect = dialect
+        self._slow_entry = None
+        self._count_fetched = False
+
+    def _traced(self, method, query, args, kwargs, many=False):
+        statement = query
+        if self._dialect is not None:
+            params = args[0] if args else kwargs.get('vars', kwargs.get('vars_list'))
+            statement = self._dialect.statement(self._cursor, query, params, many)
+        start = time.perf_counter()
+        try:
+            return method(statement, *args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            record_query(duration)
+            # Prepared statements are traced (and explained) as the original SQL
+            traced = query if self._dialect is not None and self._dialect.prepares else statement
+            self._slow_entry = query_tracer.record(
+                self._cursor, traced, args, duration, getattr(self._cursor, 'rowcount', -1)
+            )
+            # SQLite reports -1 for SELECTs; count rows as they are fetched instead
+            self._count_fetched = self._slow_entry is not None and self._slow_entry['rows'] is None
+
+    def execute(self, query, *args, **kwargs):
+        self._traced(self._cursor.execute, query, args, kwargs)
+        return self
+
+    def executemany(self, query, *args, **kwargs):
+        self._traced(self._cursor.executemany, query, args, kwargs, many=True)
+        return self
+
+    def _fetch_timed(self, method, *args):
+        # Fetches are database time too (server-side cursors, SQLite stepping)
+        # but do not count as extra statements
+        start = time.perf_counter()
+        try:
+            rows = method(*args)
+        finally:
+            record_query(time.perf_counter() - start, statements=0)
+        if self._count_fetched and rows is not None:
+            self._slow_entry['rows'] = (self._slow_entry['rows'] or 0) + (len(rows) if isinstance(rows, list) else 1)
+        return rows
+
+    def fetchone(self):
+        return self._fetch_timed(self._cursor.fetchone)
+
+    def fetchmany(self, size=None):
+        return self._fetch_timed(self._cursor.fetchmany, *(() if size is None else (size,)))
+
+    def fetchall(self):
+        return self._fetch_timed(self._cursor.fetchall)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+class TracedConnection:
+    """Connection proxy whose cursors are TracedCursors.
+
+    `dialect` (see app.utils.sql_dialect) rewrites each statement before it
+    runs: SQLite translation, or PostgreSQL prepared statements.
+    """
+
+    def __init__(self, conn, dialect=None):
+        self._conn = conn
+        self._dialect = dialect
+
+    def cursor(self, *args, **kwargs):
+        return TracedCursor(self._conn.cursor(*args, **kwargs), self._dialect)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
@@ -0,0 +1,28 @@
+# backend/app/utils/etags.py
+import hashlib
+from flask import current_app, request
+
+def weak_etag(*parts):
+    """Opaque validator built from version markers (timestamps, counts, query args)."""
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        value = part.isoformat() if hasattr(part, 'isoformat') else part
+        digest.update(str(value).encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()
+
+def client_has(etag):
+    """True when the request's If-None-Match already names this version."""
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return request.if_none_match.contains_weak(etag)
+
+def not_modified(etag, cache_control='private, no-cache'):
+    """A bodiless 304 carrying the validator, for clients that are up to date."""
+    response = current_app.response_class(status=304)
+    return with_etag(response, etag, cache_control)
+
+def with_etag(response, etag, cache_control='private, no-cache'):
+    """Attach a weak ETag and make clients revalidate before reusing the body."""
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = cache_control
+    return response
@@ -0,0 +1,190 @@
+# backend/app/utils/events.py
+import json
+import logging
+import os
+import queue
+import re
+import select
+import threading
+import time
+from app.utils.json_provider import default as json_default
+
+logger = logging.getLogger(__name__)
+
+class Subscription:
+    """One connected client: a bounded queue of events addressed to it.
+
+    A client that falls more than `max_queued` events behind is marked as
+    overflowed instead of growing the queue; the stream then tells it to
+    resync and closes.
+    """
+
+    def __init__(self, user_id, max_queued=100):
+        self.user_id = str(user_id)
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize=max_queued)
+
+    def deliver(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout):
+        """The next event, or None after `timeout` seconds without one."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class EventBus:
+    """In-process pub/sub fan-out for live updates, bridged across workers.
+
+    Against PostgreSQL, publish() issues pg_notify on the caller's cursor, so
+    an event is only sent if (and when) its transaction commits; each worker
+    runs one LISTEN connection, started on its first subscriber, and fans
+    notifications out to its own subscribers. Against SQLite (development,
+    single process) events go straight to this process's subscribers.
+
+    Events are {'type', 'data', 'user_id', 'at'}: user_id None is a broadcast
+    to every subscriber, otherwise only that user's connections receive it.
+    Delivery is best effort; clients refetch on (re)connect.
+    """
+
+    def __init__(self, channel='proptech_events', max_subscribers=5000, max_queued=100):
+        self.channel = channel
+        self.max_subscribers = max_subscribers
+        self.max_queued = max_queued
+        self.database_url = None
+        self._subscribers = {}
+        self._count = 0
+        self._lock = threading.Lock()
+        self._listener = None
+        self._listener_pid = None
+
+    def configure(self, database_url=None, channel=None, max_subscribers=None, max_queued=None):
+        if database_url is not None:
+            self.database_url = database_url
+        if channel is not None:
+            # LISTEN takes an identifier, not a bind parameter
+            if not re.fullmatch(r'[a-z_][a-z0-9_]*', channel):
+                raise ValueError(f'Invalid event channel name: {channel}')
+            self.channel = channel
+        if max_subscribers is not None:
+            self.max_subscribers = max_subscribers
+        if max_queued is not None:
+            self.max_queued = max_queued
+
+    @property
+    def uses_notify(self):
+        return bool(self.database_url) and not self.database_url.startswith('sqlite')
+
+    def publish(self, cursor, event_type, data, user_id=None):
+        """Publish one event as part of the cursor's transaction."""
+        self.publish_many(cursor, [(event_type, data, user_id)])
+
+    def publish_many(self, cursor, events):
+        """Publish (event_type, data, user_id) tuples with a single statement."""
+        now = time.time()
+        events = [
+            {'type': event_type, 'data': data, 'user_id': None if user_id is None else str(user_id), 'at': now}
+            for event_type, data, user_id in events
+        ]
+        if not events:
+            return
+        if not self.uses_notify:
+            for event in events:
+                self.dispatch(event)
+            return
+        payloads = [json.dumps(event, default=json_default) for event in events]
+        cursor.execute(
+            "SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload",
+            (self.channel, payloads)
+        )
+
+    def subscribe(self, user_id):
+        """Register a client. Returns None when this worker is at max_subscribers."""
+        subscription = Subscription(user_id, self.max_queued)
+        with self._lock:
+            if self._count >= self.max_subscribers:
+                return None
+            self._subscribers.setdefault(subscription.user_id, set()).add(subscription)
+            self._count += 1
+        self._ensure_listener()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id)
+            if subscriptions and subscription in subscriptions:
+                subscriptions.discard(subscription)
+                self._count -= 1
+                if not subscriptions:
+                    del self._subscribers[subscription.user_id]
+
+    def dispatch(self, event):
+        """Hand an event to this process's matching subscribers."""
+        with self._lock:
+            if event.get('user_id') is None:
+                targets = [s for subscriptions in self._subscribers.values() for s in subscriptions]
+            else:
+                targets = list(self._subscribers.get(event['user_id'], ()))
+        for subscription in targets:
+            subscription.deliver(event)
+
+    def stats(self):
+        with self._lock:
+            return {'subscribers': self._count, 'users': len(self._subscribers)}
+
+    def _ensure_listener(self):
+        # Started lazily in the serving process: threads do not survive fork
+        if not self.uses_notify:
+            return
+        with self._lock:
+            if self._listener_pid == os.getpid() and self._listener.is_alive():
+                return
+            self._listener_pid = os.getpid()
+            self._listener = threading.Thread(target=self._listen, name='event-bus-listener', daemon=True)
+            self._listener.start()
+
+    def _listen(self):
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(self.database_url)
+                conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN {self.channel}')
+                logger.info('Listening for events on %s', self.channel)
+                while True:
+                    # select() waits without holding a database round trip
+                    # open (and yields to other greenlets under gevent)
+                    if select.select([conn], [], [], 60) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notification = conn.notifies.pop(0)
+                        try:
+                            self.dispatch(json.loads(notification.payload))
+                        except ValueError:
+                            logger.warning('Dropping malformed event payload on %s', self.channel)
+            except Exception as e:
+                logger.warning('Event listener disconnected (%s); reconnecting', e)
+                time.sleep(5)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+event_bus = EventBus()
+
+def init_event_bus(app):
+    """Bridge the bus over LISTEN/NOTIFY on DATABASE_URL (in-process only on SQLite)."""
+    event_bus.configure(
+        database_url=app.config.get('DATABASE_URL'),
+        channel=app.config.get('EVENTS_CHANNEL'),
+        max_subscribers=app.config.get('EVENTS_MAX_SUBSCRIBERS'),
+        max_queued=app.config.get('EVENTS_QUEUE_SIZE')
+    )
@@ -0,0 +1,135 @@
+# backend/app/utils/metrics.py
+import threading
+import time
+from bisect import bisect_left
+from flask import Response, g, has_request_context, request
+
+# Histogram bucket upper bounds (Prometheus `le` labels); +Inf is implicit
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a label tuple."""
+
+    def __init__(self, name, help_text, labels, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+
+    def observe(self, label_values, value):
+        series = self._series.get(label_values)
+        if series is None:
+            # [per-bucket counts..., +Inf count, sum]
+            series = self._series.setdefault(label_values, [0] * (len(self.buckets) + 1) + [0.0])
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for label_values, series in sorted(self._series.items()):
+            labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, label_values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series[:-1]):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{labels}}} {series[-1]:.6f}')
+            lines.append(f'{self.name}_count{{{labels}}} {cumulative}')
+        return lines
+
+class Counter:
+    """Monotonic counter keyed by a label tuple."""
+
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._series = {}
+
+    def inc(self, label_values, amount=1):
+        self._series[label_values] = self._series.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for label_values, value in sorted(self._series.items()):
+            labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, label_values))
+            lines.append(f'{self.name}{{{labels}}} {value}')
+        return lines
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class RequestMetrics:
+    """Per-process request metrics. Each gunicorn worker exposes its own series."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        endpoint = ('endpoint', 'method')
+        self.requests = Counter('http_requests_total', 'Requests handled.', ('endpoint', 'method', 'status'))
+        self.latency = Histogram('http_request_duration_seconds', 'Wall-clock request latency.', endpoint, LATENCY_BUCKETS)
+        self.db_time = Histogram('http_request_db_seconds', 'Time spent in database calls per request.', endpoint, LATENCY_BUCKETS)
+        self.python_time = Histogram('http_request_python_seconds', 'Request time outside database calls.', endpoint, LATENCY_BUCKETS)
+        self.queries = Histogram('http_request_queries', 'Database statements executed per request.', endpoint, QUERY_BUCKETS)
+        self.response_size = Histogram('http_response_size_bytes', 'Response body size.', endpoint, SIZE_BUCKETS)
+
+    def observe(self, endpoint, method, status, total, db_time, query_count, size):
+        key = (endpoint, method)
+        with self._lock:
+            self.requests.inc((endpoint, method, str(status)))
+            self.latency.observe(key, total)
+            self.db_time.observe(key, db_time)
+            self.python_time.observe(key, max(total - db_time, 0.0))
+            self.queries.observe(key, query_count)
+            if size is not None:
+                self.response_size.observe(key, size)
+
+    def render(self):
+        with self._lock:
+            lines = []
+            for metric in (self.requests, self.latency, self.db_time, self.python_time, self.queries, self.response_size):
+                lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+request_metrics = RequestMetrics()
+
+def record_query(duration, statements=1):
+    """Charge database time to the current request (no-op outside requests)."""
+    if has_request_context() and 'metrics_start' in g:
+        g.metrics_db_time += duration
+        g.metrics_queries += statements
+
+def init_metrics(app):
+    """Install request timing hooks and the /metrics endpoint."""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_start = time.perf_counter()
+        g.metrics_db_time = 0.0
+        g.metrics_queries = 0
+
+    @app.after_request
+    def record_request_metrics(response):
+        if 'metrics_start' not in g:
+            return response
+
+        total = time.perf_counter() - g.metrics_start
+        endpoint = request.endpoint or 'unmatched'
+        size = None if response.is_streamed else response.calculate_content_length()
+        request_metrics.observe(endpoint, request.method, response.status_code,
+                                total, g.metrics_db_time, g.metrics_queries, size)
+
+        if app.debug or app.config.get('SERVER_TIMING'):
+            response.headers['Server-Timing'] = (
+                f'db;dur={g.metrics_db_time * 1000:.1f};desc="{g.metrics_queries} queries", '
+                f'app;dur={max(total - g.metrics_db_time, 0) * 1000:.1f}, '
+                f'total;dur={total * 1000:.1f}'
+            )
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(request_metrics.render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,184 @@
+# backend/app/utils/query_tracer.py
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from flask import current_app, g, has_app_context, has_request_context, request
+
+logger = logging.getLogger(__name__)
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SKIP_FILES = ('db_tracing.py', 'query_tracer.py', 'database.py')
+
+_COMMENTS = re.compile(r'--[^\n]*|/\*.*?\*/', re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDERS = re.compile(r'%s|%\(\w+\)s|\?')
+_IN_LISTS = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_VALUE_ROWS = re.compile(r'(\(\?\.\.\.\))(?:\s*,\s*\(\?\.\.\.\))+')
+_WHITESPACE = re.compile(r'\s+')
+
+def fingerprint(sql):
+    """Normalise a statement so calls differing only in literals or list lengths group together."""
+    if isinstance(sql, bytes):
+        sql = sql.decode('utf-8', 'replace')
+    sql = _COMMENTS.sub(' ', sql)
+    sql = _STRINGS.sub('?', sql)
+    sql = _NUMBERS.sub('?', sql)
+    sql = _PLACEHOLDERS.sub('?', sql)
+    sql = _IN_LISTS.sub('(?...)', sql)
+    sql = _VALUE_ROWS.sub(r'\1, ...', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+def call_site():
+    """Return 'path:line in function' for the innermost application frame outside the DB layer."""
+    frame = sys._getframe(1)
+    while frame:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_ROOT) and not filename.endswith(_SKIP_FILES):
+            return f'{os.path.relpath(filename, _APP_ROOT)}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+    return None
+
+class QueryTracer:
+    """Per-process statement statistics and a ring buffer of slow statements."""
+
+    def __init__(self, slow_log_size=200, max_fingerprints=2000):
+        self._lock = threading.Lock()
+        self._fingerprints = {}
+        self._max_fingerprints = max_fingerprints
+        self.slow_queries = deque(maxlen=slow_log_size)
+        self.stats = {}
+
+    def _fingerprint(self, sql):
+        # Statements are mostly constant strings, so fingerprints are cached by text
+        key = sql if isinstance(sql, str) else bytes(sql)
+        cached = self._fingerprints.get(key)
+        if cached is None:
+            cached = fingerprint(sql)
+            if len(self._fingerprints) < self._max_fingerprints:
+                self._fingerprints[key] = cached
+        return cached
+
+    def calls(self, sql):
+        """How many times this process has executed the statement's fingerprint."""
+        stats = self.stats.get(self._fingerprint(sql))
+        return stats['calls'] if stats else 0
+
+    def record(self, cursor, sql, params, duration, rowcount):
+        """Record one executed statement. Returns the slow-log entry if it was slow, else None."""
+        config = current_app.config if has_app_context() else {}
+        fp = self._fingerprint(sql)
+
+        with self._lock:
+            stats = self.stats.get(fp)
+            if stats is None:
+                if len(self.stats) >= self._max_fingerprints:
+                    stats = None
+                else:
+                    stats = self.stats[fp] = {'fingerprint': fp, 'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0}
+            if stats is not None:
+                stats['calls'] += 1
+                stats['total_ms'] += duration * 1000
+                stats['max_ms'] = max(stats['max_ms'], duration * 1000)
+                stats['rows'] += max(rowcount, 0)
+
+        if has_request_context() and 'query_fingerprints' in g:
+            g.query_fingerprints[fp] += 1
+            if fp not in g.query_sites:
+                g.query_sites[fp] = call_site()
+
+        entry = None
+        if duration * 1000 >= config.get('SLOW_QUERY_MS', 100):
+            entry = {
+                'fingerprint': fp,
+                'statement': (sql if isinstance(sql, str) else bytes(sql).decode('utf-8', 'replace'))[:2000],
+                'duration_ms': round(duration * 1000, 2),
+                'rows': rowcount if rowcount >= 0 else None,
+                'call_site': call_site(),
+                'endpoint': request.endpoint if has_request_context() else None,
+                'at': time.time()
+            }
+            with self._lock:
+                self.slow_queries.append(entry)
+
+            explain_ms = config.get('QUERY_EXPLAIN_MS', 0)
+            if explain_ms and duration * 1000 >= explain_ms:
+                self._explain(cursor, sql, params, entry)
+        return entry
+
+    def _explain(self, cursor, sql, params, entry):
+        """Log the plan of a slow SELECT.
+
+        Plain EXPLAIN only plans the statement, so the request does not pay
+        for running it twice. On PostgreSQL it runs inside a savepoint on the
+        request's connection: a failure (e.g. statement_timeout) must not
+        abort the caller's transaction.
+        """
+        text = sql if isinstance(sql, str) else bytes(sql).decode('utf-8', 'replace')
+        if not text.lstrip().upper().startswith(('SELECT', 'WITH')):
+            return
+        sqlite = cursor.__class__.__module__ == 'sqlite3'
+        prefix = 'EXPLAIN QUERY PLAN ' if sqlite else 'EXPLAIN '
+        explain = cursor.connection.cursor()
+        try:
+            if not sqlite:
+                explain.execute('SAVEPOINT explain_slow_query')
+            try:
+                explain.execute(prefix + text, *params)
+                plan = '\n'.join(
+                    str(row['detail'] if sqlite else list(row.values())[0]) for row in explain.fetchall()
+                )
+            except Exception:
+                if not sqlite:
+                    explain.execute('ROLLBACK TO SAVEPOINT explain_slow_query')
+                raise
+            if not sqlite:
+                explain.execute('RELEASE SAVEPOINT explain_slow_query')
+        except Exception as e:
+            logger.debug(f"Could not explain slow query: {e}")
+            return
+        finally:
+            explain.close()
+        entry['plan'] = plan
+        logger.warning(f"Slow query ({entry['duration_ms']} ms) at {entry['call_site']}:\n{text}\n{plan}")
+
+    def snapshot(self, top=50):
+        """Slowest logged statements first, plus the fingerprints with the most total time."""
+        with self._lock:
+            slow = sorted(self.slow_queries, key=lambda entry: entry['duration_ms'], reverse=True)
+            stats = sorted(self.stats.values(), key=lambda stats: stats['total_ms'], reverse=True)[:top]
+            return {
+                'slow_queries': [dict(entry) for entry in slow],
+                'top_fingerprints': [dict(stats, avg_ms=stats['total_ms'] / stats['calls']) for stats in stats]
+            }
+
+    def reset(self):
+        with self._lock:
+            self.slow_queries.clear()
+            self.stats.clear()
+
+query_tracer = QueryTracer()
+
+def init_query_tracer(app):
+    """Track statement fingerprints per request and warn about N+1 patterns."""
+    query_tracer.slow_queries = deque(maxlen=app.config.get('SLOW_QUERY_LOG_SIZE', 200))
+
+    @app.before_request
+    def start_query_trace():
+        g.query_fingerprints = Counter()
+        g.query_sites = {}
+
+    @app.after_request
+    def check_repeated_queries(response):
+        threshold = app.config.get('N_PLUS_ONE_THRESHOLD', 10)
+        for fp, calls in g.get('query_fingerprints', {}).items():
+            if calls >= threshold:
+                logger.warning(
+                    f"Possible N+1: {request.endpoint} ran the same statement {calls} times "
+                    f"(first at {g.query_sites.get(fp)}): {fp[:200]}"
+                )
+        return response
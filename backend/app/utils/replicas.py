@@ -0,0 +1,183 @@
+# backend/app/utils/replicas.py
+import itertools
+import logging
+import threading
+import time
+from flask import g, has_request_context, request
+from app.utils.cache import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Seconds behind the primary. Caught up (nothing left to replay) is 0 even
+# when the primary has been idle, but only while the WAL receiver is
+# streaming: a replica cut off from the primary has nothing left to replay
+# either, so it reports NULL (unknown) instead. Roles without
+# pg_read_all_stats see a NULL status; a running receiver counts for them.
+# A primary (not in recovery) is always 0.
+POSTGRES_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver WHERE status IS NULL OR status = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END AS lag
+"""
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+class Replica:
+    """Routing state for one replica in this worker process."""
+
+    def __init__(self, url):
+        self.url = url
+        self.in_flight = 0
+        self.down_until = 0.0
+        self.lag = 0.0
+        self.lag_checked_at = 0.0
+
+class ReplicaRouter:
+    """Chooses where read-intent connections go.
+
+    Reads are spread over DATABASE_REPLICA_URLS (round robin, or the replica
+    with the fewest connections in use by this worker). The primary serves
+    the read instead when no replica is healthy and within max_lag seconds,
+    or when the current user has written within the last sticky_seconds, so
+    they always read their own writes. Stickiness is shared between workers
+    through REDIS_URL (per process without it).
+    """
+
+    def __init__(self):
+        self.replicas = []
+        self.selection = 'least_loaded'
+        self.max_lag = 5.0
+        self.lag_check_interval = 2.0
+        self.retry_after = 30.0
+        self.sticky_seconds = 5
+        self.store = redis_client(None)
+        self._lock = threading.Lock()
+        self._rotation = itertools.count()
+
+    def configure(self, urls, selection=None, max_lag=None, lag_check_interval=None,
+                  retry_after=None, sticky_seconds=None, store=None):
+        self.replicas = [Replica(url) for url in urls]
+        if selection is not None:
+            if selection not in ('least_loaded', 'round_robin'):
+                raise ValueError(f'Unknown replica selection: {selection}')
+            self.selection = selection
+        if max_lag is not None:
+            self.max_lag = max_lag
+        if lag_check_interval is not None:
+            self.lag_check_interval = lag_check_interval
+        if retry_after is not None:
+            self.retry_after = retry_after
+        if sticky_seconds is not None:
+            self.sticky_seconds = sticky_seconds
+        if store is not None:
+            self.store = store
+
+    @staticmethod
+    def _user_key():
+        """The authenticated identity of the current request, if any."""
+        try:
+            from flask_jwt_extended import get_jwt_identity
+            identity = get_jwt_identity()
+        except Exception:
+            return None
+        return None if identity is None else f'replica:sticky:{identity}'
+
+    def record_write(self):
+        """Note a committed write so the writer's next reads go to the primary.
+
+        Only requests that change something count: GET handlers open
+        write-intent connections for lookups (e.g. the admin check) and log
+        views, and must not pin their reads to the primary.
+        """
+        if not has_request_context() or request.method in SAFE_METHODS:
+            return
+        g.db_wrote = True
+        if not self.replicas:
+            return
+        key = self._user_key()
+        if key:
+            try:
+                self.store.set(key, b'1', ex=self.sticky_seconds)
+            except Exception as e:
+                logger.warning(f'Could not record read-your-writes marker: {e}')
+
+    def _is_sticky(self):
+        if not has_request_context():
+            return False
+        if g.get('db_wrote'):
+            return True
+        key = self._user_key()
+        if not key:
+            return False
+        try:
+            return self.store.get(key) is not None
+        except Exception:
+            # Without the marker, the primary is the only safe answer
+            return True
+
+    def choose(self):
+        """A Replica for this read, or None for the primary."""
+        if not self.replicas or self._is_sticky():
+            return None
+        now = time.monotonic()
+        with self._lock:
+            # A lagging replica gets another try once its lag is due a recheck
+            healthy = [r for r in self.replicas if r.down_until <= now
+                       and (r.lag <= self.max_lag or now - r.lag_checked_at >= self.lag_check_interval)]
+            if not healthy:
+                return None
+            start = next(self._rotation) % len(healthy)
+            ordered = healthy[start:] + healthy[:start]
+            replica = ordered[0] if self.selection == 'round_robin' else min(ordered, key=lambda r: r.in_flight)
+            replica.in_flight += 1
+            return replica
+
+    def release(self, replica):
+        with self._lock:
+            replica.in_flight -= 1
+
+    def mark_down(self, replica, error):
+        logger.warning(f'Read replica unavailable, using the primary for {self.retry_after:.0f}s: {error}')
+        with self._lock:
+            replica.down_until = time.monotonic() + self.retry_after
+
+    def lag_check_due(self, replica):
+        return time.monotonic() - replica.lag_checked_at >= self.lag_check_interval
+
+    def record_lag(self, replica, lag):
+        """Store a lag reading; None (unknown, e.g. disconnected) counts as too far behind."""
+        replica.lag = float('inf') if lag is None else float(lag)
+        replica.lag_checked_at = time.monotonic()
+        if lag is None:
+            logger.warning('Read replica is not streaming from the primary; reading from the primary')
+        elif replica.lag > self.max_lag:
+            logger.warning(f'Read replica is {replica.lag:.1f}s behind; reading from the primary')
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                'in_flight': r.in_flight,
+                'lag_seconds': round(r.lag, 3) if r.lag != float('inf') else None,
+                'healthy': r.down_until <= now and r.lag <= self.max_lag
+            } for r in self.replicas]
+
+replica_router = ReplicaRouter()
+
+def init_replica_router(app):
+    """Load DATABASE_REPLICA_URLS and the routing limits."""
+    urls = [url.strip() for url in app.config.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    replica_router.configure(
+        urls,
+        selection=app.config.get('REPLICA_SELECTION'),
+        max_lag=app.config.get('REPLICA_MAX_LAG_SECONDS'),
+        lag_check_interval=app.config.get('REPLICA_LAG_CHECK_SECONDS'),
+        retry_after=app.config.get('REPLICA_RETRY_SECONDS'),
+        sticky_seconds=app.config.get('REPLICA_STICKY_SECONDS'),
+        store=redis_client(app.config.get('REDIS_URL'))
+    )
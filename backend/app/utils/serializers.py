@@ -0,0 +1,178 @@
+# backend/app/utils/serializers.py
+import json
+import re
+
+# Converters for database values. The JSON provider already handles Decimal,
+# datetime and Enum, so these only cover value-level rules.
+
+def money(value):
+    """Decimal/None to float, with missing or zero values as 0."""
+    return float(value) if value else 0
+
+def money_or_none(value):
+    """Decimal/None to float, with missing or zero values as None."""
+    return float(value) if value else None
+
+def boolean(value):
+    """SQLite 0/1 or PostgreSQL bool to bool (None stays None)."""
+    return None if value is None else bool(value)
+
+def timestamp(value):
+    """datetime to ISO 8601; SQLite already returns text."""
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+def json_list(value):
+    """A JSON/JSONB list column (text on SQLite) as a list."""
+    if not value:
+        return []
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+def json_object(value):
+    """A JSON/JSONB object column (text on SQLite) as a dict."""
+    if not value:
+        return {}
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+class Field:
+    """A schema entry reading `column` and passing it through `convert`."""
+
+    __slots__ = ('column', 'convert')
+
+    def __init__(self, column, convert=None):
+        self.column = column
+        self.convert = convert
+
+def row_encoder(schema):
+    """Compile a schema into a function mapping a row to a response dict.
+
+    The schema maps output keys to a column name, a Field (column plus
+    converter), a nested schema dict, or a callable taking the whole row.
+    Compilation happens once, so encoding a row is a flat loop over
+    prepared getters:
+
+        encode = row_encoder({
+            'id': 'id',
+            'title': {'en': 'title_en', 'ar': 'title_ar'},
+            'asking_price': Field('asking_price', money),
+        })
+        [encode(row) for row in rows]
+    """
+    steps = []
+    for key, spec in schema.items():
+        if isinstance(spec, str):
+            steps.append((key, spec, None, None))
+        elif isinstance(spec, Field):
+            steps.append((key, spec.column, spec.convert, None))
+        elif isinstance(spec, dict):
+            steps.append((key, None, None, row_encoder(spec)))
+        elif callable(spec):
+            steps.append((key, None, None, spec))
+        else:
+            raise TypeError(f'Unsupported schema entry for {key!r}: {spec!r}')
+
+    def encode(row):
+        result = {}
+        for key, column, convert, nested in steps:
+            if column is None:
+                result[key] = nested(row)
+            elif convert is None:
+                result[key] = row[column]
+            else:
+                result[key] = convert(row[column])
+        return result
+
+    return encode
+
+class Localized:
+    """A bilingual column pair such as title_en/title_ar.
+
+    Without a language it encodes as {'en': ..., 'ar': ...}; with one it
+    selects that column only, falling back to English in SQL, and encodes
+    as a plain string.
+    """
+
+    def __init__(self, alias, base, fallback='en'):
+        self.alias = alias
+        self.base = base
+        self.fallback = fallback
+
+    def columns(self, lang, languages):
+        if lang is None:
+            return [f'{self.alias}.{self.base}_{code}' for code in languages]
+        if lang == self.fallback:
+            return [f'{self.alias}.{self.base}_{lang}']
+        return [
+            f"COALESCE(NULLIF({self.alias}.{self.base}_{lang}, ''), "
+            f"{self.alias}.{self.base}_{self.fallback}) AS {self.base}_{lang}"
+        ]
+
+    def spec(self, lang, languages):
+        if lang is None:
+            return {code: f'{self.base}_{code}' for code in languages}
+        return f'{self.base}_{lang}'
+
+class Projection:
+    """Response fields selectable with ?fields= / ?lang=, each with the SQL it needs.
+
+    `fields` maps an output key to (columns, spec): the SELECT expressions
+    that feed it and a row_encoder schema entry, or to a Localized pair.
+    Both the SELECT list and the encoder are derived from the requested
+    keys, so unrequested columns are never read from the database.
+    """
+
+    def __init__(self, fields, languages=('en', 'ar'), always=('id',), optional=()):
+        self.fields = fields
+        self.languages = tuple(languages)
+        self.always = tuple(always)
+        # Fields only returned when asked for by name
+        self.optional = tuple(optional)
+        self._encoders = {}
+
+    def parse(self, fields_param, lang=None):
+        """Validate ?fields=/?lang= into a (names, lang) key. Raises ValueError."""
+        if lang is not None and lang not in self.languages:
+            raise ValueError(f"Unsupported language '{lang}' (expected one of: {', '.join(self.languages)})")
+        if not fields_param:
+            names = tuple(name for name in self.fields if name not in self.optional)
+        else:
+            requested = [name.strip() for name in fields_param.split(',') if name.strip()]
+            unknown = [name for name in requested if name not in self.fields]
+            if unknown:
+                raise ValueError(
+                    f"Unknown field(s): {', '.join(unknown)} (available: {', '.join(self.fields)})"
+                )
+            # Output order follows the registry, whatever order they were asked in
+            wanted = set(requested) | set(self.always)
+            names = tuple(name for name in self.fields if name in wanted)
+        return names, lang
+
+    def columns(self, key):
+        """Distinct SELECT expressions needed for a parsed key, in first-use order."""
+        names, lang = key
+        columns = []
+        for name in names:
+            entry = self.fields[name]
+            needed = entry.columns(lang, self.languages) if isinstance(entry, Localized) else entry[0]
+            for column in needed:
+                if column not in columns:
+                    columns.append(column)
+        return columns
+
+    def tables(self, key):
+        """Table aliases referenced by the SELECT list for a parsed key."""
+        return {alias for column in self.columns(key) for alias in re.findall(r'\b(\w+)\.\w+', column)}
+
+    def encoder(self, key):
+        """Compiled row encoder for a parsed key (cached per distinct projection)."""
+        encode = self._encoders.get(key)
+        if encode is None:
+            names, lang = key
+            schema = {}
+            for name in names:
+                entry = self.fields[name]
+                schema[name] = entry.spec(lang, self.languages) if isinstance(entry, Localized) else entry[1]
+            encode = row_encoder(schema)
+            # Field combinations are client-chosen; only keep a bounded number compiled
+            if len(self._encoders) < 256:
+                self._encoders[key] = encode
+        return encode
@@ -0,0 +1,162 @@
+# backend/app/utils/sql_dialect.py
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+from collections.abc import Mapping
+from decimal import Decimal
+from functools import lru_cache
+from app.utils.json_provider import default as json_default
+from app.utils.query_tracer import query_tracer
+
+logger = logging.getLogger(__name__)
+
+# RETURNING is the newest construct the blueprints rely on
+SQLITE_MIN_VERSION = (3, 35, 0)
+
+# psycopg2 parameter markers. Like psycopg2, these are recognised anywhere in
+# the text, quoted or not.
+_PARAMS = re.compile(r'%\((?P<named>\w+)\)s|(?P<positional>%s)|(?P<percent>%%)')
+
+# PostgreSQL-only syntax SQLite lacks. Literals, quoted identifiers and
+# comments are matched first so nothing inside them is rewritten.
+_SYNTAX = re.compile(r"""
+      (?P<literal>'(?:[^']|'')*'|"(?:[^"]|"")*"|--[^\n]*|/\*.*?\*/)
+    | (?P<cast>::\s*\w+(?:\s*\[\])?)
+    | (?P<ilike>\bILIKE\b)
+""", re.X | re.S | re.I)
+
+_PREPARABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+
+if sqlite3.sqlite_version_info < SQLITE_MIN_VERSION:
+    logger.warning('SQLite %s is older than %s; RETURNING statements will fail',
+                   sqlite3.sqlite_version, '.'.join(map(str, SQLITE_MIN_VERSION)))
+
+# Parameter types psycopg2 adapts natively but sqlite3 rejects: JSON columns
+# are TEXT on SQLite, and money columns are REAL
+def _json_text(value):
+    return json.dumps(value, default=json_default)
+
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_adapter(list, _json_text)
+sqlite3.register_adapter(dict, _json_text)
+
+@lru_cache(maxsize=2048)
+def sqlite_statement(sql, has_params=True):
+    """Rewrite a PostgreSQL-style statement for sqlite3.
+
+    %s -> ?, %(name)s -> :name and %% -> % (only when parameters are bound,
+    as in psycopg2), ILIKE -> LIKE (SQLite's LIKE already ignores ASCII
+    case) and ::type casts are dropped. Cached by statement text: almost
+    every statement is a constant string, so each is translated once.
+    """
+    def parameter(match):
+        if match.group('named'):
+            return ':' + match.group('named')
+        return '?' if match.group('positional') else '%'
+
+    def syntax(match):
+        if match.group('literal'):
+            return match.group(0)
+        return '' if match.group('cast') else 'LIKE'
+
+    if has_params:
+        sql = _PARAMS.sub(parameter, sql)
+    return _SYNTAX.sub(syntax, sql)
+
+@lru_cache(maxsize=1024)
+def prepared_statement(sql):
+    """(name, body, parameter count) to PREPARE a %s-style statement, or None.
+
+    Only plain DML/queries with positional parameters qualify; the name is
+    derived from the text, so every connection uses the same one.
+    """
+    if not sql.lstrip().upper().startswith(_PREPARABLE):
+        return None
+    if any(match.group('named') for match in _PARAMS.finditer(sql)):
+        return None
+    count = 0
+
+    def parameter(match):
+        nonlocal count
+        if match.group('percent'):
+            return '%'
+        count += 1
+        return f'${count}'
+
+    body = _PARAMS.sub(parameter, sql)
+    name = 'ps_' + hashlib.blake2b(sql.encode('utf-8'), digest_size=8).hexdigest()
+    return name, body, count
+
+class SQLiteDialect:
+    """Runs the blueprints' PostgreSQL-style SQL on sqlite3."""
+
+    prepares = False
+
+    def statement(self, cursor, query, params, many=False):
+        if not isinstance(query, str):
+            return query
+        return sqlite_statement(query, bool(params))
+
+class PostgresDialect:
+    """Runs hot statements as server-side prepared statements.
+
+    Once a statement's fingerprint has been executed `threshold` times in
+    this process (per the query tracer), each pooled connection PREPAREs it
+    on first use and afterwards sends only EXECUTE name(params), skipping
+    parse and plan. Statements PostgreSQL cannot prepare (e.g. untyped
+    parameters) are remembered and always sent as-is.
+    """
+
+    prepares = True
+
+    def __init__(self, threshold=5, max_per_connection=100):
+        self.threshold = threshold
+        self.max_per_connection = max_per_connection
+        self._unpreparable = set()
+
+    def _remember_unpreparable(self, query):
+        if len(self._unpreparable) >= 4096:
+            self._unpreparable.clear()
+        self._unpreparable.add(query)
+
+    def statement(self, cursor, query, params, many=False):
+        if (many or self.threshold <= 0 or not isinstance(query, str) or getattr(cursor, 'name', None)
+                or isinstance(params, Mapping) or query in self._unpreparable):
+            return query
+        prepared = getattr(cursor.connection, 'prepared_statements', None)
+        if prepared is None or query_tracer.calls(query) < self.threshold:
+            return query
+        plan = prepared_statement(query)
+        if plan is None or plan[2] != len(params or ()):
+            self._remember_unpreparable(query)
+            return query
+
+        name, body, count = plan
+        if name not in prepared:
+            if len(prepared) >= self.max_per_connection:
+                return query
+            # A failed PREPARE must not abort the caller's transaction
+            cursor.execute('SAVEPOINT prepare_statement')
+            try:
+                cursor.execute(f'PREPARE {name} AS {body}')
+            except Exception as e:
+                cursor.execute('ROLLBACK TO SAVEPOINT prepare_statement')
+                logger.debug(f'Not preparing statement {name}: {e}')
+                self._remember_unpreparable(query)
+                return query
+            cursor.execute('RELEASE SAVEPOINT prepare_statement')
+            prepared.add(name)
+
+        if not count:
+            return f'EXECUTE {name}'
+        return f"EXECUTE {name} ({', '.join(['%s'] * count)})"
+
+sqlite_dialect = SQLiteDialect()
+postgres_dialect = PostgresDialect()
+
+def init_sql_dialect(app):
+    """Apply the prepared-statement limits (PREPARE_THRESHOLD 0 turns them off)."""
+    postgres_dialect.threshold = app.config.get('PREPARE_THRESHOLD', 5)
+    postgres_dialect.max_per_connection = app.config.get('PREPARED_STATEMENTS_MAX', 100)
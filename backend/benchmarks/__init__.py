@@ -0,0 +1,37 @@
+# backend/benchmarks/__init__.py
+"""Benchmark and load-test suite.
+
+Run from the backend directory:
+
+    python -m benchmarks --scale small --output results/bench.json
+    python -m benchmarks --database-url postgresql://localhost/bench --scale medium
+    python -m benchmarks --compare results/previous.json --output results/bench.json
+
+Serving models: --serve starts gunicorn (gunicorn.conf.py) once per worker
+class and reruns the load scenarios over HTTP. Use PostgreSQL and enough
+concurrent clients to keep workers waiting on I/O, and compare
+throughput_rps_per_core between the two:
+
+    python -m benchmarks --database-url postgresql://localhost/bench --macro-only \
+        --serve sync --serve gevent --concurrency 64 --requests 2000
+
+Recorded runs, 1 core, --concurrency 32, rps per core (sync / gevent):
+
+    SQLite, all scenarios             116 / 116
+    PostgreSQL 16, --scale tiny --requests 600, three runs:
+      GET /api/properties             125 / 144,  163 / 191,  153 / 216
+      GET /api/properties/<id>        134 / 158,  133 / 207,  143 / 223
+      GET /api/admin/investors        119 / 106,  100 / 119,  117 / 149
+      GET /api/admin/properties       118 / 113,  126 / 154,  116 / 158
+      POST /api/auth/login            about 7 either way (bcrypt, CPU bound)
+
+SQLite calls are local and never yield, so there is no gain there. On
+PostgreSQL gevent is ahead on the property endpoints in every run, by
+15-56%. The admin lists are mixed: ahead in two runs, behind in one, with
+a higher p95 (about 500 ms against 300 ms) because their serialisation
+is CPU work that greenlets share. gunicorn.conf.py therefore defaults to
+gevent, which /api/events needs anyway. Deployments where admin traffic
+dominates can set GUNICORN_WORKER_CLASS=sync.
+
+See benchmarks/__main__.py for all options.
+"""
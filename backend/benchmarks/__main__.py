@@ -0,0 +1,122 @@
+# backend/benchmarks/__main__.py
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+def _git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# Metrics compared against a baseline; lower is better for all of them
+COMPARED_METRICS = ('p50_us', 'p50_ms', 'p95_ms')
+
+def compare(results, baseline, threshold):
+    """List metrics that got slower than the baseline by more than `threshold` (a fraction)."""
+    regressions = []
+    for section in ('micro', 'macro'):
+        for name, stats in results.get(section, {}).items():
+            previous = baseline.get(section, {}).get(name, {})
+            for metric in COMPARED_METRICS:
+                if stats.get(metric) and previous.get(metric):
+                    change = stats[metric] / previous[metric] - 1
+                    if change > threshold:
+                        regressions.append({
+                            'benchmark': f'{section}:{name}', 'metric': metric,
+                            'baseline': previous[metric], 'current': stats[metric],
+                            'change_pct': round(change * 100, 1)
+                        })
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Seed a synthetic dataset and benchmark the API.')
+    parser.add_argument('--database-url', help='Database to seed and test (default: a fresh SQLite file in a temp dir).')
+    parser.add_argument('--scale', default='small', choices=['tiny', 'small', 'medium', 'large'], help='Dataset size.')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for data and request mix.')
+    parser.add_argument('--skip-seed', action='store_true', help='Reuse an already seeded database.')
+    parser.add_argument('--micro-only', action='store_true', help='Only run the micro-benchmarks (no database).')
+    parser.add_argument('--macro-only', action='store_true', help='Only run the load tests.')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per load-test scenario.')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent clients per scenario.')
+    parser.add_argument('--scenario', action='append', help='Run only this load-test scenario (repeatable).')
+    parser.add_argument('--base-url', help='Load-test a running server instead of the in-process app.')
+    parser.add_argument('--serve', action='append', choices=['sync', 'gevent'],
+                        help='Also load-test under gunicorn with this worker class (repeatable).')
+    parser.add_argument('--serve-workers', type=int, help='gunicorn workers for --serve (default: gunicorn.conf.py).')
+    parser.add_argument('--output', help='Write the JSON results here (default: stdout).')
+    parser.add_argument('--compare', help='Baseline results JSON to compare against.')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Slowdown fraction reported as a regression.')
+    args = parser.parse_args(argv)
+
+    database_url = args.database_url
+    if not database_url:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench-'), 'bench.db')}"
+    # Config reads the environment at import, so set these before anything
+    # imports app.config. Metrics stay off to keep instrumentation overhead
+    # out of the numbers being measured.
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('METRICS_ENABLED', 'false')
+
+    results = {
+        'meta': {
+            'git_revision': _git_revision(),
+            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database': 'sqlite' if database_url.startswith('sqlite') else 'postgresql',
+            'scale': args.scale,
+            'seed': args.seed,
+            'target': args.base_url or 'in-process',
+        }
+    }
+
+    if not args.macro_only:
+        from benchmarks.micro import run_micro
+        results['micro'] = run_micro(seed=args.seed)
+
+    if not args.micro_only:
+        from app import create_app
+        from benchmarks.seed import is_seeded, load_dataset, seed_dataset
+        from benchmarks.load import run_load
+
+        app = create_app()
+        with app.app_context():
+            if args.skip_seed or is_seeded():
+                dataset = load_dataset()
+            else:
+                dataset = seed_dataset(args.scale, seed=args.seed)
+        results['meta']['dataset'] = {
+            'investors': len(dataset['investor_ids']),
+            'published_properties': len(dataset['published_property_ids'])
+        }
+        results['macro'] = run_load(app, dataset, requests_count=args.requests, concurrency=args.concurrency,
+                                    base_url=args.base_url, seed=args.seed, only=args.scenario)
+
+        if args.serve:
+            from benchmarks.serving import run_serving
+            results['serving'] = run_serving(app, dataset, args.serve, workers=args.serve_workers,
+                                             requests_count=args.requests, concurrency=args.concurrency,
+                                             seed=args.seed, only=args.scenario)
+
+    if args.compare:
+        with open(args.compare) as handle:
+            results['regressions'] = compare(results, json.load(handle), args.threshold)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as handle:
+            handle.write(output + '\n')
+    else:
+        print(output)
+
+    return 1 if results.get('regressions') else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,141 @@
+# backend/benchmarks/load.py
+import random
+import threading
+import time
+from collections import Counter
+from flask_jwt_extended import create_access_token
+from benchmarks.seed import BENCH_PASSWORD
+
+def _percentile(samples, q):
+    return round(samples[min(int(len(samples) * q), len(samples) - 1)], 3) if samples else None
+
+def build_scenarios(dataset, rng):
+    """Request generators for each macro benchmark: name -> () -> (method, path, json, token_kind)."""
+    property_ids = dataset['published_property_ids'] or [0]
+    investor_count = len(dataset['investor_ids'])
+    property_pages = max(len(property_ids) // 12, 1)
+    investor_pages = max(investor_count // 20, 1)
+
+    return {
+        'GET /api/properties': lambda: (
+            'GET', f'/api/properties?page={rng.randint(1, min(property_pages, 50))}', None, 'investor'),
+        'GET /api/properties/<id>': lambda: (
+            'GET', f'/api/properties/{rng.choice(property_ids)}', None, 'investor'),
+        'POST /api/auth/login': lambda: (
+            'POST', '/api/auth/login',
+            {'email': f'bench-investor-{rng.randrange(max(investor_count, 1))}@example.com', 'password': BENCH_PASSWORD},
+            None),
+        'GET /api/admin/investors': lambda: (
+            'GET', f'/api/admin/investors?page={rng.randint(1, min(investor_pages, 50))}', None, 'admin'),
+        'GET /api/admin/properties': lambda: (
+            'GET', f'/api/admin/properties?page={rng.randint(1, min(property_pages, 50))}', None, 'admin'),
+    }
+
+def make_tokens(app, dataset):
+    with app.app_context():
+        # String subjects: newer flask-jwt-extended rejects integer `sub` claims
+        return {
+            'investor': create_access_token(identity=str(dataset['investor_ids'][0])) if dataset['investor_ids'] else None,
+            'admin': create_access_token(identity=str(dataset['admin_id']))
+        }
+
+class InProcessClient:
+    """Drives the app through Flask's test client (no network, measures app + database)."""
+
+    def __init__(self, app):
+        self.app = app
+        self.local = threading.local()
+
+    def request(self, method, path, json, headers):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        response = client.open(path, method=method, json=json, headers=headers)
+        return response.status_code, len(response.get_data())
+
+class HttpClient:
+    """Drives a running server over HTTP (one keep-alive session per worker thread)."""
+
+    def __init__(self, base_url):
+        import requests
+        self.requests = requests
+        self.base_url = base_url.rstrip('/')
+        self.local = threading.local()
+
+    def request(self, method, path, json, headers):
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = self.requests.Session()
+        response = session.request(method, self.base_url + path, json=json, headers=headers, timeout=30)
+        return response.status_code, len(response.content)
+
+def run_scenario(client, make_request, tokens, requests_count, concurrency, warmup=5):
+    """Issue requests_count requests from `concurrency` threads and summarise latencies."""
+    lock = threading.Lock()
+    latencies = []
+    statuses = Counter()
+    sizes = []
+    remaining = [requests_count]
+
+    def issue():
+        method, path, body, token_kind = make_request()
+        headers = {'Authorization': f'Bearer {tokens[token_kind]}'} if token_kind else {}
+        start = time.perf_counter()
+        try:
+            status, size = client.request(method, path, body, headers)
+        except Exception as e:
+            status, size = f'exception:{type(e).__name__}', 0
+        return (time.perf_counter() - start) * 1000, status, size
+
+    for _ in range(warmup):
+        issue()
+
+    def worker():
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            elapsed_ms, status, size = issue()
+            with lock:
+                latencies.append(elapsed_ms)
+                statuses[str(status)] += 1
+                sizes.append(size)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if not status.startswith(('2', '3')))
+    return {
+        'requests': len(latencies),
+        'concurrency': concurrency,
+        'errors': errors,
+        'status_codes': dict(statuses),
+        'throughput_rps': round(len(latencies) / wall, 2) if wall else None,
+        'mean_ms': round(sum(latencies) / len(latencies), 3) if latencies else None,
+        'p50_ms': _percentile(latencies, 0.5),
+        'p95_ms': _percentile(latencies, 0.95),
+        'p99_ms': _percentile(latencies, 0.99),
+        'max_ms': round(latencies[-1], 3) if latencies else None,
+        'mean_response_bytes': round(sum(sizes) / len(sizes)) if sizes else None,
+    }
+
+def run_load(app, dataset, requests_count=200, concurrency=4, base_url=None, seed=42, only=None):
+    """Run every macro scenario (or those named in `only`). Returns {scenario: stats}."""
+    rng = random.Random(seed)
+    client = HttpClient(base_url) if base_url else InProcessClient(app)
+    tokens = make_tokens(app, dataset)
+    results = {}
+    for name, make_request in build_scenarios(dataset, rng).items():
+        if only and name not in only:
+            continue
+        # Logins are dominated by password hashing, so they get a tenth of the requests
+        count = max(requests_count // 10, 10) if 'login' in name else requests_count
+        results[name] = run_scenario(client, make_request, tokens, count, concurrency)
+    return results
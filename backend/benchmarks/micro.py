@@ -0,0 +1,86 @@
+# backend/benchmarks/micro.py
+import random
+import time
+from types import SimpleNamespace
+from app.services.calculation_service import ShariaCompliantCalculator
+from app.utils import validators
+
+def summarize(samples_ns, per_call=1):
+    """Timing statistics (microseconds per call) for a list of sample durations."""
+    samples = sorted(sample / per_call / 1000 for sample in samples_ns)
+    def percentile(q):
+        return round(samples[min(int(len(samples) * q), len(samples) - 1)], 3)
+    return {
+        'samples': len(samples),
+        'calls_per_sample': per_call,
+        'mean_us': round(sum(samples) / len(samples), 3),
+        'min_us': round(samples[0], 3),
+        'p50_us': percentile(0.5),
+        'p95_us': percentile(0.95),
+    }
+
+def bench(func, args_list, samples=30):
+    """Time func over every argument tuple, repeated `samples` times."""
+    durations = []
+    for _ in range(samples):
+        start = time.perf_counter_ns()
+        for args in args_list:
+            func(*args)
+        durations.append(time.perf_counter_ns() - start)
+    return summarize(durations, per_call=len(args_list))
+
+def _calculator_cases(rng, count):
+    cases = []
+    for _ in range(count):
+        price = rng.randrange(60000, 900000, 500)
+        cases.append((price, round(price * rng.uniform(0.004, 0.008), 2),
+                      rng.randrange(0, 60000, 500), rng.randrange(0, 30000, 100), 1500, 3000, 500,
+                      rng.randrange(1000, 5000, 100), 10, 5, 10))
+    return cases
+
+def run_micro(seed=42, samples=30, batch=1000):
+    """Run the micro-benchmarks. Returns {name: stats or {'skipped': reason}}."""
+    rng = random.Random(seed)
+    results = {}
+    calculator = ShariaCompliantCalculator()
+
+    detailed = _calculator_cases(rng, batch)
+    basic = [(case[0], case[1], case[7], case[2] + case[3] + case[4] + case[5] + case[6]) for case in detailed]
+    results['calculator.calculate_investment_metrics'] = bench(calculator.calculate_investment_metrics, basic, samples)
+    results['calculator.calculate_detailed_metrics'] = bench(calculator.calculate_detailed_metrics, detailed, samples)
+
+    emails = [(f'user.{i}+tag@example{i % 7}.co.uk',) for i in range(batch)] + [('not-an-email',)]
+    postcodes = [(rng.choice(['SW1A 1AA', 'M1 1AE', 'B33 8TH', 'CR2 6XH', 'DN55 1PT', 'bad']),) for _ in range(batch)]
+    phones = [(rng.choice(['+447911123456', '07911 123456', '+971501234567', '12']),) for _ in range(batch)]
+    passwords = [(rng.choice(['Password123', 'short', 'NoDigitsHere', 'Valid-Pass-99']),) for _ in range(batch)]
+    strings = [('<b>' + 'x' * rng.randint(5, 200) + '</b>  ',) for _ in range(batch)]
+    results['validators.validate_email'] = bench(validators.validate_email, emails, samples)
+    results['validators.validate_postcode'] = bench(validators.validate_postcode, postcodes, samples)
+    results['validators.validate_phone'] = bench(validators.validate_phone, phones, samples)
+    results['validators.validate_password'] = bench(validators.validate_password, passwords, samples)
+    results['validators.sanitize_string'] = bench(validators.sanitize_string, strings, samples)
+
+    try:
+        from app.services.matching_service import MatchingService
+    except ImportError as e:
+        reason = f'matching_service cannot be imported: {e}'
+        results['matching.calculate_bmv_score'] = {'skipped': reason}
+        results['matching.calculate_match_score'] = {'skipped': reason}
+    else:
+        matching = MatchingService(None)
+        properties = [(SimpleNamespace(
+            market_value=price * rng.uniform(1.0, 1.4), asking_price=price, location_score=rng.randint(0, 20),
+            condition_score=rng.randint(0, 15), net_yield=rng.uniform(3, 10), roi_potential=rng.uniform(0, 12),
+            region=rng.choice(['London', 'North West', 'Midlands']), property_type=rng.choice(['flat', 'terraced']),
+            investment_strategy=rng.choice(['buy_to_let', 'hmo'])
+        ),) for price in (rng.randrange(60000, 900000, 500) for _ in range(batch))]
+        investor = SimpleNamespace(investment_preferences={
+            'min_investment': 100000, 'max_investment': 400000, 'target_regions': ['London', 'Midlands'],
+            'property_types': ['flat'], 'min_yield': 6, 'investment_strategy': 'buy_to_let'
+        })
+        results['matching.calculate_bmv_score'] = bench(matching.calculate_bmv_score, properties, samples)
+        results['matching.calculate_match_score'] = bench(
+            matching._calculate_match_score, [(investor, prop) for (prop,) in properties], samples
+        )
+
+    return results
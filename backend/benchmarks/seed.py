@@ -0,0 +1,155 @@
+# backend/benchmarks/seed.py
+import json
+import random
+from werkzeug.security import generate_password_hash
+from app.database import get_db_connection, insert_many, placeholder
+from app.services.property_service import rebuild_property_feed
+
+SCALES = {
+    'tiny': {'properties': 200, 'investors': 100, 'activities': 1000},
+    'small': {'properties': 2000, 'investors': 1000, 'activities': 20000},
+    'medium': {'properties': 20000, 'investors': 10000, 'activities': 200000},
+    'large': {'properties': 100000, 'investors': 50000, 'activities': 1000000},
+}
+
+BENCH_PASSWORD = 'Benchmark-pass-1'
+ADMIN_EMAIL = 'bench-admin@example.com'
+CHUNK_SIZE = 500
+
+CITIES = ['London', 'Manchester', 'Birmingham', 'Leeds', 'Liverpool', 'Bristol', 'Sheffield', 'Leicester']
+POSTCODES = ['SW1A 1AA', 'M1 1AE', 'B1 1BB', 'LS1 4AP', 'L1 8JQ', 'BS1 4DJ', 'S1 2HE', 'LE1 5WW']
+PROPERTY_TYPES = ['terraced', 'semi-detached', 'detached', 'flat', 'bungalow', 'hmo']
+STRATEGIES = ['buy_to_let', 'hmo', 'flip', 'serviced_accommodation', 'brrr']
+NATIONALITIES = ['GB', 'AE', 'SA', 'QA', 'KW', 'MY', 'PK', 'EG']
+
+def _chunks(rows):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        yield rows[start:start + CHUNK_SIZE]
+
+def _insert(table, columns, rows):
+    for chunk in _chunks(rows):
+        with get_db_connection() as conn:
+            insert_many(conn.cursor(), table, columns, chunk)
+
+def is_seeded():
+    p = placeholder()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) AS count FROM users WHERE email = {p}", (ADMIN_EMAIL,))
+        return cursor.fetchone()['count'] > 0
+
+def seed_dataset(scale='small', seed=42, counts=None):
+    """Insert a deterministic synthetic dataset. Returns the ids the load tests need.
+
+    The same scale and seed always produce the same rows, so results from
+    different commits are comparable.
+    """
+    counts = dict(SCALES[scale], **(counts or {}))
+    rng = random.Random(seed)
+    password_hash = generate_password_hash(BENCH_PASSWORD)
+
+    # Users: one admin plus investors, all verified so they can log in
+    users = [(ADMIN_EMAIL, password_hash, 'Benchmark Admin', 'admin', True, True)]
+    users += [
+        (f'bench-investor-{i}@example.com', password_hash, f'Investor {i}', 'investor', True, True)
+        for i in range(counts['investors'])
+    ]
+    _insert('users', ['email', 'password_hash', 'full_name', 'user_type', 'is_active', 'is_verified'], users)
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, user_type FROM users WHERE email LIKE 'bench-%' ORDER BY id")
+        rows = cursor.fetchall()
+    admin_id = next(row['id'] for row in rows if row['user_type'] == 'admin')
+    investor_ids = [row['id'] for row in rows if row['user_type'] == 'investor']
+
+    profiles = []
+    for user_id in investor_ids:
+        min_investment = rng.choice([50000, 100000, 150000, 250000])
+        profiles.append((user_id, 'individual', rng.choice(NATIONALITIES), min_investment,
+                         min_investment * rng.choice([2, 3, 4]), round(rng.uniform(4, 9), 2)))
+    _insert('investor_profiles',
+            ['user_id', 'investor_type', 'nationality', 'min_investment', 'max_investment', 'target_yield'],
+            profiles)
+
+    documents = []
+    for user_id in investor_ids:
+        for document_type in ('passport', 'proof_of_address'):
+            documents.append((user_id, document_type, f'kyc/{user_id}/{document_type}.pdf', f'{document_type}.pdf',
+                              rng.choice(['pending', 'verified', 'verified', 'rejected'])))
+    _insert('kyc_documents', ['user_id', 'document_type', 'file_path', 'file_name', 'status'], documents)
+
+    properties = []
+    for i in range(counts['properties']):
+        city = rng.randrange(len(CITIES))
+        asking_price = rng.randrange(60000, 900000, 500)
+        properties.append((
+            f'BENCH-{i:07d}', f'{rng.randint(1, 300)} Benchmark Street', POSTCODES[city], CITIES[city],
+            rng.choice(PROPERTY_TYPES), rng.randint(1, 6), rng.randint(1, 3), rng.randint(400, 3000),
+            asking_price, round(asking_price * rng.uniform(0.004, 0.008), 2), rng.randint(0, 100),
+            rng.choice(['A', 'B', 'C']), 'active', rng.random() < 0.8
+        ))
+    _insert('properties',
+            ['property_id', 'address', 'postcode', 'city', 'property_type', 'bedrooms', 'bathrooms',
+             'square_feet', 'asking_price', 'monthly_rent', 'bmv_score', 'tier', 'status', 'published'],
+            properties)
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, published FROM properties WHERE property_id LIKE 'BENCH-%' ORDER BY id")
+        property_rows = cursor.fetchall()
+
+    deals = []
+    for row in property_rows:
+        deals.append((
+            row['id'], f'Investment opportunity {row["id"]}', f'فرصة استثمارية {row["id"]}',
+            'Benchmark deal package. ' * 20, 'حزمة صفقة. ' * 20, rng.choice(STRATEGIES),
+            rng.randrange(0, 60000, 500), rng.randrange(0, 30000, 100), 1500, 3000, 500,
+            rng.randrange(1000, 5000, 100), 10, 5, 10,
+            json.dumps([f'https://images.example.com/{row["id"]}/{n}.jpg' for n in range(5)]),
+            json.dumps([]), json.dumps({'lat': 51.5, 'lng': -0.12}), bool(row['published'])
+        ))
+    _insert('deal_packages',
+            ['property_id', 'title_en', 'title_ar', 'description_en', 'description_ar', 'strategy',
+             'refurbishment_cost', 'stamp_duty', 'legal_fees', 'sourcing_fee', 'other_costs', 'annual_costs',
+             'void_percentage', 'maintenance_percentage', 'management_percentage', 'images', 'documents',
+             'location_data', 'published'],
+            deals)
+    # Rows were inserted directly, so the listing feed has to be rendered explicitly
+    rebuild_property_feed()
+
+    published_ids = [row['id'] for row in property_rows if row['published']]
+    actions = ['view_property', 'view_property', 'view_property', 'login', 'kyc_upload', 'express_interest']
+    activities = []
+    for _ in range(counts['activities']):
+        action = rng.choice(actions)
+        resource_id = rng.choice(published_ids) if action in ('view_property', 'express_interest') else None
+        activities.append((rng.choice(investor_ids), action, 'property' if resource_id else None, resource_id))
+    _insert('activity_logs', ['user_id', 'action', 'resource_type', 'resource_id'], activities)
+
+    return {
+        'admin_id': admin_id,
+        'investor_ids': investor_ids,
+        'published_property_ids': published_ids,
+        'counts': counts
+    }
+
+def load_dataset():
+    """Return the ids of an already seeded dataset."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, user_type FROM users WHERE email LIKE 'bench-%' ORDER BY id")
+        users = cursor.fetchall()
+        cursor.execute("""
+            SELECT p.id FROM properties p
+            JOIN deal_packages dp ON p.id = dp.property_id
+            WHERE p.property_id LIKE 'BENCH-%' AND p.published = TRUE AND dp.published = TRUE
+            ORDER BY p.id
+        """)
+        published_ids = [row['id'] for row in cursor.fetchall()]
+    return {
+        'admin_id': next(row['id'] for row in users if row['user_type'] == 'admin'),
+        'investor_ids': [row['id'] for row in users if row['user_type'] == 'investor'],
+        'published_property_ids': published_ids,
+        'counts': None
+    }
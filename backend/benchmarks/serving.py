@@ -0,0 +1,70 @@
+# backend/benchmarks/serving.py
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from benchmarks.load import run_load
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+@contextmanager
+def gunicorn_server(worker_class, workers=None, startup_timeout=60):
+    """Run the app under gunicorn.conf.py with the given worker class; yields its base URL."""
+    import requests
+
+    port = _free_port()
+    env = dict(os.environ, GUNICORN_WORKER_CLASS=worker_class, GUNICORN_BIND=f'127.0.0.1:{port}')
+    if workers:
+        env['WEB_CONCURRENCY'] = str(workers)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'run:app'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f'gunicorn ({worker_class}) exited with status {process.returncode}')
+            try:
+                if requests.get(base_url + '/api/health', timeout=1).ok:
+                    break
+            except requests.RequestException:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f'gunicorn ({worker_class}) did not start within {startup_timeout}s')
+            time.sleep(0.25)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+def run_serving(app, dataset, worker_classes, workers=None, requests_count=200, concurrency=32, seed=42, only=None):
+    """Load-test the same scenarios under each gunicorn worker class.
+
+    Returns {worker_class: {'workers', 'cores', 'scenarios'}}, where every
+    scenario also reports throughput per core (the serving models differ in
+    how many processes they run per core, so raw throughput is not the
+    comparison that matters).
+    """
+    cores = os.cpu_count() or 1
+    results = {}
+    for worker_class in worker_classes:
+        with gunicorn_server(worker_class, workers) as base_url:
+            scenarios = run_load(app, dataset, requests_count=requests_count, concurrency=concurrency,
+                                 base_url=base_url, seed=seed, only=only)
+        for stats in scenarios.values():
+            if stats['throughput_rps']:
+                stats['throughput_rps_per_core'] = round(stats['throughput_rps'] / cores, 2)
+        results[worker_class] = {'workers': workers or 'auto', 'cores': cores, 'scenarios': scenarios}
+    return results
@@ -0,0 +1,54 @@
+# backend/gunicorn.conf.py
+"""Production serving config: gunicorn -c gunicorn.conf.py run:app
+
+The default is gevent: one process per core, each multiplexing up to
+GUNICORN_WORKER_CONNECTIONS requests on green threads. psycopg2 is made
+cooperative with psycogreen, and sockets, locks and queues are patched by
+gevent itself. On PostgreSQL it served the property endpoints 15-56%
+faster per core than sync workers (numbers in benchmarks/__init__.py).
+/api/events only streams under gevent.
+
+GUNICORN_WORKER_CLASS=sync runs one request per process (2 x cores + 1)
+instead; admin list pages were sometimes faster that way. Re-measure with:
+
+    python -m benchmarks --database-url postgresql://... --serve sync --serve gevent
+"""
+import multiprocessing
+import os
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent')
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', 8000)}")
+
+# Green workers are not CPU-bound, so one per core; sync workers need spares
+# to cover time spent blocked on I/O
+_cores = multiprocessing.cpu_count()
+workers = int(os.environ.get('WEB_CONCURRENCY', _cores if worker_class == 'gevent' else _cores * 2 + 1))
+# gevent only. Idle /api/events streams hold a connection each: keep this above
+# EVENTS_MAX_SUBSCRIBERS so ordinary requests still get through (and raise
+# the open-files ulimit to match)
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 6000))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to bound slow leaks, staggered so they do
+# not all restart together
+max_requests = 5000
+max_requests_jitter = 500
+
+# The app is loaded after fork, once gevent has patched the worker (locks
+# and sockets created at import time must be the patched kind)
+preload_app = False
+
+# Heartbeat files on tmpfs: a blocked disk must not get workers killed
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+
+def post_worker_init(worker):
+    if worker_class == 'gevent':
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
@@ -0,0 +1,27 @@
+# backend/tests/conftest.py
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.config import Config
+
+@pytest.fixture
+def app(tmp_path):
+    """An app on a fresh SQLite database, seeded by init_db (user 1 is an admin)."""
+    class TestConfig(Config):
+        TESTING = True
+        DATABASE_URL = f"sqlite:///{tmp_path / 'test.db'}"
+        REDIS_URL = ''
+        METRICS_ENABLED = False
+
+    return create_app(TestConfig)
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def admin_headers(app):
+    with app.app_context():
+        # The admin seeded by init_db
+        token = create_access_token(identity='1')
+    return {'Authorization': f'Bearer {token}'}
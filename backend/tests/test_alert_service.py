@@ -0,0 +1,43 @@
+# backend/tests/test_alert_service.py
+from app.database import get_db_connection
+from app.services.alert_service import claim_alerts
+
+def add_alerts(alerts):
+    """Insert (title, alert_type, priority, status, lease_expires_at, created_at) rows."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        for title, alert_type, priority, status, lease_expires_at, created_at in alerts:
+            cursor.execute("""
+                INSERT INTO compliance_alerts (alert_type, severity, title, priority, status, lease_expires_at, created_at)
+                VALUES (%s, 'high', %s, %s, %s, %s, %s)
+            """, (alert_type, title, priority, status, lease_expires_at, created_at))
+
+def test_claim_takes_open_alerts_and_expired_leases_in_queue_order(app):
+    with app.app_context():
+        add_alerts([
+            ('open-low', 'sanctions', 3, 'open', None, '2026-01-01 09:00:00'),
+            ('expired-lease', 'sanctions', 1, 'investigating', '2026-01-02 09:00:00', '2026-01-02 08:00:00'),
+            ('held-lease', 'sanctions', 0, 'investigating', '2099-01-01 00:00:00', '2026-01-01 08:00:00'),
+            ('open-high-new', 'sanctions', 1, 'open', None, '2026-01-03 09:00:00'),
+            ('open-high-old', 'pep', 1, 'open', None, '2026-01-01 09:00:00'),
+            ('resolved', 'sanctions', 0, 'resolved', None, '2026-01-01 09:00:00'),
+        ])
+
+        claimed = claim_alerts(officer_id=1, limit=3)
+
+        assert [alert['title'] for alert in claimed] == ['open-high-old', 'expired-lease', 'open-high-new']
+        assert all(alert['status'] == 'investigating' and alert['assigned_to'] == 1 for alert in claimed)
+        assert [alert['title'] for alert in claim_alerts(officer_id=2, limit=3)] == ['open-low']
+        assert claim_alerts(officer_id=2) == []
+
+def test_claim_filters_by_alert_type(app):
+    with app.app_context():
+        add_alerts([
+            ('sanctions', 'sanctions', 0, 'open', None, '2026-01-01 09:00:00'),
+            ('pep-expired', 'pep', 2, 'investigating', '2026-01-02 09:00:00', '2026-01-01 09:00:00'),
+            ('pep-open', 'pep', 3, 'open', None, '2026-01-01 09:00:00'),
+        ])
+
+        claimed = claim_alerts(officer_id=1, limit=5, alert_types=['pep'])
+
+        assert [alert['title'] for alert in claimed] == ['pep-expired', 'pep-open']
@@ -0,0 +1,96 @@
+# backend/tests/test_cache.py
+import threading
+import time
+from app.utils.cache import LocalRedis, TwoTierCache
+
+class BrokenRedis:
+    """A shared tier that is down: every command raises."""
+
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError('Redis is down')
+        return fail
+
+def make_cache(redis=None):
+    cache = TwoTierCache('test')
+    cache.configure(redis=redis or LocalRedis())
+    return cache
+
+def test_version_mismatch_is_a_miss_in_both_tiers():
+    shared = LocalRedis()
+    cache = make_cache(shared)
+    cache.get_or_compute('p1', 'v1', lambda: {'title': 'Old'})
+
+    assert cache.get('p1', 'v1') == {'title': 'Old'}
+    assert cache.get('p1', 'v2') is None
+    # Another worker with a cold local tier sees the shared copy, but only at its version
+    other_worker = make_cache(shared)
+    assert other_worker.get('p1', 'v2') is None
+    assert other_worker.get('p1', 'v1') == {'title': 'Old'}
+
+def test_new_version_recomputes():
+    cache = make_cache()
+    cache.get_or_compute('p1', 'v1', lambda: {'title': 'Old'})
+    assert cache.get_or_compute('p1', 'v2', lambda: {'title': 'New'}) == {'title': 'New'}
+
+def test_invalidate_drops_both_tiers():
+    shared = LocalRedis()
+    cache = make_cache(shared)
+    cache.get_or_compute('p1', 'v1', lambda: {'title': 'Old'})
+
+    cache.invalidate('p1')
+
+    assert cache.get('p1', 'v1') is None
+    assert shared.get(cache._redis_key('p1')) is None
+
+def test_none_results_are_not_cached():
+    cache = make_cache()
+    assert cache.get_or_compute('missing', 'v1', lambda: None) is None
+    assert cache.get_or_compute('missing', 'v1', lambda: {'found': True}) == {'found': True}
+
+def _stampede(caches, threads_per_cache=10):
+    calls = []
+    start = threading.Barrier(len(caches) * threads_per_cache)
+    results = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {'title': 'Hot'}
+
+    def worker(cache):
+        start.wait()
+        results.append(cache.get_or_compute('hot', 'v1', compute))
+
+    threads = [threading.Thread(target=worker, args=(cache,)) for cache in caches for _ in range(threads_per_cache)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return calls, results
+
+def test_concurrent_misses_in_one_process_compute_once():
+    calls, results = _stampede([make_cache()], threads_per_cache=20)
+    assert len(calls) == 1
+    assert results == [{'title': 'Hot'}] * 20
+
+def test_concurrent_misses_across_workers_compute_once():
+    # Separate instances sharing one store stand in for gunicorn workers sharing Redis
+    shared = LocalRedis()
+    calls, results = _stampede([make_cache(shared) for _ in range(3)])
+    assert len(calls) == 1
+    assert results == [{'title': 'Hot'}] * 30
+
+def test_redis_errors_fall_back_to_the_local_tier():
+    cache = make_cache(BrokenRedis())
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'title': 'Local'}
+
+    assert cache.get_or_compute('p1', 'v1', compute) == {'title': 'Local'}
+    assert cache.get_or_compute('p1', 'v1', compute) == {'title': 'Local'}
+    assert len(calls) == 1
+    cache.invalidate('p1')
+    assert cache.get('p1', 'v1') is None
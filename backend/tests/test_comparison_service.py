@@ -0,0 +1,19 @@
+# backend/tests/test_comparison_service.py
+import pytest
+from app.services.comparison_service import ASSUMPTIONS, parse_assumptions
+
+def test_missing_assumptions_use_the_defaults():
+    assert parse_assumptions(None).keys() == ASSUMPTIONS.keys()
+
+@pytest.mark.parametrize('raw', [[1], 5, 'rent_growth', []])
+def test_assumptions_that_are_not_an_object_are_rejected(raw):
+    with pytest.raises(ValueError, match='assumptions must be an object'):
+        parse_assumptions(raw)
+
+@pytest.mark.parametrize('raw', [[1], 5])
+def test_compare_endpoint_returns_400_for_non_object_assumptions(client, admin_headers, raw):
+    response = client.post('/api/properties/compare', headers=admin_headers,
+                           json={'ids': [1, 2], 'assumptions': raw})
+
+    assert response.status_code == 400
+    assert 'assumptions must be an object' in response.get_json()['message']
@@ -0,0 +1,27 @@
+# backend/tests/test_events.py
+from gevent import monkey
+
+def test_sync_gunicorn_worker_refuses_streams(client, admin_headers):
+    assert not monkey.is_module_patched('socket')
+
+    response = client.get('/api/events', headers=admin_headers,
+                          environ_base={'SERVER_SOFTWARE': 'gunicorn/23.0.0'})
+
+    assert response.status_code == 503
+    assert 'gevent' in response.get_json()['message']
+
+def test_gevent_gunicorn_worker_streams(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(monkey, 'is_module_patched', lambda name: name == 'socket')
+
+    response = client.get('/api/events', headers=admin_headers, buffered=False,
+                          environ_base={'SERVER_SOFTWARE': 'gunicorn/23.0.0'})
+
+    assert response.status_code == 200
+    response.close()
+
+def test_development_server_streams(client, admin_headers):
+    response = client.get('/api/events', headers=admin_headers, buffered=False)
+
+    assert response.status_code == 200
+    assert next(response.response).startswith(b'retry: ')
+    response.close()
@@ -0,0 +1,46 @@
+# backend/tests/test_import_service.py
+import io
+import pytest
+from app.database import get_db_connection
+from app.services.import_service import PropertyImporter
+
+HEADER = 'property_id,address,postcode,city,property_type,asking_price,monthly_rent\n'
+
+def run_import(text, file_format='csv', source_name='listings.csv', job_id=None):
+    return PropertyImporter(chunk_size=2).run(
+        io.BytesIO(text.encode('utf-8')), file_format, source_name=source_name, job_id=job_id
+    )
+
+def stored(property_id):
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT city, property_type, monthly_rent, asking_price FROM properties WHERE property_id = %s",
+                       (property_id,))
+        return dict(cursor.fetchone())
+
+def test_reimport_without_optional_fields_keeps_stored_values(app):
+    with app.app_context():
+        run_import(HEADER + 'P1,1 High Street,M1 1AA,Manchester,residential,200000,900\n')
+        run_import('property_id,address,postcode,asking_price\nP1,1 High Street,M1 1AA,210000\n')
+
+        assert stored('P1') == {'city': 'Manchester', 'property_type': 'residential',
+                                'monthly_rent': 900, 'asking_price': 210000}
+
+def test_resume_continues_after_the_last_committed_row(app):
+    rows = ''.join(f'P{i},{i} High Street,M1 1AA,Leeds,commercial,100000,500\n' for i in range(1, 6))
+    with app.app_context():
+        job = run_import(HEADER + rows[:rows.index('P4')])
+        with get_db_connection() as conn:
+            conn.cursor().execute("UPDATE property_imports SET status = 'running' WHERE id = %s", (job['id'],))
+
+        resumed = run_import(HEADER + rows, job_id=job['id'])
+
+        assert resumed['rows_processed'] == 5
+        assert resumed['rows_imported'] == 5
+
+@pytest.mark.parametrize('file_format, source_name', [('jsonl', 'listings.csv'), ('csv', 'other.csv')])
+def test_resume_rejects_a_different_file(app, file_format, source_name):
+    with app.app_context():
+        job = run_import(HEADER + 'P1,1 High Street,M1 1AA,Leeds,commercial,100000,500\n')
+        with pytest.raises(ValueError, match='resume it with the same file'):
+            run_import('{}\n', file_format=file_format, source_name=source_name, job_id=job['id'])
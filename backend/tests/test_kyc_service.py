@@ -0,0 +1,46 @@
+# backend/tests/test_kyc_service.py
+from datetime import date, timedelta
+from app.database import get_db_connection
+from app.services.kyc_service import scan_document_expiry
+from app.services.report_service import rebuild_rollups
+
+def add_documents(documents):
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO users (email, password_hash, full_name, user_type)
+            VALUES ('investor@example.com', 'x', 'Ada Investor', 'investor')
+            RETURNING id
+        """)
+        user_id = cursor.fetchone()['id']
+        for status, reviewed_at in documents:
+            cursor.execute("""
+                INSERT INTO kyc_documents (user_id, document_type, status, reviewed_at, expiry_date)
+                VALUES (%s, 'passport', %s, %s, %s)
+            """, (user_id, status, reviewed_at, (date.today() - timedelta(days=1)).isoformat()))
+
+def rollups(metric):
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT day, value FROM compliance_daily_rollups WHERE metric = %s", (metric,))
+        return {str(row['day'])[:10]: row['value'] for row in cursor.fetchall()}
+
+def test_expiry_keeps_the_review_time_and_rollups_match_a_rebuild(app):
+    with app.app_context():
+        add_documents([('verified', '2026-01-05 10:00:00'), ('pending', None)])
+
+        assert scan_document_expiry() == {'expired': 2, 'requires_update': 0}
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT status, reviewed_at, status_changed_at FROM kyc_documents ORDER BY id")
+            documents = cursor.fetchall()
+        assert [row['status'] for row in documents] == ['expired', 'expired']
+        assert [str(row['reviewed_at'])[:10] if row['reviewed_at'] else None for row in documents] == ['2026-01-05', None]
+        assert all(row['status_changed_at'] for row in documents)
+
+        incremental = rollups('kyc_documents_lapsed')
+        rebuild_rollups()
+        assert list(incremental.values()) == [1]
+        assert rollups('kyc_documents_lapsed') == incremental
+        assert rollups('kyc_documents_reviewed') == {'2026-01-05': 1}
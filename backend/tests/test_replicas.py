@@ -0,0 +1,107 @@
+# backend/tests/test_replicas.py
+import shutil
+import sqlite3
+import pytest
+from flask_jwt_extended import create_access_token
+from app import database
+from app.database import PoolExhausted, get_db_connection
+from app.utils.replicas import init_replica_router, replica_router
+
+@pytest.fixture
+def replicas(app, tmp_path, monkeypatch):
+    """Two SQLite file copies of the primary as replicas; yields the list of connections opened."""
+    with app.app_context(), get_db_connection() as conn:
+        conn.cursor().execute("""
+            INSERT INTO users (email, password_hash, full_name, user_type, is_active, is_verified)
+            VALUES ('second-admin@example.com', 'x', 'Second Admin', 'admin', TRUE, TRUE)
+        """)
+
+    primary = app.config['DATABASE_URL'].replace('sqlite:///', '')
+    urls = []
+    for name in ('replica1.db', 'replica2.db'):
+        shutil.copy(primary, tmp_path / name)
+        urls.append(f"sqlite:///{tmp_path / name}")
+    app.config.update(DATABASE_REPLICA_URLS=','.join(urls), REPLICA_SELECTION='round_robin')
+    init_replica_router(app)
+
+    opened = []
+    connect = database._connect
+
+    def spy(url, read_only=False):
+        opened.append(url)
+        return connect(url, read_only)
+
+    monkeypatch.setattr(database, '_connect', spy)
+    yield opened
+    replica_router.configure([])
+
+def headers(app, user_id):
+    with app.app_context():
+        return {'Authorization': f'Bearer {create_access_token(identity=str(user_id))}'}
+
+def test_reads_rotate_between_replicas(app, client, replicas):
+    for _ in range(4):
+        assert client.get('/api/public/stats').status_code == 200
+
+    assert sorted(replicas[:2]) == sorted(replica.url for replica in replica_router.replicas)
+    assert replicas[2:] == replicas[:2]
+
+def test_get_handlers_opening_write_connections_still_read_from_replicas(app, client, admin_headers, replicas):
+    # admin_required looks the user up on a write-intent connection first
+    for _ in range(2):
+        assert client.get('/api/admin/properties', headers=admin_headers).status_code == 200
+
+    primary = app.config['DATABASE_URL']
+    assert replicas[0::2] == [primary, primary]
+    assert all(url != primary for url in replicas[1::2])
+
+def test_writers_read_their_own_writes_from_the_primary(app, client, admin_headers, replicas):
+    assert client.post('/api/admin/compliance/alerts/claim', json={}, headers=admin_headers).status_code == 200
+    del replicas[:]
+
+    client.get('/api/admin/properties', headers=admin_headers)
+    assert replicas == [app.config['DATABASE_URL']] * 2
+
+    # Other users are unaffected
+    del replicas[:]
+    client.get('/api/admin/properties', headers=headers(app, 2))
+    assert replicas[-1] != app.config['DATABASE_URL']
+
+def test_unreachable_replica_falls_back_and_is_skipped(app, tmp_path, replicas):
+    replica_router.configure([f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"])
+    with app.app_context():
+        for _ in range(2):
+            with get_db_connection(intent='read') as conn:
+                conn.cursor().execute('SELECT 1')
+
+    assert replicas == [replica_router.replicas[0].url, app.config['DATABASE_URL'], app.config['DATABASE_URL']]
+    assert replica_router.stats()[0]['healthy'] is False
+
+@pytest.mark.parametrize('lag', [60, None])
+def test_lagging_or_disconnected_replica_falls_back(app, replicas, monkeypatch, lag):
+    monkeypatch.setattr(database, '_replica_lag', lambda conn, url: lag)
+    with app.app_context(), get_db_connection(intent='read') as conn:
+        conn.cursor().execute('SELECT 1')
+
+    assert replicas[-1] == app.config['DATABASE_URL']
+    assert [replica['healthy'] for replica in replica_router.stats()].count(False) == 1
+
+def test_busy_replica_pool_is_not_marked_down(app, replicas, monkeypatch):
+    connect = database._connect
+
+    def exhausted(url, read_only=False):
+        if read_only:
+            raise PoolExhausted('No database connection free after 10s')
+        return connect(url, read_only)
+
+    monkeypatch.setattr(database, '_connect', exhausted)
+    with app.app_context(), get_db_connection(intent='read') as conn:
+        conn.cursor().execute('SELECT 1')
+
+    assert all(replica['healthy'] for replica in replica_router.stats())
+
+def test_replicas_reject_writes(app, replicas):
+    with app.app_context():
+        with pytest.raises(sqlite3.OperationalError):
+            with get_db_connection(intent='read') as conn:
+                conn.cursor().execute("UPDATE users SET full_name = 'Changed'")
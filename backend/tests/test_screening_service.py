@@ -0,0 +1,18 @@
+# backend/tests/test_screening_service.py
+import pytest
+from app.services.screening_service import normalize_name
+
+@pytest.mark.parametrize('name, expected', [
+    ('Alexander Elliott', ['alexander', 'elliott']),
+    ('Albert', ['albert']),
+    ('Eleanor Alston', ['eleanor', 'alston']),
+])
+def test_names_starting_with_al_or_el_are_kept_whole(name, expected):
+    assert normalize_name(name) == expected
+
+@pytest.mark.parametrize('name', ['Alrashid', 'Al-Rashid', 'al rashid', 'El Rashid'])
+def test_articles_are_dropped_fused_or_separated(name):
+    assert normalize_name(name) == ['rashid']
+
+def test_fused_article_before_a_variant_spelling_folds_to_canonical():
+    assert normalize_name('Elsayed Mohamed Alhassan') == ['said', 'muhammad', 'hasan']
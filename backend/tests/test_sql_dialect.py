@@ -0,0 +1,76 @@
+# backend/tests/test_sql_dialect.py
+import os
+import pytest
+from flask import Flask
+from app.utils.query_tracer import query_tracer
+from app.utils.sql_dialect import postgres_dialect, prepared_statement, sqlite_statement
+
+def test_placeholders_become_sqlite_parameters():
+    assert sqlite_statement('SELECT * FROM users WHERE id = %s AND email = %s') == \
+        'SELECT * FROM users WHERE id = ? AND email = ?'
+    assert sqlite_statement('UPDATE users SET full_name = %(name)s WHERE id = %(id)s') == \
+        'UPDATE users SET full_name = :name WHERE id = :id'
+
+def test_doubled_percent_is_unescaped_only_with_parameters():
+    assert sqlite_statement("SELECT 1 WHERE 'a' LIKE 'a%%' AND 1 = %s") == "SELECT 1 WHERE 'a' LIKE 'a%' AND 1 = ?"
+    assert sqlite_statement("SELECT 1 WHERE 'a' LIKE 'a%%'", has_params=False) == "SELECT 1 WHERE 'a' LIKE 'a%%'"
+
+def test_ilike_and_casts_are_rewritten_outside_literals():
+    assert sqlite_statement('SELECT id::text FROM properties WHERE city ILIKE %s') == \
+        'SELECT id FROM properties WHERE city LIKE ?'
+    assert sqlite_statement("SELECT 'x::int ILIKE' AS note -- ::cast ILIKE", has_params=False) == \
+        "SELECT 'x::int ILIKE' AS note -- ::cast ILIKE"
+
+def test_prepared_statement_numbers_positional_parameters():
+    name, body, count = prepared_statement("SELECT id FROM users WHERE email LIKE 'a%%' AND id > %s AND id < %s")
+    assert name.startswith('ps_')
+    assert body == "SELECT id FROM users WHERE email LIKE 'a%' AND id > $1 AND id < $2"
+    assert count == 2
+    assert prepared_statement("SELECT id FROM users WHERE id > %s")[0] != name
+
+def test_only_positional_dml_is_preparable():
+    assert prepared_statement('CREATE TABLE t (id INTEGER)') is None
+    assert prepared_statement('SELECT id FROM users WHERE id = %(id)s') is None
+
+@pytest.fixture
+def postgres(monkeypatch):
+    """A pooled-style PostgreSQL connection with a probe table (needs TEST_POSTGRES_URL)."""
+    url = os.environ.get('TEST_POSTGRES_URL')
+    if not url:
+        pytest.skip('TEST_POSTGRES_URL is not set')
+    from app.database import _connect
+
+    app = Flask(__name__)
+    app.config['DATABASE_POOL_SIZE'] = 0
+    monkeypatch.setattr(postgres_dialect, 'threshold', 2)
+    query_tracer.reset()
+    with app.app_context(), _connect(url) as conn:
+        cursor = conn.cursor()
+        cursor.execute('CREATE TEMP TABLE prepared_probe (id INTEGER PRIMARY KEY, name TEXT)')
+        cursor.execute("INSERT INTO prepared_probe VALUES (1, 'alpha'), (2, 'beta'), (3, 'gamma')")
+        yield conn
+        conn.rollback()
+
+def test_hot_statements_run_prepared_on_postgres(postgres):
+    cursor = postgres.cursor()
+    query = "SELECT name FROM prepared_probe WHERE id = %s AND name LIKE '%%a'"
+    names = []
+    for probe_id in (1, 2, 3, 1):
+        cursor.execute(query, (probe_id,))
+        names.append(cursor.fetchone()['name'])
+
+    assert names == ['alpha', 'beta', 'gamma', 'alpha']
+    assert prepared_statement(query)[0] in postgres.prepared_statements
+
+def test_unpreparable_statement_leaves_the_transaction_usable(postgres):
+    cursor = postgres.cursor()
+    # Untyped parameters make the operator ambiguous, so PREPARE fails
+    query = 'SELECT %s + %s AS value'
+    for value in (1, 2, 3):
+        cursor.execute(query, (value, 1))
+        assert cursor.fetchone()['value'] == value + 1
+
+    assert query in postgres_dialect._unpreparable
+    assert prepared_statement(query)[0] not in postgres.prepared_statements
+    cursor.execute('SELECT COUNT(*) AS probes FROM prepared_probe')
+    assert cursor.fetchone()['probes'] == 3
@@ -6,8 +6,9 @@ export const investorService = {
     return response.data;
   },
 
-  async getInvestor(id) {
-    const response = await api.get(`/admin/investors/${id}`);
+  async getInvestor(id, params = {}) {
+    // Profile, a page of KYC documents and recent activity in one round trip
+    const response = await api.get(`/admin/investors/${id}`, { params });
     return response.data;
   },
 